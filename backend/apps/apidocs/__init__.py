@@ -0,0 +1 @@
+"""API docs app: the precomputed OpenAPI schema and its management command."""
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ApidocsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apidocs"
+    verbose_name = "API docs"
@@ -0,0 +1,55 @@
+import difflib
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apidocs.schema import generate
+
+# Lines of the diff shown when --check fails
+MAX_DIFF_LINES = 60
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema to OPENAPI_SCHEMA_FILE, or check it is current."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            help="Schema file (default: settings.OPENAPI_SCHEMA_FILE).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the file differs from the schema the code generates.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"] or settings.OPENAPI_SCHEMA_FILE)
+        content = generate()
+
+        if not options["check"]:
+            path.write_bytes(content)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}."))
+            return
+
+        current = path.read_bytes() if path.exists() else b""
+        if current == content:
+            self.stdout.write(self.style.SUCCESS(f"{path} is up to date."))
+            return
+
+        diff = list(
+            difflib.unified_diff(
+                current.decode().splitlines(),
+                content.decode().splitlines(),
+                f"{path.name} (committed)",
+                f"{path.name} (generated)",
+                lineterm="",
+            )
+        )
+        self.stderr.write("\n".join(diff[:MAX_DIFF_LINES]))
+        if len(diff) > MAX_DIFF_LINES:
+            self.stderr.write(f"... {len(diff) - MAX_DIFF_LINES} more lines")
+        raise CommandError(
+            f"{path} is out of date; run `python manage.py openapi_schema`."
+        )
@@ -0,0 +1,53 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema walks every view and serializer with their
+@extend_schema annotations, which is far too slow to repeat on each request
+from Swagger UI or Redoc. `manage.py openapi_schema` writes it once to
+settings.OPENAPI_SCHEMA_FILE: the file is committed (CI fails if it drifts
+from the code) and regenerated when the image is built. apidocs.views.schema
+serves its bytes, read once per process, with an ETag.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_cached = None
+
+
+def generate():
+    """The schema as rendered JSON bytes (imports drf-spectacular's generator)."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def etag(content):
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def load():
+    """(content, ETag) of the schema file, generated once if it is missing."""
+    global _cached
+    if _cached is None:
+        with _lock:
+            if _cached is None:
+                try:
+                    content = Path(settings.OPENAPI_SCHEMA_FILE).read_bytes()
+                except FileNotFoundError:
+                    content = generate()
+                _cached = (content, etag(content))
+    return _cached
+
+
+def reset():
+    """Forget the loaded schema (tests, or after rewriting the file)."""
+    global _cached
+    _cached = None
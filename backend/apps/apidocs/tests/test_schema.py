@@ -0,0 +1,87 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apidocs import schema
+
+
+class SchemaViewTests(TestCase):
+    def setUp(self):
+        schema.reset()
+        self.addCleanup(schema.reset)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "openapi.json"
+
+    def test_serves_the_file_with_an_etag(self):
+        self.path.write_bytes(b'{"openapi": "3.0.3"}')
+
+        with override_settings(OPENAPI_SCHEMA_FILE=self.path):
+            response = self.client.get(reverse("schema"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"openapi": "3.0.3"}')
+        self.assertEqual(response["ETag"], schema.etag(response.content))
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_matching_etag_gets_not_modified(self):
+        self.path.write_bytes(b'{"openapi": "3.0.3"}')
+
+        with override_settings(OPENAPI_SCHEMA_FILE=self.path):
+            etag = self.client.get(reverse("schema"))["ETag"]
+            response = self.client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_file_is_read_once(self):
+        self.path.write_bytes(b'{"openapi": "3.0.3"}')
+
+        with override_settings(OPENAPI_SCHEMA_FILE=self.path):
+            self.client.get(reverse("schema"))
+            self.path.write_bytes(b'{"openapi": "3.1.0"}')
+            response = self.client.get(reverse("schema"))
+
+        self.assertEqual(response.content, b'{"openapi": "3.0.3"}')
+
+    def test_missing_file_is_generated(self):
+        with override_settings(OPENAPI_SCHEMA_FILE=self.path):
+            response = self.client.get(reverse("schema"))
+
+        self.assertIn("/api/v1/petsitters/", json.loads(response.content)["paths"])
+
+
+class OpenapiSchemaCommandTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "openapi.json"
+
+    def test_writes_the_generated_schema(self):
+        call_command("openapi_schema", file=str(self.path), stdout=StringIO())
+
+        self.assertEqual(self.path.read_bytes(), schema.generate())
+
+    def test_check_passes_when_current(self):
+        self.path.write_bytes(schema.generate())
+        out = StringIO()
+
+        call_command("openapi_schema", file=str(self.path), check=True, stdout=out)
+
+        self.assertIn("up to date", out.getvalue())
+
+    def test_check_fails_on_drift(self):
+        current = json.loads(schema.generate())
+        del current["paths"]["/api/v1/petsitters/"]
+        self.path.write_text(json.dumps(current, indent=4))
+        err = StringIO()
+
+        with self.assertRaisesMessage(CommandError, "out of date"):
+            call_command("openapi_schema", file=str(self.path), check=True, stderr=err)
+        self.assertIn("(generated)", err.getvalue())
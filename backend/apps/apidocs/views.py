@@ -0,0 +1,19 @@
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_safe
+
+from .schema import load
+
+
+@require_safe
+@condition(etag_func=lambda request: load()[1])
+def schema(request):
+    """
+    The precomputed OpenAPI schema (see apidocs.schema).
+
+    Clients revalidate with If-None-Match and get a 304 until a deploy
+    changes the schema.
+    """
+    content, _ = load()
+    response = HttpResponse(content, content_type="application/vnd.oai.openapi+json")
+    response["Cache-Control"] = "no-cache"
+    return response
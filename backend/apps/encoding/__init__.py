@@ -0,0 +1 @@
+"""Encoding app: content-negotiated compression of API JSON responses."""
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class EncodingConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "encoding"
+    verbose_name = "Response encoding"
@@ -0,0 +1,127 @@
+"""
+Response body compressors, by Content-Encoding token.
+
+gzip comes from the standard library. br and zstd need the optional Brotli
+and zstandard packages (requirements-prod.txt) and are simply not offered
+when they are missing. Each compressor works one-shot (compress()) or on a
+stream of chunks (compress_stream()), where every chunk is flushed so the
+client can decode what it has received so far.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Levels for dynamic responses: most of the size saving of the higher levels
+# for a fraction of their CPU (see benchmarks/bench_compression.py)
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class GzipCompressor:
+    def __init__(self):
+        # wbits=31: gzip header and trailer around the deflate stream
+        self._stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._stream.compress(data)
+
+    def flush(self):
+        return self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._stream.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        self._stream = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._stream.process(data)
+
+    def flush(self):
+        return self._stream.flush()
+
+    def finish(self):
+        return self._stream.finish()
+
+
+class ZstdCompressor:
+    def __init__(self):
+        self._stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data):
+        return self._stream.compress(data)
+
+    def flush(self):
+        return self._stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._stream.flush()
+
+
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def compress(encoding, data):
+    compressor = COMPRESSORS[encoding]()
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(encoding, chunks):
+    compressor = COMPRESSORS[encoding]()
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+async def compress_async_stream(encoding, chunks):
+    compressor = COMPRESSORS[encoding]()
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+def negotiate(accept_encoding, offered):
+    """
+    The encoding in offered the client accepts with the highest q-value.
+
+    Ties go to the earlier one in offered (server preference). None means
+    identity: no header, nothing acceptable, or only q=0 entries.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in offered:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
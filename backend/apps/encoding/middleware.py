@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .compressors import (
+    COMPRESSORS,
+    compress,
+    compress_async_stream,
+    compress_stream,
+    negotiate,
+)
+
+JSON_CONTENT_TYPES = {"application/json", "application/x-ndjson"}
+
+
+def is_json(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return content_type in JSON_CONTENT_TYPES or content_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """
+    Compress API JSON responses with the best encoding the client accepts.
+
+    Applies to paths under settings.COMPRESSION_PATH_PREFIX only, with the
+    encodings of settings.COMPRESSION_ENCODINGS that are installed (see
+    encoding.compressors), in that order of preference on equal q-values.
+    Bodies under settings.COMPRESSION_MIN_BYTES are sent as they are.
+    Streaming responses (exports) are compressed chunk by chunk, whatever
+    their size. Below MetricsMiddleware, so the recorded response sizes are
+    the compressed ones, and their time includes compressing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        offered = [e for e in settings.COMPRESSION_ENCODINGS if e in COMPRESSORS]
+        if (
+            not offered
+            or not request.path.startswith(settings.COMPRESSION_PATH_PREFIX)
+            or response.has_header("Content-Encoding")
+            or response.status_code in (204, 304)
+            or not is_json(response)
+        ):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_BYTES
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), offered)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(
+                    encoding, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    encoding, response.streaming_content
+                )
+            del response["Content-Length"]
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The bytes differ from the identity body's
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,138 @@
+import gzip
+import json
+from unittest import skipUnless
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from asgiref.sync import async_to_sync
+from encoding.compressors import COMPRESSORS, brotli, negotiate, zstandard
+from encoding.middleware import CompressionMiddleware
+from rest_framework.test import APIClient
+from users.models import User
+from users.tests.test_listings import make_customer, make_petsitter
+
+ABOUT = "Cuido de cães e gatos há dez anos, com passeios diários e carinho. " * 8
+
+
+class NegotiateTests(TestCase):
+    def test_highest_q_value_wins(self):
+        offered = ["zstd", "br", "gzip"]
+
+        self.assertEqual(negotiate("gzip, br;q=0.8", offered), "gzip")
+        self.assertEqual(negotiate("gzip;q=0.5, br", offered), "br")
+
+    def test_ties_follow_server_preference(self):
+        self.assertEqual(negotiate("gzip, br, zstd", ["br", "gzip"]), "br")
+        self.assertEqual(negotiate("*", ["zstd", "gzip"]), "zstd")
+
+    def test_identity_when_nothing_acceptable(self):
+        for header in ("", "identity", "gzip;q=0", "*;q=0", "deflate"):
+            self.assertIsNone(negotiate(header, ["gzip"]), header)
+
+
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_customer("viewer@example.com").user
+        for i in range(20):
+            make_petsitter(f"sitter{i}@example.com", about=ABOUT)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _list(self, **headers):
+        return self.client.get(reverse("users:petsitter-list"), **headers)
+
+    def test_gzip_list_page(self):
+        plain = self._list()
+        response = self._list(HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertLess(len(response.content), len(plain.content) / 4)
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_identity_without_accept_encoding(self):
+        response = self._list()
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(response.json()["results"]), 20)
+
+    @skipUnless(brotli and zstandard, "Brotli and zstandard are not installed")
+    def test_brotli_and_zstd(self):
+        plain = self._list().content
+
+        response = self._list(HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain)
+
+        response = self._list(HTTP_ACCEPT_ENCODING="gzip, br, zstd")
+        self.assertEqual(response["Content-Encoding"], "zstd")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self.assertEqual(decompressor.decompress(response.content), plain)
+
+    @override_settings(COMPRESSION_MIN_BYTES=1_000_000)
+    def test_small_bodies_are_not_compressed(self):
+        response = self._list(HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", response.get("Vary", ""))
+
+    @override_settings(COMPRESSION_ENCODINGS=["gzip"])
+    def test_only_offered_encodings_are_used(self):
+        response = self._list(HTTP_ACCEPT_ENCODING="br, zstd")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_non_api_routes_are_not_compressed(self):
+        response = self.client.get(reverse("schema"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_export_is_compressed_per_chunk(self):
+        self.client.force_authenticate(
+            User.objects.create_user(
+                email="staff@example.com", password="StrongPass123!", is_staff=True
+            )
+        )
+
+        response = self.client.get(
+            reverse("users:petsitter-export"), HTTP_ACCEPT_ENCODING="gzip"
+        )
+        chunks = list(response.streaming_content)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        # One flushed block per row, plus the gzip trailer
+        self.assertEqual(len(chunks), 21)
+        rows = gzip.decompress(b"".join(chunks)).decode().splitlines()
+        self.assertEqual([json.loads(row)["about"] for row in rows], [ABOUT] * 20)
+
+    def test_async_streams_are_compressed(self):
+        async def rows():
+            yield b'{"id": 1}\n'
+            yield b'{"id": 2}\n'
+
+        async def consume(content):
+            return [chunk async for chunk in content]
+
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(
+                rows(), content_type="application/x-ndjson"
+            )
+        )
+        request = RequestFactory().get("/api/v1/rows/", HTTP_ACCEPT_ENCODING="gzip")
+        response = middleware(request)
+        chunks = async_to_sync(consume)(response.streaming_content)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(chunks)), b'{"id": 1}\n{"id": 2}\n')
+
+    def test_gzip_is_always_available(self):
+        self.assertIn("gzip", COMPRESSORS)
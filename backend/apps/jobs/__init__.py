@@ -0,0 +1 @@
+"""Jobs app: DB-backed queue for work done outside the request cycle."""
@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from .models import Job, OutboxEvent
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["id", "name", "status", "attempts", "run_at", "created_at"]
+    list_filter = ["status", "name"]
+    readonly_fields = ["created_at", "updated_at"]
+    ordering = ["run_at"]
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "topic",
+        "aggregate_id",
+        "attempts",
+        "available_at",
+        "processed_at",
+        "failed_at",
+    ]
+    list_filter = ["topic"]
+    readonly_fields = ["created_at"]
+    ordering = ["-id"]
@@ -0,0 +1,63 @@
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.outbox import prune, relay
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox events to their consumers until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Events delivered per transaction (default: 100).",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to wait when nothing was delivered (default: 0.5).",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=7,
+            help="Delete events processed more than N days ago (default: 7).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the pending events once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        retention = timedelta(days=options["retention_days"])
+        delivered = 0
+        pruned_at = 0.0
+
+        while self.running:
+            if time.monotonic() - pruned_at > 3600:
+                prune(retention)
+                pruned_at = time.monotonic()
+
+            count = relay(options["batch_size"])
+            delivered += count
+            if not count:
+                if options["once"]:
+                    break
+                time.sleep(options["idle_sleep"])
+
+        self.stdout.write(f"Delivered {delivered} event(s).")
+
+    def stop(self, signum, frame):
+        """Finish the current batch, then exit."""
+        self.running = False
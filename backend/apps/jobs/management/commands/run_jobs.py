@@ -0,0 +1,49 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs until stopped (SIGTERM/SIGINT)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per round trip (default: 10).",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the due jobs once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        processed = 0
+        while self.running:
+            claimed = run_pending(options["batch_size"])
+            processed += claimed
+            if not claimed:
+                if options["once"]:
+                    break
+                time.sleep(options["idle_sleep"])
+
+        self.stdout.write(f"Processed {processed} job(s).")
+
+    def stop(self, signum, frame):
+        """Finish the current batch, then exit."""
+        self.running = False
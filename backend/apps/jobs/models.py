@@ -0,0 +1,88 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work waiting in (or failed out of) the queue."""
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=100, help_text="Registered job name")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "jobs"
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["run_at"]
+        indexes = [
+            # Workers only ever look for due queued jobs or stale running ones
+            models.Index(
+                fields=["run_at"],
+                condition=Q(status="queued"),
+                name="jobs_queued_run_at_idx",
+            ),
+            models.Index(
+                fields=["locked_at"],
+                condition=Q(status="running"),
+                name="jobs_running_locked_at_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class OutboxEvent(models.Model):
+    """A change event written in the same transaction as the change itself."""
+
+    topic = models.CharField(max_length=100, help_text='e.g. "petsitter.updated"')
+    aggregate_id = models.BigIntegerField(help_text="Primary key of the changed row")
+    payload = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    # Not retried before this time (pushed back after each failed attempt)
+    available_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Set when the event ran out of attempts; the relay skips it from then on
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "outbox_events"
+        verbose_name = "Outbox Event"
+        verbose_name_plural = "Outbox Events"
+        ordering = ["id"]
+        indexes = [
+            # The relay only scans events that still have to be delivered
+            models.Index(
+                fields=["id"],
+                condition=Q(processed_at__isnull=True, failed_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["processed_at"],
+                condition=Q(processed_at__isnull=False),
+                name="outbox_processed_at_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.aggregate_id}"
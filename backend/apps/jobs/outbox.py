@@ -0,0 +1,116 @@
+"""
+Transactional outbox: change events committed together with the change.
+
+Writers call publish() inside the transaction that modifies the data, so an
+event exists if and only if the change committed. ``manage.py relay_outbox``
+then drains pending events in id order and hands each one to the consumers
+registered for its topic:
+
+    @consumer("petsitter.")
+    def refresh_search_document(event):
+        ...
+
+Consumers are declared in an app's ``tasks`` module (autodiscovered by the
+jobs app). None is registered yet: the events are recorded for the search,
+cache and analytics consumers to come, and an event without consumers is
+simply marked processed.
+
+Delivery is at-least-once: an event is marked processed only after all of
+its consumers succeeded, so consumers must be idempotent. A failing event is
+retried with exponential backoff (see jobs.queue.retry_delay) without
+blocking the others, and marked failed after MAX_ATTEMPTS.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEvent
+from .queue import retry_delay
+
+logger = logging.getLogger(__name__)
+
+# Failed deliveries before an event is marked failed and left alone
+MAX_ATTEMPTS = 10
+
+_consumers = []
+
+
+def consumer(topic_prefix):
+    """Register the decorated function for topics starting with topic_prefix."""
+
+    def decorator(func):
+        _consumers.append((topic_prefix, func))
+        return func
+
+    return decorator
+
+
+def consumers_for(topic):
+    return [func for prefix, func in _consumers if topic.startswith(prefix)]
+
+
+def publish(topic, aggregate_id, payload=None):
+    """Record an event; must run inside the transaction making the change."""
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError("publish() must be called inside transaction.atomic().")
+
+    return OutboxEvent.objects.create(
+        topic=topic, aggregate_id=aggregate_id, payload=payload or {}
+    )
+
+
+def deliver(event):
+    """Run every consumer of event. Returns True when all of them succeeded."""
+    try:
+        # Savepoint: a failing consumer must not abort the relay transaction
+        with transaction.atomic():
+            for func in consumers_for(event.topic):
+                func(event)
+    except Exception:
+        event.attempts += 1
+        event.last_error = traceback.format_exc()
+        if event.attempts < MAX_ATTEMPTS:
+            event.available_at = timezone.now() + retry_delay(event.attempts)
+            logger.warning(
+                "Outbox event %s failed (attempt %s), retrying at %s",
+                event,
+                event.attempts,
+                event.available_at,
+            )
+        else:
+            event.failed_at = timezone.now()
+            logger.error("Outbox event %s failed permanently", event)
+        event.save(
+            update_fields=["attempts", "last_error", "available_at", "failed_at"]
+        )
+        return False
+
+    event.processed_at = timezone.now()
+    event.save(update_fields=["processed_at"])
+    return True
+
+
+def relay(batch_size=100):
+    """Deliver one batch of due events. Returns how many succeeded."""
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                processed_at__isnull=True,
+                failed_at__isnull=True,
+                available_at__lte=timezone.now(),
+            )
+            .order_by("id")[:batch_size]
+        )
+        return sum(deliver(event) for event in events)
+
+
+def prune(older_than=timedelta(days=7)):
+    """Delete events processed before the retention window."""
+    cutoff = timezone.now() - older_than
+    deleted, _ = OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
+    return deleted
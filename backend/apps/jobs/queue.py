@@ -0,0 +1,144 @@
+"""
+Job registry, enqueue helpers and the worker loop.
+
+Declare a job in an app's ``tasks`` module and enqueue it after commit:
+
+    @job("users.send_welcome_email")
+    def send_welcome_email(user_id):
+        ...
+
+    send_welcome_email.enqueue_on_commit(user_id=user.pk)
+
+Workers (``manage.py run_jobs``) claim due jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can share the table.
+Failed jobs are retried with exponential backoff until max_attempts. With
+settings.JOBS_EAGER (tests) jobs run synchronously instead of being stored.
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry; doubled on each further attempt
+RETRY_BASE_DELAY = 10
+RETRY_MAX_DELAY = 60 * 60
+
+# Running jobs locked for longer than this are assumed lost and reclaimed
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+_registry = {}
+
+
+class JobFunction:
+    """A registered job: callable inline, or enqueued for a worker."""
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **payload):
+        return self.func(**payload)
+
+    def enqueue(self, run_at=None, **payload):
+        """Store the job now (or run it inline in eager mode)."""
+        if getattr(settings, "JOBS_EAGER", False):
+            self(**payload)
+            return None
+
+        return Job.objects.create(
+            name=self.name,
+            payload=payload,
+            max_attempts=self.max_attempts,
+            run_at=run_at or timezone.now(),
+        )
+
+    def enqueue_on_commit(self, **payload):
+        """Enqueue once the surrounding transaction commits."""
+        transaction.on_commit(lambda: self.enqueue(**payload))
+
+
+def job(name, max_attempts=5):
+    """Register the decorated function as a job called name."""
+
+    def decorator(func):
+        if name in _registry:
+            raise ValueError(f"Job {name!r} is already registered.")
+        _registry[name] = JobFunction(func, name, max_attempts)
+        return _registry[name]
+
+    return decorator
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt, with jitter to spread retries."""
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_jobs(batch_size=10):
+    """Lock and mark as running up to batch_size due jobs."""
+    now = timezone.now()
+    due = Q(status="queued", run_at__lte=now) | Q(
+        status="running", locked_at__lt=now - LOCK_TIMEOUT
+    )
+
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("run_at")[:batch_size]
+        )
+        for claimed in jobs:
+            claimed.status = "running"
+            claimed.locked_at = now
+            claimed.attempts += 1
+        Job.objects.bulk_update(jobs, ["status", "locked_at", "attempts"])
+
+    return jobs
+
+
+def run_job(claimed):
+    """Run a claimed job; delete it on success, reschedule or fail it on error."""
+    func = _registry.get(claimed.name)
+
+    try:
+        if func is None:
+            raise LookupError(f"No job registered as {claimed.name!r}.")
+        func(**claimed.payload)
+    except Exception:
+        claimed.last_error = traceback.format_exc()
+        claimed.locked_at = None
+        if claimed.attempts < claimed.max_attempts:
+            claimed.status = "queued"
+            claimed.run_at = timezone.now() + retry_delay(claimed.attempts)
+            logger.warning("Job %s failed, retrying at %s", claimed, claimed.run_at)
+        else:
+            claimed.status = "failed"
+            logger.error("Job %s failed permanently", claimed)
+        claimed.save(
+            update_fields=["status", "run_at", "locked_at", "last_error", "updated_at"]
+        )
+        return False
+
+    claimed.delete()
+    return True
+
+
+def run_pending(batch_size=10):
+    """Claim and run one batch of due jobs. Returns how many were claimed."""
+    jobs = claim_jobs(batch_size)
+    for claimed in jobs:
+        run_job(claimed)
+    return len(jobs)
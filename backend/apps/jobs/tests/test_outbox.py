@@ -0,0 +1,120 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import OutboxEvent
+from jobs.outbox import MAX_ATTEMPTS, consumer, publish, relay
+from rest_framework.test import APIClient
+from users.tests.test_listings import make_petsitter
+
+received = []
+
+
+@consumer("tests.")
+def record(event):
+    received.append((event.topic, event.aggregate_id, event.payload))
+
+
+@consumer("tests.explode")
+def explode(event):
+    raise RuntimeError("boom")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        received.clear()
+
+    def test_relay_delivers_pending_events_in_order(self):
+        publish("tests.first", 1, {"value": 1})
+        publish("tests.second", 2)
+
+        self.assertEqual(relay(), 2)
+        self.assertEqual(
+            received, [("tests.first", 1, {"value": 1}), ("tests.second", 2, {})]
+        )
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+        self.assertEqual(relay(), 0)
+
+    def test_failed_event_is_retried_without_blocking_others(self):
+        publish("tests.explode", 1)
+        publish("tests.after", 2)
+
+        with self.assertLogs("jobs.outbox", "WARNING"):
+            self.assertEqual(relay(), 1)
+
+        failed = OutboxEvent.objects.get(topic="tests.explode")
+        self.assertIsNone(failed.processed_at)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("RuntimeError: boom", failed.last_error)
+        self.assertEqual(received[-1][0], "tests.after")
+
+    def test_failed_event_waits_for_its_backoff(self):
+        publish("tests.explode", 1)
+        with self.assertLogs("jobs.outbox", "WARNING"):
+            relay()
+
+        event = OutboxEvent.objects.get()
+        self.assertGreater(event.available_at, timezone.now())
+        self.assertEqual(relay(), 0)
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 1)
+
+        later = event.available_at + timedelta(seconds=1)
+        with (
+            mock.patch("jobs.outbox.timezone.now", return_value=later),
+            self.assertLogs("jobs.outbox", "WARNING"),
+        ):
+            relay()
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 2)
+
+    def test_event_is_marked_failed_after_max_attempts(self):
+        publish("tests.explode", 1)
+        OutboxEvent.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+        with self.assertLogs("jobs.outbox", "ERROR"):
+            self.assertEqual(relay(), 0)
+
+        event = OutboxEvent.objects.get()
+        self.assertIsNotNone(event.failed_at)
+        self.assertIsNone(event.processed_at)
+        later = timezone.now() + timedelta(days=1)
+        with mock.patch("jobs.outbox.timezone.now", return_value=later):
+            self.assertEqual(relay(), 0)
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, MAX_ATTEMPTS)
+
+    def test_relay_outbox_command_drains_events(self):
+        publish("tests.command", 3)
+        call_command("relay_outbox", "--once", stdout=StringIO())
+        self.assertEqual(received, [("tests.command", 3, {})])
+
+
+class ProfileEventTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.sitter = make_petsitter("sitter@example.com")
+        self.client.force_authenticate(self.sitter.user)
+
+    def test_update_publishes_changed_fields(self):
+        url = reverse("users:petsitter-update", args=[self.sitter.pk])
+        self.client.patch(url, {"about": "Cuido de gatos"}, format="json")
+
+        event = OutboxEvent.objects.get(topic="petsitter.updated")
+        self.assertEqual(event.aggregate_id, self.sitter.pk)
+        self.assertEqual(event.payload, {"fields": ["about"]})
+
+    def test_soft_delete_publishes_deactivation(self):
+        url = reverse("users:petsitter-delete", args=[self.sitter.pk])
+        self.client.delete(url)
+
+        self.assertTrue(
+            OutboxEvent.objects.filter(
+                topic="petsitter.deactivated", aggregate_id=self.sitter.pk
+            ).exists()
+        )
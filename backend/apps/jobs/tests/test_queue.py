@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, job, run_pending
+
+calls = []
+
+
+@job("tests.record", max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@job("tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_stores_job_until_a_worker_runs_it(self):
+        record.enqueue(value=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(Job.objects.get().payload, {"value": 1})
+
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_enqueue_on_commit_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            record.enqueue_on_commit(value=2)
+            self.assertFalse(Job.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertTrue(Job.objects.filter(name="tests.record").exists())
+
+    def test_future_jobs_are_not_claimed(self):
+        record.enqueue(value=3, run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim_jobs(), [])
+
+    def test_failures_are_retried_with_backoff_then_marked_failed(self):
+        explode.enqueue()
+        with self.assertLogs("jobs.queue", "WARNING"):
+            run_pending()
+
+        failed = Job.objects.get()
+        self.assertEqual((failed.status, failed.attempts), ("queued", 1))
+        self.assertGreater(failed.run_at, timezone.now())
+        self.assertIn("RuntimeError: boom", failed.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("jobs.queue", "ERROR"):
+            run_pending()
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts), ("failed", 2))
+
+    def test_stale_running_jobs_are_reclaimed(self):
+        record.enqueue(value=4)
+        claim_jobs()
+        self.assertEqual(claim_jobs(), [])
+
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [4])
+
+    def test_run_jobs_command_drains_queue(self):
+        record.enqueue(value=5)
+        call_command("run_jobs", "--once", stdout=StringIO())
+        self.assertEqual(calls, [5])
+
+
+class EagerJobTests(TestCase):
+    def test_eager_mode_runs_inline(self):
+        calls.clear()
+        record.enqueue(value=6)
+        self.assertEqual(calls, [6])
+        self.assertFalse(Job.objects.exists())
+
+    def test_signup_sends_welcome_email_after_commit(self):
+        payload = {
+            "full_name": "João Silva",
+            "email": "joao@example.com",
+            "phone": "(11) 99999-9999",
+            "password": "StrongPass123!",
+            "confirm_password": "StrongPass123!",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("users:customer-signup"), payload)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["joao@example.com"])
@@ -0,0 +1 @@
+"""Monitoring app: request metrics and diagnostics for operators."""
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+    verbose_name = "Monitoring"
+
+    def ready(self):
+        from .metrics import instrument_serializers
+        from .profiler import install_signal_handler
+
+        # Serializer time is only recorded on sampled requests
+        instrument_serializers()
+        install_signal_handler()
@@ -0,0 +1,40 @@
+"""
+Readiness of this process to serve traffic, for container health checks.
+
+A process is ready when the default database answers and has every
+migration applied (the release job runs them before replicas start). The
+migration check repeats only until it first passes; after that a probe is
+one SELECT 1 round trip. The endpoint is public, so database errors are
+logged rather than returned.
+"""
+
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+# Answered by ReadinessMiddleware, ahead of every other middleware
+READINESS_PATH = "/readyz"
+
+logger = logging.getLogger(__name__)
+
+_migrated = False
+
+
+def readiness():
+    """(ready, reason) for the default database."""
+    global _migrated
+    connection = connections[DEFAULT_DB_ALIAS]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if not _migrated:
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+            if plan:
+                return False, f"{len(plan)} unapplied migrations"
+            _migrated = True
+    except DatabaseError as exc:
+        logger.warning("Readiness check failed, database unavailable: %s", exc)
+        return False, "database unavailable"
+    return True, "ok"
@@ -0,0 +1,266 @@
+"""
+Per-route request metrics and their Prometheus text exposition.
+
+MetricsMiddleware fills a RequestSample for sampled requests (query count
+and time through a connection execute_wrapper, serializer time through the
+patched Serializer.data) and hands it to the process-wide ``registry``.
+
+Each worker process keeps its own registry. With settings.METRICS_DIR set,
+workers also write a snapshot there every few seconds and /metrics sums the
+snapshots of all of them, so any worker can answer the scrape. When a
+worker exits, gunicorn.conf.py folds its snapshot into ARCHIVE_FILE so the
+totals survive worker recycling.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+from rest_framework import serializers
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Seconds between snapshot writes to METRICS_DIR
+SNAPSHOT_INTERVAL = 5.0
+
+# Snapshot in METRICS_DIR summing the workers that have exited
+ARCHIVE_FILE = "archive.json"
+
+current_sample = ContextVar("current_sample", default=None)
+
+
+class RequestSample:
+    """Costs accumulated while one sampled request is handled."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._serializing = False
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook timing every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def _timed_data(prop):
+    """Wrap a serializer ``data`` property to time the outermost call."""
+
+    def getter(self):
+        sample = current_sample.get()
+        if sample is None or sample._serializing:
+            return prop.fget(self)
+
+        sample._serializing = True
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            sample.serializer_time += time.perf_counter() - start
+            sample._serializing = False
+
+    return property(getter)
+
+
+def instrument_serializers():
+    """Time Serializer.data and ListSerializer.data on sampled requests."""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data, "_timed", False):
+            cls.data = _timed_data(cls.data)
+            cls.data.fget._timed = True
+
+
+class Registry:
+    """Thread-safe per-process aggregates, keyed by route."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.routes = {}
+        self.last_snapshot = 0.0
+
+    def observe(self, route, method, status, duration, sample, response_bytes):
+        with self.lock:
+            key = f"{route}|{method}|{status}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            stats = self.routes.setdefault(
+                route,
+                {
+                    "count": 0,
+                    "duration": 0.0,
+                    "buckets": [0] * len(DURATION_BUCKETS),
+                    "queries": 0,
+                    "db_time": 0.0,
+                    "serializer_time": 0.0,
+                    "response_bytes": 0,
+                },
+            )
+            stats["count"] += 1
+            stats["duration"] += duration
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stats["buckets"][i] += 1
+            stats["queries"] += sample.queries
+            stats["db_time"] += sample.db_time
+            stats["serializer_time"] += sample.serializer_time
+            stats["response_bytes"] += response_bytes
+
+        self.maybe_write_snapshot()
+
+    def snapshot(self):
+        with self.lock:
+            return copy.deepcopy({"requests": self.requests, "routes": self.routes})
+
+    def clear(self):
+        with self.lock:
+            self.requests.clear()
+            self.routes.clear()
+
+    def snapshot_path(self):
+        directory = getattr(settings, "METRICS_DIR", "")
+        return Path(directory) / f"{os.getpid()}.json" if directory else None
+
+    def maybe_write_snapshot(self, force=False):
+        path = self.snapshot_path()
+        now = time.monotonic()
+        if path is None or (not force and now - self.last_snapshot < SNAPSHOT_INTERVAL):
+            return
+        self.last_snapshot = now
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    def collect(self):
+        """Snapshots of every worker (just this one without METRICS_DIR)."""
+        path = self.snapshot_path()
+        if path is None:
+            return [self.snapshot()]
+
+        self.maybe_write_snapshot(force=True)
+        snapshots = []
+        for file in path.parent.glob("*.json"):
+            try:
+                snapshots.append(json.loads(file.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+registry = Registry()
+
+
+def merge(snapshots):
+    """Sum worker snapshots into one."""
+    merged = {"requests": {}, "routes": {}}
+    for snapshot in snapshots:
+        for key, count in snapshot["requests"].items():
+            merged["requests"][key] = merged["requests"].get(key, 0) + count
+
+        for route, stats in snapshot["routes"].items():
+            total = merged["routes"].get(route)
+            if total is None:
+                merged["routes"][route] = copy.deepcopy(stats)
+                continue
+            for name, value in stats.items():
+                if name == "buckets":
+                    total[name] = [a + b for a, b in zip(total[name], value)]
+                else:
+                    total[name] += value
+    return merged
+
+
+def archive_snapshot(pid):
+    """Fold the snapshot of exited worker ``pid`` into ARCHIVE_FILE."""
+    directory = getattr(settings, "METRICS_DIR", "")
+    if not directory:
+        return
+    path = Path(directory) / f"{pid}.json"
+    archive = Path(directory) / ARCHIVE_FILE
+    if not path.exists():
+        return
+
+    snapshots = []
+    for file in (path, archive):
+        try:
+            snapshots.append(json.loads(file.read_text()))
+        except (OSError, ValueError):
+            continue
+
+    tmp = archive.with_suffix(".tmp")
+    tmp.write_text(json.dumps(merge(snapshots)))
+    os.replace(tmp, archive)
+    path.unlink(missing_ok=True)
+
+
+def _labels(**labels):
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def render(snapshot):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = [
+        "# HELP petkeep_http_requests_total Sampled requests handled.",
+        "# TYPE petkeep_http_requests_total counter",
+    ]
+    for key, count in sorted(snapshot["requests"].items()):
+        route, method, status = key.split("|")
+        labels = _labels(route=route, method=method, status=status)
+        lines.append(f"petkeep_http_requests_total{labels} {count}")
+
+    routes = sorted(snapshot["routes"].items())
+    lines += [
+        "# HELP petkeep_http_request_duration_seconds Sampled request latency.",
+        "# TYPE petkeep_http_request_duration_seconds histogram",
+    ]
+    for route, stats in routes:
+        for bound, count in zip(DURATION_BUCKETS, stats["buckets"]):
+            labels = _labels(route=route, le=bound)
+            lines.append(
+                f"petkeep_http_request_duration_seconds_bucket{labels} {count}"
+            )
+        labels = _labels(route=route, le="+Inf")
+        lines.append(
+            f"petkeep_http_request_duration_seconds_bucket{labels} {stats['count']}"
+        )
+        labels = _labels(route=route)
+        lines.append(
+            f"petkeep_http_request_duration_seconds_sum{labels} {stats['duration']}"
+        )
+        lines.append(
+            f"petkeep_http_request_duration_seconds_count{labels} {stats['count']}"
+        )
+
+    totals = [
+        ("db_queries_total", "queries", "SQL queries run by sampled requests."),
+        ("db_query_seconds_total", "db_time", "Time spent in SQL queries."),
+        ("serializer_seconds_total", "serializer_time", "Time spent serializing."),
+        ("http_response_bytes_total", "response_bytes", "Response body bytes."),
+    ]
+    for name, field, help_text in totals:
+        lines += [
+            f"# HELP petkeep_{name} {help_text}",
+            f"# TYPE petkeep_{name} counter",
+        ]
+        for route, stats in routes:
+            lines.append(f"petkeep_{name}{_labels(route=route)} {stats[field]}")
+
+    return "\n".join(lines) + "\n"
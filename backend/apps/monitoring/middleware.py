@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+
+from .health import READINESS_PATH, readiness
+from .metrics import RequestSample, current_sample, registry
+from .profiler import profiler, view_label
+from .slow_queries import QueryTimer
+
+
+class ReadinessMiddleware:
+    """
+    Answer READINESS_PATH with 200 when ready to serve, 503 otherwise.
+
+    First in MIDDLEWARE, so probes on the container address are neither
+    redirected to HTTPS nor rejected by ALLOWED_HOSTS, and stay out of the
+    request metrics. See monitoring.health.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path != READINESS_PATH:
+            return self.get_response(request)
+
+        ready, reason = readiness()
+        response = JsonResponse(
+            {"status": "ready" if ready else "unavailable", "reason": reason},
+            status=200 if ready else 503,
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record latency, SQL and serializer costs and response size per route.
+
+    Only a settings.METRICS_SAMPLE_RATE fraction of requests is measured;
+    the others pay for one random() call. Sampled responses carry a
+    Server-Timing header (db, serialize, total) readable in browser devtools.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, "METRICS_SAMPLE_RATE", 0.0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+        if route == "metrics":
+            return response
+
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(
+            route, request.method, response.status_code, duration, sample, size
+        )
+        response["Server-Timing"] = (
+            f'db;dur={sample.db_time * 1000:.1f};desc="{sample.queries} queries", '
+            f"serialize;dur={sample.serializer_time * 1000:.1f}, "
+            f"total;dur={duration * 1000:.1f}"
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Report queries slower than settings.SLOW_QUERY_MS (0, the default, is off).
+
+    See monitoring.slow_queries. Queries run while a streaming response is
+    consumed, after the middleware has returned, are not timed.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = getattr(settings, "SLOW_QUERY_MS", 0.0)
+        if threshold <= 0:
+            return self.get_response(request)
+
+        timer = QueryTimer(request, threshold)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            return self.get_response(request)
+
+
+class ProfilerMiddleware:
+    """
+    Tell the sampling profiler which view each request thread is serving.
+
+    A dict write per request while monitoring.profiler is running, nothing
+    otherwise.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiler.running:
+            return self.get_response(request)
+
+        ident = threading.get_ident()
+        profiler.views[ident] = "unresolved"
+        try:
+            return self.get_response(request)
+        finally:
+            profiler.views.pop(ident, None)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        ident = threading.get_ident()
+        if ident in profiler.views:
+            profiler.views[ident] = view_label(view_func)
@@ -0,0 +1,190 @@
+"""
+Sampling profiler for one worker process.
+
+While running, a daemon thread wakes every settings.PROFILER_INTERVAL_MS and
+records the Python stack of each thread that is serving a request (found
+through ProfilerMiddleware), rooted at the view handling it: DRF views are
+named by their class, so the samples of PetSitterListView split into
+serializer, ORM and hashing frames below it. Samples are wall-clock, so time
+spent waiting on the database shows up under the cursor's execute().
+
+Stacks are aggregated in "collapsed" format, one "frame;frame;... count" line
+per distinct stack, which flamegraph.pl, speedscope and inferno read as is.
+
+A worker is profiled either through the staff endpoint
+/api/v1/monitoring/profiler/ (which reaches whichever worker answers) or by
+sending settings.PROFILER_SIGNAL (e.g. SIGUSR2) to its pid: the first signal
+starts profiling, the second stops it and writes the stacks to PROFILER_DIR.
+"""
+
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per sample, counted from the innermost one
+MAX_DEPTH = 200
+
+# Distinct stacks kept; further new stacks are counted under their view only
+MAX_STACKS = 20_000
+
+# Upper bound of a run started from the staff endpoint, in seconds
+MAX_DURATION = 600
+
+
+def view_label(view_func):
+    """Dotted name of the DRF view class (or plain view function)."""
+    view = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", view_func
+    )
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+def frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    # co_qualname (Class.method) is new in Python 3.11
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class Profiler:
+    def __init__(self):
+        # Reentrant: the signal handler may interrupt a holder in this thread
+        self.lock = threading.RLock()
+        # Thread ident -> label of the view it is serving (set by the middleware)
+        self.views = {}
+        self.stacks = Counter()
+        self.view_samples = Counter()
+        self.running = False
+        self.interval = 0.0
+        self.started_at = None
+        self.stopped_at = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        # Code object -> frame label, so a sample mostly costs dict lookups
+        self.labels = {}
+
+    def start(self, interval_ms=None, duration=None, dump=False):
+        """Start sampling in a daemon thread; False if already running."""
+        with self.lock:
+            if self.running:
+                return False
+            self.stacks.clear()
+            self.view_samples.clear()
+            self.interval = (
+                interval_ms or getattr(settings, "PROFILER_INTERVAL_MS", 10)
+            ) / 1000
+            self.started_at = time.time()
+            self.stopped_at = None
+            self.stop_event = threading.Event()
+            self.running = True
+
+        deadline = time.monotonic() + duration if duration else None
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(self.stop_event, deadline, dump),
+            name="profiler",
+            daemon=True,
+        )
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop sampling; the collected stacks stay readable."""
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _run(self, stop_event, deadline, dump):
+        try:
+            while not stop_event.wait(self.interval):
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                self.sample()
+        finally:
+            with self.lock:
+                self.running = False
+                self.stopped_at = time.time()
+            self.views.clear()
+            if dump:
+                self.dump()
+
+    def sample(self):
+        frames = sys._current_frames()
+        for ident, view in list(self.views.items()):
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+
+            labels = []
+            while frame is not None and len(labels) < MAX_DEPTH:
+                label = self.labels.get(frame.f_code)
+                if label is None:
+                    label = self.labels[frame.f_code] = frame_label(frame)
+                labels.append(label)
+                frame = frame.f_back
+            stack = (view, *reversed(labels))
+
+            with self.lock:
+                self.view_samples[view] += 1
+                if stack in self.stacks or len(self.stacks) < MAX_STACKS:
+                    self.stacks[stack] += 1
+
+    def collapsed(self):
+        """Stacks in collapsed format, most sampled first."""
+        with self.lock:
+            stacks = self.stacks.most_common()
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks)
+
+    def status(self):
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "running": self.running,
+                "interval_ms": round(self.interval * 1000, 3),
+                "started_at": self.started_at,
+                "stopped_at": self.stopped_at,
+                "samples": sum(self.view_samples.values()),
+                "views": dict(self.view_samples.most_common()),
+            }
+
+    def dump(self):
+        directory = Path(getattr(settings, "PROFILER_DIR", "") or tempfile.gettempdir())
+        path = directory / f"profile-{os.getpid()}-{int(self.started_at)}.collapsed"
+        path.write_text(self.collapsed(), encoding="utf-8")
+        logger.warning("Profile of worker %s written to %s", os.getpid(), path)
+        return path
+
+
+profiler = Profiler()
+
+
+def toggle(signum, frame):
+    """Signal handler: start profiling, or stop it and write the stacks."""
+    if profiler.running:
+        # Not joined here: the sampler thread writes the file as it exits
+        profiler.stop_event.set()
+    else:
+        profiler.start(dump=True)
+        logger.warning("Profiling worker %s", os.getpid())
+
+
+def install_signal_handler():
+    """Toggle the profiler on settings.PROFILER_SIGNAL, if one is set."""
+    name = getattr(settings, "PROFILER_SIGNAL", "")
+    if not name:
+        return
+    try:
+        signal.signal(getattr(signal, name), toggle)
+    except (AttributeError, ValueError) as exc:
+        # Unknown signal name, or not called from the main thread
+        logger.warning("Profiler signal %s not installed: %s", name, exc)
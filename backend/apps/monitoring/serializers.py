@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from .profiler import MAX_DURATION
+
+
+class ProfilerStartSerializer(serializers.Serializer):
+    """Options of a profiling run started from the staff endpoint."""
+
+    seconds = serializers.IntegerField(min_value=1, max_value=MAX_DURATION, default=60)
+    interval_ms = serializers.FloatField(min_value=1, max_value=1000, required=False)
@@ -0,0 +1,206 @@
+"""
+Opt-in slow-query diagnostics.
+
+With settings.SLOW_QUERY_MS above zero, SlowQueryMiddleware times every SQL
+query of every request. A query over the threshold is logged (warning on
+the "monitoring.slow_queries" logger) with its route, duration and the
+types of its parameters, and counted under its fingerprint: the SQL with
+literals replaced by "?" and IN lists collapsed, so one filter combination
+is one entry whatever values it ran with.
+
+A settings.SLOW_QUERY_EXPLAIN_RATE fraction of the slow SELECTs is run again
+under EXPLAIN ANALYZE (EXPLAIN QUERY PLAN on SQLite) inside a savepoint, and
+the plan, string literals masked, is logged and kept with its fingerprint.
+Parameter values are never kept: they include emails, session and token
+keys. Each process keeps the
+slowest SLOW_QUERY_TOP_N fingerprints seen in the last SLOW_QUERY_WINDOW
+seconds, served to staff at /api/v1/monitoring/slow-queries/.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+_explaining = ContextVar("explaining", default=False)
+
+_IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """The shape of a query: literals as "?", IN lists as "IN (...)"."""
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def normalize_param(value):
+    if isinstance(value, (list, tuple)):
+        return [normalize_param(item) for item in value]
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (str, bytes, memoryview)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def normalize_params(params):
+    """JSON-safe placeholders for parameters: their type, and length if sized."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: normalize_param(value) for key, value in params.items()}
+    return [normalize_param(value) for value in params]
+
+
+def explain(connection, sql, params):
+    """Plan of a SELECT, executed in a savepoint; None if not explainable."""
+    statement = sql.lstrip().upper()
+    if not statement.startswith("SELECT") or " FOR UPDATE" in statement:
+        return None
+
+    prefix = {
+        "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+        "mysql": "EXPLAIN ANALYZE ",
+        "sqlite": "EXPLAIN QUERY PLAN ",
+    }.get(connection.vendor)
+    if prefix is None:
+        return None
+
+    token = _explaining.set(True)
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        _explaining.reset(token)
+    plan = "\n".join(" ".join(str(col) for col in row) for row in rows)
+    # EXPLAIN ANALYZE prints the bound values, e.g. Index Cond: (key = '...')
+    return _STRING_RE.sub("'?'", plan)
+
+
+class SlowQueryLog:
+    """Per-process top-N of the slowest query fingerprints in a time window."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def record(self, sql, params, duration_ms, route, plan=None):
+        key = fingerprint(sql)
+        now = time.time()
+        top_n = getattr(settings, "SLOW_QUERY_TOP_N", 20)
+
+        with self.lock:
+            self._expire(now)
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= top_n:
+                    fastest = min(self.entries, key=lambda k: self.entries[k]["max_ms"])
+                    if self.entries[fastest]["max_ms"] >= duration_ms:
+                        return
+                    del self.entries[fastest]
+                entry = self.entries[key] = {
+                    "fingerprint": key,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": {},
+                    "plan": None,
+                }
+
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+            entry["last_seen"] = now
+            if duration_ms >= entry["max_ms"]:
+                entry["max_ms"] = duration_ms
+                entry["sql"] = sql
+                entry["params"] = normalize_params(params)
+            if plan is not None:
+                entry["plan"] = plan
+
+    def _expire(self, now):
+        window = getattr(settings, "SLOW_QUERY_WINDOW", 3600)
+        for key in [
+            k for k, e in self.entries.items() if now - e["last_seen"] > window
+        ]:
+            del self.entries[key]
+
+    def top(self):
+        """Entries, slowest first."""
+        with self.lock:
+            self._expire(time.time())
+            entries = [
+                dict(entry, routes=dict(entry["routes"]))
+                for entry in self.entries.values()
+            ]
+        for entry in entries:
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+            entry["mean_ms"] = round(entry["total_ms"] / entry["count"], 3)
+        return sorted(entries, key=lambda entry: entry["max_ms"], reverse=True)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+slow_queries = SlowQueryLog()
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook reporting queries over the threshold."""
+
+    def __init__(self, request, threshold_ms):
+        self.request = request
+        self.threshold_ms = threshold_ms
+
+    def route(self):
+        match = getattr(self.request, "resolver_match", None)
+        return match.view_name if match else self.request.path
+
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.report(sql, params, many, context["connection"], duration_ms)
+
+    def report(self, sql, params, many, connection, duration_ms):
+        route = self.route()
+        plan = None
+        rate = getattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0.0)
+        if not many and rate > 0 and random.random() < rate:
+            plan = explain(connection, sql, params)
+
+        # executemany() params are a list of rows; keep the first one
+        sample = next(iter(params), None) if many else params
+        slow_queries.record(sql, sample, duration_ms, route, plan)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s params=%s%s",
+            duration_ms,
+            route,
+            sql,
+            normalize_params(sample),
+            f"\n{plan}" if plan else "",
+        )
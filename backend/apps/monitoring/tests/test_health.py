@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from monitoring import health
+
+
+class ReadinessTests(TestCase):
+    def setUp(self):
+        health._migrated = False
+
+    def test_ready_when_database_is_migrated(self):
+        response = self.client.get("/readyz")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ready")
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_unavailable_with_unapplied_migrations(self):
+        with mock.patch.object(
+            health.MigrationExecutor, "migration_plan", return_value=[("m", False)]
+        ):
+            response = self.client.get("/readyz")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["reason"], "1 unapplied migrations")
+
+    def test_migrations_are_checked_until_they_pass(self):
+        self.client.get("/readyz")
+
+        with mock.patch.object(health, "MigrationExecutor") as executor:
+            self.client.get("/readyz")
+        executor.assert_not_called()
+
+    def test_unavailable_without_database(self):
+        with mock.patch.object(
+            health.connections["default"],
+            "cursor",
+            side_effect=OperationalError("connection refused: db.internal:5432"),
+        ):
+            with self.assertLogs("monitoring.health", "WARNING") as logs:
+                response = self.client.get("/readyz")
+
+        self.assertEqual(response.status_code, 503)
+        # Driver errors (hosts, ports) go to the log, not the public body
+        self.assertEqual(response.json()["reason"], "database unavailable")
+        self.assertIn("db.internal:5432", logs.output[0])
+
+    @override_settings(ALLOWED_HOSTS=["api.example.com"], SECURE_SSL_REDIRECT=True)
+    def test_answered_before_host_validation_and_https_redirect(self):
+        response = self.client.get("/readyz", HTTP_HOST="10.0.0.7:8000")
+
+        self.assertEqual(response.status_code, 200)
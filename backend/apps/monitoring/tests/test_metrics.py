@@ -0,0 +1,113 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from monitoring.metrics import (
+    ARCHIVE_FILE,
+    RequestSample,
+    archive_snapshot,
+    merge,
+    registry,
+    render,
+)
+from rest_framework.test import APIClient
+from users.tests.test_listings import make_customer, make_petsitter
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN="secret")
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        make_petsitter("sitter@example.com")
+
+    def test_sampled_request_gets_server_timing(self):
+        response = self.client.get(reverse("users:petsitter-list"))
+
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_costs_are_recorded_per_route(self):
+        response = self.client.get(reverse("users:petsitter-list"))
+        self.client.get(reverse("users:petsitter-list"))
+
+        stats = registry.snapshot()["routes"]["users:petsitter-list"]
+        self.assertEqual(stats["count"], 2)
+        self.assertGreater(stats["queries"], 0)
+        self.assertGreater(stats["serializer_time"], 0)
+        self.assertEqual(stats["response_bytes"], 2 * len(response.content))
+
+    @override_settings(METRICS_SAMPLE_RATE=0.0)
+    def test_nothing_is_recorded_when_sampling_is_off(self):
+        response = self.client.get(reverse("users:petsitter-list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(registry.snapshot()["routes"], {})
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.get(reverse("users:petsitter-list"))
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        body = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'petkeep_http_requests_total{route="users:petsitter-list",'
+            'method="GET",status="200"} 1',
+            body,
+        )
+        self.assertIn("petkeep_db_queries_total", body)
+        self.assertNotIn('route="metrics"', body)
+
+    def test_metrics_endpoint_requires_token(self):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 404)
+
+    def test_workers_share_metrics_through_metrics_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                self.client.get(reverse("users:petsitter-list"))
+                body = self.client.get(
+                    "/metrics", HTTP_AUTHORIZATION="Bearer secret"
+                ).content.decode()
+
+        self.assertIn('route="users:petsitter-list"', body)
+
+
+class RenderTests(TestCase):
+    def test_merge_sums_worker_snapshots(self):
+        sample = RequestSample()
+        sample.queries = 3
+        registry.clear()
+        registry.observe("users:login", "POST", 200, 0.02, sample, 100)
+        snapshot = registry.snapshot()
+
+        merged = merge([snapshot, snapshot])
+        stats = merged["routes"]["users:login"]
+        self.assertEqual((stats["count"], stats["queries"]), (2, 6))
+        self.assertIn(
+            'petkeep_http_request_duration_seconds_bucket{route="users:login",le="0.025"} 2',
+            render(merged),
+        )
+
+    def test_exited_workers_are_archived(self):
+        registry.clear()
+        registry.observe("users:login", "POST", 200, 0.02, RequestSample(), 100)
+        snapshot = json.dumps(registry.snapshot())
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                for pid in (101, 102):
+                    Path(directory, f"{pid}.json").write_text(snapshot)
+                    archive_snapshot(pid)
+                archive_snapshot(103)  # no snapshot written
+
+                files = sorted(path.name for path in Path(directory).iterdir())
+                archived = json.loads(Path(directory, ARCHIVE_FILE).read_text())
+
+        self.assertEqual(files, [ARCHIVE_FILE])
+        self.assertEqual(archived["routes"]["users:login"]["count"], 2)
@@ -0,0 +1,115 @@
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+
+from monitoring.profiler import Profiler, profiler, toggle, view_label
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from users.models import User
+from users.tests.test_listings import make_customer
+from users.views import PetSitterListView
+
+
+def busy_wait(started, done):
+    started.set()
+    done.wait()
+
+
+class ProfilerTests(TestCase):
+    def test_view_label_names_the_drf_view_class(self):
+        match = resolve(reverse("users:petsitter-list"))
+        self.assertEqual(view_label(match.func), "users.views.PetSitterListView")
+        self.assertEqual(
+            view_label(resolve("/metrics").func), "monitoring.views.metrics"
+        )
+
+    def test_samples_are_rooted_at_the_view(self):
+        started, done = threading.Event(), threading.Event()
+        worker = threading.Thread(target=busy_wait, args=(started, done))
+        worker.start()
+        started.wait()
+
+        local = Profiler()
+        local.views[worker.ident] = "users.views.PetSitterListView"
+        local.sample()
+        local.sample()
+        done.set()
+        worker.join()
+
+        (line,) = local.collapsed().splitlines()
+        stack, count = line.rsplit(" ", 1)
+        self.assertEqual(count, "2")
+        self.assertTrue(stack.startswith("users.views.PetSitterListView;"))
+        self.assertIn("threading:Event.wait", stack)
+        self.assertIn("monitoring.tests.test_profiler:busy_wait", stack)
+
+    def test_threads_outside_requests_are_not_sampled(self):
+        local = Profiler()
+        local.sample()
+        self.assertEqual(local.collapsed(), "")
+
+
+class ProfilerEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("profiler")
+        self.staff = User.objects.create_user(
+            email="staff@example.com", password="x", is_staff=True
+        )
+
+    def tearDown(self):
+        profiler.stop()
+
+    def test_middleware_labels_request_threads_while_running(self):
+        def get(view, request, *args, **kwargs):
+            return Response(list(profiler.views.values()))
+
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        with (
+            mock.patch.object(profiler, "running", True),
+            mock.patch.object(PetSitterListView, "get", get),
+        ):
+            response = self.client.get(reverse("users:petsitter-list"))
+
+        self.assertEqual(response.data, ["users.views.PetSitterListView"])
+        self.assertEqual(profiler.views, {})
+
+    def test_staff_start_read_and_stop(self):
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.post(self.url, {"seconds": 30}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.data["running"])
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.delete(self.url)
+        self.assertFalse(response.data["running"])
+
+        response = self.client.get(self.url, {"output": "collapsed"})
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+
+    def test_rejects_long_runs_and_non_staff(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.post(self.url, {"seconds": 3600}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_signal_toggles_and_writes_the_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(PROFILER_DIR=directory):
+                with self.assertLogs("monitoring.profiler", "WARNING") as logs:
+                    toggle(None, None)
+                    self.assertTrue(profiler.running)
+                    toggle(None, None)
+                    profiler.thread.join()
+
+                self.assertFalse(profiler.running)
+                (path,) = Path(directory).glob("profile-*.collapsed")
+                self.assertIn(str(path), logs.output[-1])
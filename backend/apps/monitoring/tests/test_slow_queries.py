@@ -0,0 +1,124 @@
+import json
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from monitoring.slow_queries import (
+    SlowQueryLog,
+    explain,
+    fingerprint,
+    normalize_params,
+    slow_queries,
+)
+from rest_framework.test import APIClient
+from users.models import User
+from users.tests.test_listings import make_customer, make_petsitter
+
+
+class FingerprintTests(TestCase):
+    def test_literals_and_in_lists_are_collapsed(self):
+        self.assertEqual(
+            fingerprint(
+                'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (%s, %s, %s)\n'
+                "AND \"a\".\"name\" = 'x''y' LIMIT 21"
+            ),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) '
+            'AND "a"."name" = ? LIMIT ?',
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "x" IN (%s)'),
+            fingerprint('SELECT * FROM "t" WHERE "x" IN (%s, %s)'),
+        )
+
+    def test_param_values_are_replaced_by_their_type(self):
+        self.assertEqual(
+            normalize_params(["dog", "x" * 100, b"abc", 3, None, True, ["a"]]),
+            ["<str:3>", "<str:100>", "<bytes:3>", "<int>", None, True, ["<str:1>"]],
+        )
+
+
+class SlowQueryLogTests(TestCase):
+    def test_keeps_the_slowest_fingerprints(self):
+        log = SlowQueryLog()
+        with override_settings(SLOW_QUERY_TOP_N=2):
+            log.record("SELECT 1", [], 5.0, "a")
+            log.record("SELECT 2 FROM t", [], 50.0, "a")
+            log.record("SELECT 3 FROM t", [], 10.0, "b")
+            log.record("SELECT 1 FROM u", [], 1.0, "c")
+
+        top = log.top()
+        self.assertEqual(
+            [e["fingerprint"] for e in top], ["SELECT ? FROM t", "SELECT ?"]
+        )
+        self.assertEqual(top[0]["count"], 2)
+        self.assertEqual(top[0]["max_ms"], 50.0)
+        self.assertEqual(top[0]["routes"], {"a": 1, "b": 1})
+
+    @override_settings(SLOW_QUERY_WINDOW=0)
+    def test_entries_expire_after_the_window(self):
+        log = SlowQueryLog()
+        log.record("SELECT 1", [], 5.0, "a")
+        self.assertEqual(log.top(), [])
+
+    def test_explain_only_runs_for_selects(self):
+        plan = explain(connection, 'SELECT * FROM "users" WHERE "id" = %s', [1])
+        self.assertIn("users", plan)
+        self.assertIsNone(explain(connection, 'DELETE FROM "users"', []))
+
+
+@override_settings(SLOW_QUERY_MS=0.000001, SLOW_QUERY_EXPLAIN_RATE=1.0)
+class SlowQueryMiddlewareTests(TestCase):
+    def setUp(self):
+        slow_queries.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        make_petsitter("sitter@example.com")
+
+    def test_slow_queries_are_logged_with_route_and_plan(self):
+        with self.assertLogs("monitoring.slow_queries", "WARNING") as logs:
+            self.client.get(reverse("users:petsitter-list"), {"animal_type": "dog"})
+
+        self.assertIn("users:petsitter-list", logs.output[0])
+        entries = slow_queries.top()
+        self.assertTrue(entries)
+        self.assertTrue(
+            all(e["routes"] == {"users:petsitter-list": 1} for e in entries)
+        )
+        self.assertTrue(any(e["plan"] for e in entries))
+
+    def test_credentials_are_not_logged_or_kept(self):
+        self.client.force_authenticate(None)
+        with self.assertLogs("monitoring.slow_queries", "WARNING") as logs:
+            response = self.client.post(
+                reverse("users:login"),
+                {"email": "viewer@example.com", "password": "StrongPass123!"},
+                format="json",
+            )
+
+        token = response.json()["token"]
+        kept = json.dumps(slow_queries.top())
+        for secret in ("viewer@example.com", token):
+            self.assertNotIn(secret, "\n".join(logs.output))
+            self.assertNotIn(secret, kept)
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_nothing_is_recorded_when_off(self):
+        self.client.get(reverse("users:petsitter-list"))
+        self.assertEqual(slow_queries.top(), [])
+
+    def test_endpoint_is_staff_only(self):
+        url = reverse("slow-queries")
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff = User.objects.create_user(
+            email="staff@example.com", password="x", is_staff=True
+        )
+        self.client.force_authenticate(staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("queries", response.data)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(slow_queries.top(), [])
@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from users.tests.test_listings import make_customer
+
+STARTUP = """
+import json, sys
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def modules_loaded(settings_module):
+    """Modules imported by a fresh worker up to its URLconf."""
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP],
+        cwd=settings.BASE_DIR,
+        env=dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+class StartupImportTests(TestCase):
+    def test_schema_generator_is_imported_on_first_docs_request(self):
+        self.assertNotIn("drf_spectacular.views", modules_loaded("config.settings"))
+
+    def test_api_profile_skips_docs_and_admin(self):
+        modules = modules_loaded("config.api_settings")
+
+        self.assertIn("users.views", modules)
+        # DRF itself imports django.contrib.admin (admindocs' simplify_regex),
+        # but no ModelAdmin is registered
+        for module in ("drf_spectacular.openapi", "users.admin", "jobs.admin"):
+            self.assertNotIn(module, modules)
+
+
+class DocsTests(TestCase):
+    def test_schema_is_served(self):
+        response = self.client.get(reverse("schema"), {"format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/api/v1/petsitters/", response.json()["paths"])
+
+    def test_swagger_ui_points_at_schema(self):
+        response = self.client.get(reverse("swagger-ui"))
+
+        self.assertContains(response, reverse("schema"))
+
+
+@override_settings(ROOT_URLCONF="config.api_urls")
+class ApiUrlconfTests(TestCase):
+    def test_api_is_served(self):
+        client = APIClient()
+        client.force_authenticate(make_customer("viewer@example.com").user)
+
+        self.assertEqual(client.get("/api/v1/petsitters/").status_code, 200)
+
+    def test_docs_and_admin_are_not_routed(self):
+        for path in ("/api/schema/", "/admin/"):
+            self.assertEqual(self.client.get(path).status_code, 404)
@@ -0,0 +1,153 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import merge, registry, render
+from .profiler import profiler
+from .serializers import ProfilerStartSerializer
+from .slow_queries import slow_queries
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint.
+
+    Requires "Authorization: Bearer <METRICS_TOKEN>"; without a configured
+    token it is only served in DEBUG.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(given.encode(), token.encode()):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+
+    return HttpResponse(
+        render(merge(registry.collect())),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class SlowQueryView(APIView):
+    """
+    Staff-only view of the slowest query fingerprints.
+
+    Each worker process keeps its own list; the response says which one
+    answered (pid).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Slowest queries",
+        description=(
+            "Slowest SQL fingerprints seen by this worker within "
+            "SLOW_QUERY_WINDOW seconds, with count, mean/max time, routes, "
+            "the parameters of the slowest run and a sampled plan. Empty "
+            "unless SLOW_QUERY_MS is set."
+        ),
+        responses={200: OpenApiResponse(response=OpenApiTypes.OBJECT)},
+        tags=["Monitoring"],
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "threshold_ms": getattr(settings, "SLOW_QUERY_MS", 0.0),
+                "queries": slow_queries.top(),
+            }
+        )
+
+    @extend_schema(
+        summary="Reset slowest queries",
+        description="Clear this worker's slow query list.",
+        responses={204: None},
+        tags=["Monitoring"],
+    )
+    def delete(self, request, *args, **kwargs):
+        slow_queries.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfilerView(APIView):
+    """
+    Staff-only control of the sampling profiler of the worker that answers.
+
+    POST starts a run of a few seconds, GET returns its status or, with
+    output=collapsed, the stacks for a flamegraph tool; DELETE stops it.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Profiler status or stacks",
+        description=(
+            "Status of this worker's profiler (samples per view), or with "
+            "output=collapsed the sampled stacks in collapsed format "
+            "(flamegraph.pl, speedscope)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                description='"status" (default) or "collapsed"',
+                required=False,
+                type=str,
+                enum=["status", "collapsed"],
+            ),
+        ],
+        responses={200: OpenApiResponse(response=OpenApiTypes.OBJECT)},
+        tags=["Monitoring"],
+    )
+    def get(self, request, *args, **kwargs):
+        if request.query_params.get("output") == "collapsed":
+            return HttpResponse(
+                profiler.collapsed(), content_type="text/plain; charset=utf-8"
+            )
+        return Response(profiler.status())
+
+    @extend_schema(
+        summary="Start profiling",
+        description=(
+            "Sample this worker's request threads for the given number of "
+            "seconds (default 60, max 600)."
+        ),
+        request=ProfilerStartSerializer,
+        responses={
+            202: OpenApiResponse(response=OpenApiTypes.OBJECT),
+            409: OpenApiResponse(description="Already running"),
+        },
+        tags=["Monitoring"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = ProfilerStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        started = profiler.start(
+            interval_ms=serializer.validated_data.get("interval_ms"),
+            duration=serializer.validated_data["seconds"],
+        )
+        return Response(
+            profiler.status(),
+            status=status.HTTP_202_ACCEPTED if started else status.HTTP_409_CONFLICT,
+        )
+
+    @extend_schema(
+        summary="Stop profiling",
+        description="Stop this worker's profiler; its stacks stay readable.",
+        request=None,
+        responses={200: OpenApiResponse(response=OpenApiTypes.OBJECT)},
+        tags=["Monitoring"],
+    )
+    def delete(self, request, *args, **kwargs):
+        profiler.stop()
+        return Response(profiler.status())
@@ -1,37 +1,136 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 from .models import AnimalType, Customer, PetSitter, ServiceType, User
+from .search import search_users
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's row estimate on large, unfiltered tables.
+
+    An unfiltered changelist would otherwise run COUNT(*) over the whole
+    table on every page load. On Postgres pg_class.reltuples is good enough
+    for page links; filtered querysets, small tables and other backends
+    fall back to an exact COUNT.
+    """
+
+    estimate_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+
+        return super().count
+
+
+class ShapeSearchMixin:
+    """
+    Admin search dispatched by the shape of the input (see users.search).
+
+    search_fields only enables the search box; the lookup itself is an exact
+    email match, a phone-digits prefix or a full-text name match, each backed
+    by its own index instead of OR-ed icontains scans.
+    """
+
+    search_user_prefix = ""
+    search_extra_text_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset = search_users(
+            queryset,
+            search_term,
+            user_prefix=self.search_user_prefix,
+            extra_text_fields=self.search_extra_text_fields,
+        )
+        return queryset, False
+
+
+class TypeListFilter(admin.SimpleListFilter):
+    """
+    Filter petsitters by an animal/service type without joining the M2M.
+
+    Lookups come from the model choices (no query) and the filter runs as a
+    pk IN (subquery) on the through table, so no DISTINCT is needed.
+    """
+
+    field_name = None
+    code_field = None
+    type_choices = ()
+
+    def lookups(self, request, model_admin):
+        return self.type_choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.with_types(self.field_name, self.code_field, [self.value()])
+        return queryset
+
+
+class AnimalTypeListFilter(TypeListFilter):
+    title = "animal type"
+    parameter_name = "animal_type"
+    field_name = "animal_types"
+    code_field = "animal_type"
+    type_choices = AnimalType.ANIMAL_CHOICES
+
+
+class ServiceTypeListFilter(TypeListFilter):
+    title = "service type"
+    parameter_name = "service_type"
+    field_name = "service_types"
+    code_field = "service_type"
+    type_choices = ServiceType.SERVICE_CHOICES
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ShapeSearchMixin, admin.ModelAdmin):
     list_display = ["id", "email", "full_name", "user_type", "is_active", "created_at"]
     list_filter = ["user_type", "is_active", "created_at"]
     search_fields = ["email", "full_name", "phone"]
     readonly_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(ShapeSearchMixin, admin.ModelAdmin):
     list_display = [
         "get_id",
         "get_email",
         "get_full_name",
         "get_phone",
-        "get_is_active",
+        "is_active",
         "created_at",
     ]
-    list_filter = ["created_at"]
+    list_filter = ["is_active", "created_at"]
+    list_select_related = ["user"]
     search_fields = ["user__email", "user__full_name", "user__phone"]
-    readonly_fields = ["created_at", "updated_at"]
+    search_user_prefix = "user__"
+    readonly_fields = ["is_active", "created_at", "updated_at"]
     ordering = ["-created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_id(self, obj):
-        return obj.user.id
+        return obj.user_id
 
     get_id.short_description = "ID"
-    get_id.admin_order_field = "user__id"
+    get_id.admin_order_field = "user_id"
 
     def get_email(self, obj):
         return obj.user.email
@@ -51,36 +150,39 @@ class CustomerAdmin(admin.ModelAdmin):
     get_phone.short_description = "Phone"
     get_phone.admin_order_field = "user__phone"
 
-    def get_is_active(self, obj):
-        return obj.user.is_active
-
-    get_is_active.short_description = "Active"
-    get_is_active.boolean = True
-    get_is_active.admin_order_field = "user__is_active"
-
 
 @admin.register(PetSitter)
-class PetSitterAdmin(admin.ModelAdmin):
+class PetSitterAdmin(ShapeSearchMixin, admin.ModelAdmin):
     list_display = [
         "get_id",
         "get_email",
         "get_full_name",
         "get_phone",
         "location",
-        "get_is_active",
+        "is_active",
+        "created_at",
+    ]
+    list_filter = [
+        "is_active",
         "created_at",
+        AnimalTypeListFilter,
+        ServiceTypeListFilter,
     ]
-    list_filter = ["created_at", "animal_types", "service_types"]
+    list_select_related = ["user"]
     search_fields = ["user__email", "user__full_name", "user__phone", "location"]
-    readonly_fields = ["created_at", "updated_at"]
+    search_user_prefix = "user__"
+    search_extra_text_fields = ["search_location"]
+    readonly_fields = ["is_active", "created_at", "updated_at"]
     filter_horizontal = ["animal_types", "service_types"]
     ordering = ["-created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_id(self, obj):
-        return obj.user.id
+        return obj.user_id
 
     get_id.short_description = "ID"
-    get_id.admin_order_field = "user__id"
+    get_id.admin_order_field = "user_id"
 
     def get_email(self, obj):
         return obj.user.email
@@ -100,13 +202,6 @@ class PetSitterAdmin(admin.ModelAdmin):
     get_phone.short_description = "Phone"
     get_phone.admin_order_field = "user__phone"
 
-    def get_is_active(self, obj):
-        return obj.user.is_active
-
-    get_is_active.short_description = "Active"
-    get_is_active.boolean = True
-    get_is_active.admin_order_field = "user__is_active"
-
 
 @admin.register(AnimalType)
 class AnimalTypeAdmin(admin.ModelAdmin):
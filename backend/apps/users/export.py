@@ -0,0 +1,143 @@
+"""
+Streaming exports of customers and petsitters (NDJSON or CSV).
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)``, a server-side
+cursor on Postgres, and the animal/service type codes are prefetched once
+per chunk, so memory stays flat however large the table is. The writers are
+generators of text lines, suitable for StreamingHttpResponse or a file.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .models import AnimalType, Customer, PetSitter, ServiceType
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+USER_FIELDS = ["id", "email", "full_name", "phone", "is_active"]
+
+EXPORT_FIELDS = {
+    "customers": [*USER_FIELDS, "created_at", "updated_at"],
+    "petsitters": [
+        *USER_FIELDS,
+        "location",
+        "latitude",
+        "longitude",
+        "about",
+        "animal_types",
+        "other_animals",
+        "service_types",
+        "created_at",
+        "updated_at",
+    ],
+}
+
+
+def _user_values(profile):
+    user = profile.user
+    return {
+        "id": user.pk,
+        "email": user.email,
+        "full_name": user.full_name,
+        "phone": user.phone,
+        "is_active": profile.is_active,
+    }
+
+
+def _customer_rows(queryset):
+    for customer in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            **_user_values(customer),
+            "created_at": customer.created_at,
+            "updated_at": customer.updated_at,
+        }
+
+
+def _petsitter_rows(queryset):
+    queryset = queryset.prefetch_related(
+        Prefetch("animal_types", AnimalType.objects.only("animal_type")),
+        Prefetch("service_types", ServiceType.objects.only("service_type")),
+    )
+    for sitter in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            **_user_values(sitter),
+            "location": sitter.location,
+            "latitude": sitter.latitude,
+            "longitude": sitter.longitude,
+            "about": sitter.about,
+            "animal_types": sorted(t.animal_type for t in sitter.animal_types.all()),
+            "other_animals": sitter.other_animals,
+            "service_types": sorted(t.service_type for t in sitter.service_types.all()),
+            "created_at": sitter.created_at,
+            "updated_at": sitter.updated_at,
+        }
+
+
+def export_rows(kind, active_only=False):
+    """Yield one dict per customer or petsitter, in id order."""
+    model, rows = {
+        "customers": (Customer, _customer_rows),
+        "petsitters": (PetSitter, _petsitter_rows),
+    }[kind]
+
+    queryset = model.objects.select_related("user").order_by("pk")
+    if active_only:
+        queryset = queryset.active()
+    return rows(queryset)
+
+
+def render_ndjson(rows):
+    """One JSON object per line."""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+# Leading characters that make spreadsheets evaluate a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        value = "|".join(value)
+    elif hasattr(value, "isoformat"):
+        return value.isoformat()
+    # Names and texts are user input: quote would-be formulas (CSV injection)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def render_csv(rows, fields):
+    """
+    Header line, then one line per row; lists are joined with "|".
+
+    Text starting with =, +, -, @, tab or CR gets a leading ' so spreadsheets
+    show it instead of running it as a formula.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[field]) for field in fields])
+
+
+def render(kind, export_format, active_only=False):
+    """Lines of the kind export in export_format ("ndjson" or "csv")."""
+    rows = export_rows(kind, active_only)
+    if export_format == "csv":
+        return render_csv(rows, EXPORT_FIELDS[kind])
+    return render_ndjson(rows)
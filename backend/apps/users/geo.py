@@ -0,0 +1,227 @@
+"""
+Offline geocoding and geohash helpers for petsitter proximity search.
+
+Locations are resolved against a small gazetteer of Brazilian cities and CEP
+ranges bundled in ``users/data`` so no network call is needed at signup or
+update time. Coordinates are indexed through a geohash column: a radius query
+is turned into the handful of geohash prefixes covering its bounding box,
+which both Postgres and SQLite can answer with an index range scan.
+"""
+
+import csv
+import math
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .text import normalize
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+EARTH_RADIUS_KM = 6371.0
+
+# Precision stored in PetSitter.geohash (~150 m cells)
+GEOHASH_PRECISION = 7
+
+# Upper bound of prefixes used to cover a radius query
+MAX_COVERING_CELLS = 16
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Federative units, as written after a city ("Recife - PE", "Santos/SP")
+STATES = frozenset(
+    (
+        "AC AL AM AP BA CE DF ES GO MA MG MS MT PA PB PE PI "
+        "PR RJ RN RO RR RS SC SE SP TO"
+    ).split()
+)
+
+_CEP_RE = re.compile(r"\b(\d{5})-?(\d{3})\b")
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    latitude: float
+    longitude: float
+
+
+# ============================================================================
+# GAZETTEER
+# ============================================================================
+
+
+@lru_cache(maxsize=1)
+def _cities() -> Dict[str, Tuple[Place, ...]]:
+    """Normalized name or alias -> the places (one per state) it may refer to."""
+    cities: Dict[str, List[Place]] = {}
+    with open(DATA_DIR / "br_cities.csv", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            place = Place(
+                row["name"],
+                row["state"],
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+            aliases = filter(None, row["aliases"].split("|"))
+            for key in {normalize(row["name"]), *map(normalize, aliases)}:
+                cities.setdefault(key, []).append(place)
+    return {key: tuple(group) for key, group in cities.items()}
+
+
+def places() -> List[Place]:
+    """Every city of the gazetteer, once each (aliases collapsed)."""
+    return sorted({place for group in _cities().values() for place in group})
+
+
+@lru_cache(maxsize=1)
+def _cep_ranges() -> Tuple[List[int], List[Tuple[int, Place]]]:
+    cities = _cities()
+    ranges = []
+    with open(DATA_DIR / "br_cep_ranges.csv", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            place = next(
+                place
+                for place in cities[normalize(row["name"])]
+                if place.state == row["state"]
+            )
+            ranges.append((int(row["start"]), int(row["end"]), place))
+    ranges.sort()
+    return [start for start, _, _ in ranges], [(end, p) for _, end, p in ranges]
+
+
+def _geocode_cep(text: str) -> Optional[Place]:
+    match = _CEP_RE.search(text)
+    if not match:
+        return None
+
+    cep = int(match.group(1) + match.group(2))
+    starts, ends = _cep_ranges()
+    index = bisect_right(starts, cep) - 1
+    if index >= 0 and cep <= ends[index][0]:
+        return ends[index][1]
+    return None
+
+
+def _geocode_city(text: str) -> Optional[Place]:
+    """
+    The city named last in text, in the state of a trailing UF if there is one.
+
+    Street names are often city names ("Av. Rio Branco, 100 - Recife, PE"),
+    and the city comes after the street, so the rightmost name wins; among
+    names ending at the same word the longest does ("Aparecida de Goiânia"
+    over "Goiânia"). Names from another state than the trailing UF are
+    skipped, so "Rua Recife, 10 - SP" is not placed in Pernambuco.
+    """
+    cities = _cities()
+    tokens = normalize(text).split()
+    while tokens and tokens[-1].isdigit():
+        tokens.pop()
+    state = None
+    if tokens and tokens[-1].upper() in STATES:
+        state = tokens.pop().upper()
+    longest = max((len(name.split()) for name in cities), default=0)
+
+    for end in range(len(tokens), 0, -1):
+        for size in range(min(longest, end), 0, -1):
+            for place in cities.get(" ".join(tokens[end - size : end]), ()):
+                if state is None or place.state == state:
+                    return place
+    return None
+
+
+def geocode(location: str) -> Optional[Tuple[float, float]]:
+    """Resolve a free-text location to (latitude, longitude), if known."""
+    if not location:
+        return None
+
+    place = _geocode_cep(location) or _geocode_city(location)
+    if place is None:
+        return None
+    return place.latitude, place.longitude
+
+
+# ============================================================================
+# DISTANCE AND GEOHASH
+# ============================================================================
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points (haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(
+    lat: float, lng: float, radius_km: float
+) -> Tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing the radius."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlng = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return (
+        max(lat - dlat, -90.0),
+        min(lat + dlat, 90.0),
+        max(lng - dlng, -180.0),
+        min(lng + dlng, 180.0),
+    )
+
+
+def geohash_encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION):
+    """Encode a coordinate as a base32 geohash string."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[value])
+            bit = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """Return the (lat, lng) size in degrees of a geohash cell."""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def covering_cells(lat: float, lng: float, radius_km: float) -> Set[str]:
+    """Return geohash prefixes whose cells cover the radius' bounding box."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = _cell_size(precision)
+        rows = math.ceil((max_lat - min_lat) / lat_step) + 1
+        cols = math.ceil((max_lng - min_lng) / lng_step) + 1
+        if rows * cols <= MAX_COVERING_CELLS or precision == 1:
+            break
+
+    lats = [min(min_lat + i * lat_step, max_lat) for i in range(rows)] + [max_lat]
+    lngs = [min(min_lng + j * lng_step, max_lng) for j in range(cols)] + [max_lng]
+    return {geohash_encode(y, x, precision) for y in lats for x in lngs}
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from users.export import EXPORT_FIELDS, EXPORT_FORMATS, render
+
+
+class Command(BaseCommand):
+    help = "Stream all customers or petsitters as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORT_FIELDS))
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            choices=sorted(EXPORT_FORMATS),
+            default="ndjson",
+            help="Output format (default: ndjson).",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="File to write to (default: stdout).",
+        )
+        parser.add_argument(
+            "--active-only",
+            action="store_true",
+            help="Skip deactivated accounts.",
+        )
+
+    def handle(self, *args, **options):
+        lines = render(
+            options["kind"], options["export_format"], options["active_only"]
+        )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as fh:
+                fh.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
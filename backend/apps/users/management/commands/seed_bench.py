@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Bulk-create synthetic customers and petsitters for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sitters", type=int, default=0)
+        parser.add_argument("--customers", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows inserted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Random seed, for the same data on every run.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the existing bench accounts first.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from users import seed
+        except ImportError as exc:
+            raise CommandError(
+                f"seed_bench needs the dev requirements (requirements-dev.txt): {exc}"
+            )
+
+        if options["clear"]:
+            deleted = seed.clear()
+            self.stdout.write(f"Deleted {deleted} bench rows.")
+
+        seed.seed(
+            sitters=options["sitters"],
+            customers=options["customers"],
+            batch_size=options["batch_size"],
+            random_seed=options["seed"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {options['sitters']} petsitters and "
+                f"{options['customers']} customers "
+                f"(password: {seed.BENCH_PASSWORD})."
+            )
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+def sync_is_active(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    inactive_ids = User.objects.filter(is_active=False).values("id")
+
+    for model_name in ("Customer", "PetSitter"):
+        model = apps.get_model("users", model_name)
+        model.objects.filter(user_id__in=inactive_ids).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_animaltype_servicetype_petsitter_about_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="is_active",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="petsitter",
+            name="is_active",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(sync_is_active, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["is_active", "-created_at"], name="customers_active_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="petsitter",
+            index=models.Index(
+                fields=["is_active", "-created_at"],
+                name="petsitters_active_created_idx",
+            ),
+        ),
+    ]
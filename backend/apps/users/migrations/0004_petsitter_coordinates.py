@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:14
+
+from django.db import migrations, models
+
+from users import geo
+
+
+def geocode_petsitters(apps, schema_editor):
+    PetSitter = apps.get_model("users", "PetSitter")
+
+    for petsitter in PetSitter.objects.exclude(location="").iterator():
+        coordinates = geo.geocode(petsitter.location)
+        if coordinates is None:
+            continue
+        petsitter.latitude, petsitter.longitude = coordinates
+        petsitter.geohash = geo.geohash_encode(*coordinates)
+        petsitter.save(update_fields=["latitude", "longitude", "geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_profile_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="petsitter",
+            name="geohash",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=12
+            ),
+        ),
+        migrations.AddField(
+            model_name="petsitter",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="petsitter",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(geocode_petsitters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+def compute_profile_scores(apps, schema_editor):
+    PetSitter = apps.get_model("users", "PetSitter")
+
+    # Same rule as PetSitter.compute_profile_score(): str.strip() also drops
+    # the newlines and tabs SQL TRIM keeps, so this runs in Python
+    batch = []
+    for sitter in PetSitter.objects.only("pk", "about", "location").iterator(
+        chunk_size=2000
+    ):
+        sitter.profile_score = sum(
+            1 for value in (sitter.about, sitter.location) if value.strip()
+        )
+        batch.append(sitter)
+        if len(batch) == 2000:
+            PetSitter.objects.bulk_update(batch, ["profile_score"])
+            batch = []
+    PetSitter.objects.bulk_update(batch, ["profile_score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_petsitter_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="petsitter",
+            name="profile_score",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compute_profile_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="petsitter",
+            index=models.Index(
+                fields=["is_active", "-profile_score", "-created_at"],
+                name="petsitters_active_score_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:18
+
+from django.db import migrations, models
+
+from users.text import normalize
+
+
+def fill_search_columns(apps, schema_editor):
+    PetSitter = apps.get_model("users", "PetSitter")
+
+    for petsitter in PetSitter.objects.select_related("user").iterator():
+        petsitter.search_name = normalize(petsitter.user.full_name)
+        petsitter.search_location = normalize(petsitter.location)
+        petsitter.save(update_fields=["search_name", "search_location"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_petsitter_profile_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="petsitter",
+            name="search_location",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="petsitter",
+            name="search_name",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+    ]
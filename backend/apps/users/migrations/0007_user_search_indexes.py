@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:26
+
+import django.db.models.functions.text
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations, models
+
+from users.search import full_name_vector, phone_digits
+
+FULL_NAME_SEARCH_INDEX = "users_full_name_search_idx"
+
+
+def fill_phone_digits(apps, schema_editor):
+    User = apps.get_model("users", "User")
+
+    for user in User.objects.only("id", "phone").iterator():
+        user.phone_digits = phone_digits(user.phone)
+        user.save(update_fields=["phone_digits"])
+
+
+def full_name_index():
+    return GinIndex(full_name_vector(), name=FULL_NAME_SEARCH_INDEX)
+
+
+def add_full_name_search_index(apps, schema_editor):
+    # Full-text GIN index only exists on Postgres; other backends use icontains
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("users", "User"), full_name_index())
+
+
+def remove_full_name_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("users", "User"), full_name_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_petsitter_search_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=20
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="users_email_lower_idx",
+            ),
+        ),
+        migrations.RunPython(fill_phone_digits, migrations.RunPython.noop),
+        migrations.RunPython(
+            add_full_name_search_index, remove_full_name_search_index
+        ),
+    ]
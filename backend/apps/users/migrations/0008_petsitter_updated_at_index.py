@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_user_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="petsitter",
+            index=models.Index(
+                fields=["updated_at", "user"], name="petsitters_updated_at_idx"
+            ),
+        ),
+    ]
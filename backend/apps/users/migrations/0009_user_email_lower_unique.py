@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_case_duplicates(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    duplicates = list(
+        User.objects.annotate(email_lower=Lower("email"))
+        .values("email_lower")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("email_lower", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Merge or rename the users whose emails differ only by case "
+            f"before migrating: {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_petsitter_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="users_email_lower_uniq",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_email_lower_idx",
+        ),
+    ]
@@ -1,9 +1,36 @@
+import math
+
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import connections, models
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import (
+    ASin,
+    Coalesce,
+    Cos,
+    Lower,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
+)
+from django.utils import timezone
+
+from . import geo, search
+from .text import normalize
 
 
 class UserManager(BaseUserManager):
@@ -44,6 +71,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, db_index=True)
     full_name = models.CharField(max_length=255)
     phone = models.CharField(max_length=20)
+    # Digits-only copy of phone, filled on save, for admin phone search
+    phone_digits = models.CharField(
+        max_length=20, blank=True, default="", db_index=True, editable=False
+    )
     user_type = models.CharField(max_length=20, choices=USER_TYPE_CHOICES)
 
     # Permissions
@@ -65,10 +96,185 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-created_at"]
+        constraints = [
+            # Case-insensitive uniqueness, also serving lower(email) lookups
+            models.UniqueConstraint(Lower("email"), name="users_email_lower_uniq"),
+        ]
 
     def __str__(self):
         return f"{self.email} ({self.user_type})"
 
+    def save(self, *args, **kwargs):
+        """Save the user and keep the denormalized profile columns in sync."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "phone" in update_fields:
+            self.phone_digits = search.phone_digits(self.phone)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "phone_digits"}
+
+        super().save(*args, **kwargs)
+
+        if update_fields is None or {"is_active", "full_name"} & set(update_fields):
+            self._sync_profile()
+
+    def _sync_profile(self):
+        """Mirror user columns onto the profile row so listings avoid the join."""
+        if self.user_type == "customer":
+            profile_model = Customer
+            values = {"is_active": self.is_active}
+        elif self.user_type == "petsitter":
+            profile_model = PetSitter
+            values = {
+                "is_active": self.is_active,
+                "search_name": normalize(self.full_name),
+            }
+        else:
+            return
+
+        profile_model.objects.filter(user_id=self.pk).exclude(**values).update(
+            **values, updated_at=timezone.now()
+        )
+
+
+class ProfileQuerySet(models.QuerySet):
+    """QuerySet shared by the Customer and PetSitter profiles."""
+
+    def active(self):
+        """Return only profiles whose user account is active."""
+        return self.filter(is_active=True)
+
+
+class PetSitterQuerySet(ProfileQuerySet):
+    """QuerySet with the petsitter search helpers."""
+
+    # Weights of the "best match" rank components
+    RANK_TEXT_WEIGHT = 4
+    RANK_TYPE_WEIGHT = 2
+    RANK_PROFILE_WEIGHT = 1
+
+    def _type_links(self, field_name, code_field, codes):
+        """Rows of an M2M through table linking petsitters to any of codes."""
+        through = getattr(self.model, field_name).through
+        target = self.model._meta.get_field(field_name).m2m_reverse_name()
+        return through.objects.filter(
+            **{f"{target}__{code_field}__in": codes}
+        ).order_by()
+
+    def _matched_type_count(self, field_name, code_field, codes):
+        """Subquery counting how many of codes a petsitter has in an M2M."""
+        matches = (
+            self._type_links(field_name, code_field, codes)
+            .filter(petsitter_id=OuterRef("pk"))
+            .values("petsitter_id")
+            .annotate(n=Count("*"))
+            .values("n")
+        )
+        return Coalesce(Subquery(matches, output_field=IntegerField()), 0)
+
+    def with_types(self, field_name, code_field, codes, match="any"):
+        """
+        Keep petsitters offering any (or, with match="all", every) code.
+
+        Both modes filter through a single pk IN (subquery) on the through
+        table, grouped with HAVING COUNT for "all", so the outer query never
+        joins the M2M tables and needs no DISTINCT however many codes are
+        selected.
+        """
+        codes = set(codes)
+        links = self._type_links(field_name, code_field, codes).values("petsitter_id")
+        if match == "all":
+            links = links.annotate(n=Count("*")).filter(n=len(codes))
+        return self.filter(pk__in=links.values("petsitter_id"))
+
+    def with_prefix(self, field_name, prefix):
+        """Keep rows whose normalized search column starts with prefix."""
+        return search.prefix_filter(self, field_name, prefix)
+
+    def best_match(self, search="", animal_types=(), service_types=()):
+        """
+        Annotate a rank and order by it, best matches first.
+
+        The rank weighs text relevance (name prefix > name > location), how
+        many of the requested animal/service types a petsitter covers and the
+        profile_score precomputed on save. Without search terms or types the
+        rank is just profile_score, which the
+        (is_active, profile_score, created_at) index serves directly.
+        """
+        if not (search or animal_types or service_types):
+            return self.order_by("-profile_score", "-created_at")
+
+        rank = Value(0)
+        if search:
+            rank = rank + self.RANK_TEXT_WEIGHT * Case(
+                When(user__full_name__istartswith=search, then=Value(3)),
+                When(user__full_name__icontains=search, then=Value(2)),
+                When(location__icontains=search, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        if animal_types:
+            rank = rank + self.RANK_TYPE_WEIGHT * self._matched_type_count(
+                "animal_types", "animal_type", animal_types
+            )
+        if service_types:
+            rank = rank + self.RANK_TYPE_WEIGHT * self._matched_type_count(
+                "service_types", "service_type", service_types
+            )
+        rank = rank + self.RANK_PROFILE_WEIGHT * F("profile_score")
+
+        return self.annotate(rank=rank).order_by("-rank", "-created_at")
+
+    def near(self, latitude, longitude, radius_km):
+        """
+        Keep petsitters within radius_km of a point, annotated with distance_km.
+
+        The geohash prefixes covering the radius narrow the scan through the
+        geohash index before the exact haversine distance is computed.
+        """
+        cells = geo.covering_cells(latitude, longitude, radius_km)
+        vendor = connections[self.db].vendor
+        in_cells = Q()
+        for cell in sorted(cells):
+            in_cells |= search.prefix_q("geohash", cell, vendor)
+
+        min_lat, max_lat, min_lng, max_lng = geo.bounding_box(
+            latitude, longitude, radius_km
+        )
+        lat0 = Value(math.radians(latitude))
+        lng0 = Value(math.radians(longitude))
+        haversine = Power(Sin((Radians(F("latitude")) - lat0) / 2), 2) + Cos(
+            lat0
+        ) * Cos(Radians(F("latitude"))) * Power(
+            Sin((Radians(F("longitude")) - lng0) / 2), 2
+        )
+
+        return (
+            self.filter(in_cells)
+            .filter(
+                latitude__range=(min_lat, max_lat),
+                longitude__range=(min_lng, max_lng),
+            )
+            .annotate(
+                distance_km=Value(2 * geo.EARTH_RADIUS_KM)
+                * ASin(Sqrt(haversine, output_field=models.FloatField()))
+            )
+            .filter(distance_km__lte=radius_km)
+        )
+
+
+class ActiveProfileManager(models.Manager.from_queryset(ProfileQuerySet)):
+    """Manager that hides profiles of deactivated users."""
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
+
+class ActivePetSitterManager(models.Manager.from_queryset(PetSitterQuerySet)):
+    """Manager that hides petsitters whose account was deactivated."""
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
 
 class Customer(models.Model):
     """Customer profile model."""
@@ -83,19 +289,36 @@ class Customer(models.Model):
     # Customer specific fields can be added here in the future
     # For example: address, preferred_payment_method, etc.
 
+    # Denormalized copy of user.is_active, kept in sync by User.save()
+    is_active = models.BooleanField(default=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileQuerySet.as_manager()
+    active_objects = ActiveProfileManager()
+
     class Meta:
         db_table = "customers"
         verbose_name = "Customer"
         verbose_name_plural = "Customers"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["is_active", "-created_at"],
+                name="customers_active_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Customer: {self.user.full_name}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.is_active = self.user.is_active
+        super().save(*args, **kwargs)
+
     @property
     def email(self):
         return self.user.email
@@ -108,10 +331,6 @@ class Customer(models.Model):
     def phone(self):
         return self.user.phone
 
-    @property
-    def is_active(self):
-        return self.user.is_active
-
 
 class AnimalType(models.Model):
     """Animal types that petsitters can care for."""
@@ -184,6 +403,21 @@ class PetSitter(models.Model):
         help_text='Other animals if "Outros" is selected',
     )
 
+    # Coordinates geocoded offline from location (see users.geo)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geohash = models.CharField(
+        max_length=12, blank=True, default="", db_index=True, editable=False
+    )
+
+    # Normalized (lowercase, unaccented) name/location for prefix suggestions
+    search_name = models.CharField(
+        max_length=255, blank=True, default="", db_index=True, editable=False
+    )
+    search_location = models.CharField(
+        max_length=255, blank=True, default="", db_index=True, editable=False
+    )
+
     # Many-to-many relationships
     animal_types = models.ManyToManyField(
         AnimalType,
@@ -197,19 +431,89 @@ class PetSitter(models.Model):
         help_text="Services offered by the petsitter",
     )
 
+    # Denormalized copy of user.is_active, kept in sync by User.save()
+    is_active = models.BooleanField(default=True, editable=False)
+
+    # Profile completeness, precomputed on save for "best match" ordering
+    profile_score = models.PositiveSmallIntegerField(default=0, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PetSitterQuerySet.as_manager()
+    active_objects = ActivePetSitterManager()
+
     class Meta:
         db_table = "petsitters"
         verbose_name = "PetSitter"
         verbose_name_plural = "PetSitters"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["is_active", "-created_at"],
+                name="petsitters_active_created_idx",
+            ),
+            models.Index(
+                fields=["is_active", "-profile_score", "-created_at"],
+                name="petsitters_active_score_idx",
+            ),
+            # Delta sync walks (updated_at, user_id) in order
+            models.Index(
+                fields=["updated_at", "user"],
+                name="petsitters_updated_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"PetSitter: {self.user.full_name}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.is_active = self.user.is_active
+
+        update_fields = kwargs.get("update_fields")
+        # Full saves rewrite every column: recompute, or a copy loaded before
+        # User._sync_profile() ran would write its old search_name back
+        if update_fields is None:
+            self.search_name = normalize(self.user.full_name)
+
+        if update_fields is None or "location" in update_fields:
+            self.refresh_coordinates()
+            self.search_location = normalize(self.location)
+            if update_fields is not None:
+                update_fields = {
+                    *update_fields,
+                    "latitude",
+                    "longitude",
+                    "geohash",
+                    "search_location",
+                }
+
+        if update_fields is None or {"location", "about"} & set(update_fields):
+            self.profile_score = self.compute_profile_score()
+            if update_fields is not None:
+                update_fields = {*update_fields, "profile_score"}
+
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+
+        super().save(*args, **kwargs)
+
+    def compute_profile_score(self):
+        """Return how complete the profile is (one point per filled field)."""
+        return sum(1 for value in (self.about, self.location) if value.strip())
+
+    def refresh_coordinates(self):
+        """Geocode location into latitude/longitude/geohash (offline)."""
+        coordinates = geo.geocode(self.location)
+        if coordinates is None:
+            self.latitude = self.longitude = None
+            self.geohash = ""
+        else:
+            self.latitude, self.longitude = coordinates
+            self.geohash = geo.geohash_encode(*coordinates)
+
     @property
     def email(self):
         return self.user.email
@@ -221,7 +525,3 @@ class PetSitter(models.Model):
     @property
     def phone(self):
         return self.user.phone
-
-    @property
-    def is_active(self):
-        return self.user.is_active
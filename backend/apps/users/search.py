@@ -0,0 +1,106 @@
+"""
+Index-backed lookups for searching users by email, phone or name.
+
+Search input is dispatched by its shape instead of OR-ing icontains over every
+column: an email becomes an exact match on lower(email), a phone number a
+prefix match on the normalized phone_digits column and anything else a
+full-text match on full_name (GIN index on Postgres, icontains elsewhere).
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .text import normalize
+
+# Text search configuration of the users full_name GIN index
+SEARCH_CONFIG = "simple"
+
+MIN_PHONE_DIGITS = 3
+
+_PHONE_RE = re.compile(r"^\+?[\d\s().-]+$")
+_WORD_RE = re.compile(r"\w+")
+
+
+def phone_digits(phone: str) -> str:
+    """Strip everything but digits from a phone number."""
+    return re.sub(r"\D", "", phone or "")
+
+
+def full_name_vector(field_name="full_name"):
+    """The expression indexed by users_full_name_search_idx."""
+    return SearchVector(field_name, config=SEARCH_CONFIG)
+
+
+def prefix_q(field_name, prefix, vendor):
+    """
+    Q for rows whose normalized column (ASCII only) starts with prefix.
+
+    Matches sort in [prefix, prefix + "\\x7f") byte-wise. Postgres answers
+    startswith from the varchar_pattern_ops index Django creates for indexed
+    CharFields; other backends (SQLite's case-insensitive LIKE cannot use a
+    BINARY index) get the explicit range so they can seek the B-tree instead
+    of scanning. OR-ed together, each term still seeks the index.
+    """
+    q = Q(**{f"{field_name}__startswith": prefix})
+    if vendor != "postgresql":
+        q &= Q(**{f"{field_name}__gte": prefix, f"{field_name}__lt": prefix + "\x7f"})
+    return q
+
+
+def prefix_filter(queryset, field_name, prefix):
+    """Keep rows whose normalized column starts with prefix (see prefix_q)."""
+    vendor = connections[queryset.db].vendor
+    return queryset.filter(prefix_q(field_name, prefix, vendor))
+
+
+def search_users(queryset, term, user_prefix="", extra_text_fields=()):
+    """
+    Filter queryset by a free-form admin search term.
+
+    user_prefix is the path to the User model ("" for users, "user__" for
+    profiles). extra_text_fields are normalized columns matched by prefix
+    alongside the name for plain-text terms.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+
+    if "@" in term:
+        return queryset.alias(email_lower=Lower(f"{user_prefix}email")).filter(
+            email_lower=term.lower()
+        )
+
+    digits = phone_digits(term)
+    if _PHONE_RE.match(term) and len(digits) >= MIN_PHONE_DIGITS:
+        return prefix_filter(queryset, f"{user_prefix}phone_digits", digits)
+
+    words = _WORD_RE.findall(term.lower())
+    if not words:
+        return queryset.none()
+
+    if connections[queryset.db].vendor == "postgresql":
+        # Every word as a prefix: "jo sil" matches "João Silva"
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            config=SEARCH_CONFIG,
+            search_type="raw",
+        )
+        queryset = queryset.alias(
+            name_vector=full_name_vector(f"{user_prefix}full_name")
+        )
+        condition = Q(name_vector=query)
+    else:
+        condition = Q(**{f"{user_prefix}full_name__icontains": term})
+
+    if extra_text_fields:
+        # Prefix matches on the extra columns run as separate index lookups
+        prefix = normalize(term)
+        for field_name in extra_text_fields:
+            matches = prefix_filter(queryset.model._default_manager, field_name, prefix)
+            condition |= Q(pk__in=matches.values("pk"))
+
+    return queryset.filter(condition)
@@ -0,0 +1,159 @@
+"""
+Synthetic customers and petsitters for load tests and benchmarks.
+
+Rows are bulk-inserted in batches with names, phones and neighbourhoods from
+the Brazilian Faker locale. Most locations are cities of the bundled
+gazetteer, so proximity search has coordinates to work with. The derived
+columns that PetSitter.save() would fill (coordinates, search text, profile
+score) are computed here, since bulk_create() skips save().
+
+Every generated account uses BENCH_PASSWORD and an ``@bench.local`` email
+(``customer{i}@bench.local``, ``sitter{i}@bench.local``), so benchmarks can log
+in as any of them and ``clear()`` can remove them again.
+"""
+
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Length
+
+from faker import Faker
+
+from . import geo, search
+from .models import AnimalType, Customer, PetSitter, ServiceType, User
+from .text import normalize
+
+BENCH_DOMAIN = "bench.local"
+BENCH_PASSWORD = "BenchPass123!"
+
+# Share of petsitter locations taken from the gazetteer (the rest may not
+# geocode, like free-text locations typed by real users)
+KNOWN_CITY_RATIO = 0.9
+
+ANIMAL_CODES = [code for code, _ in AnimalType.ANIMAL_CHOICES]
+SERVICE_CODES = [code for code, _ in ServiceType.SERVICE_CHOICES]
+
+
+def bench_email(kind, i):
+    return f"{kind}{i}@{BENCH_DOMAIN}"
+
+
+def _phone(fake):
+    return f"({fake.random_int(11, 99)}) 9{fake.numerify('####-####')}"
+
+
+def _location(fake, places):
+    if random.random() < KNOWN_CITY_RATIO:
+        place = random.choice(places)
+        return f"{fake.bairro()}, {place.name}, {place.state}"
+    return f"{fake.city()}, {fake.estado_sigla()}"
+
+
+def _about(fake):
+    # A few empty bios keep profile_score (and best_match ordering) varied
+    if random.random() < 0.1:
+        return ""
+    return fake.paragraph(nb_sentences=3)
+
+
+def _next_index(kind):
+    """One past the highest index in use, so gaps left by deletes are skipped."""
+    # Indexes have no leading zeros: the longest, then greatest, email wins
+    last = (
+        User.objects.filter(email__startswith=kind, email__endswith=f"@{BENCH_DOMAIN}")
+        .order_by(Length("email").desc(), "-email")
+        .values_list("email", flat=True)
+        .first()
+    )
+    if last is None:
+        return 0
+    return int(last[len(kind) : -len(BENCH_DOMAIN) - 1]) + 1
+
+
+def _create_users(fake, kind, start, count, password):
+    users = []
+    for i in range(start, start + count):
+        phone = _phone(fake)
+        users.append(
+            User(
+                email=bench_email(kind, i),
+                password=password,
+                full_name=fake.name(),
+                phone=phone,
+                phone_digits=search.phone_digits(phone),
+                user_type="petsitter" if kind == "sitter" else "customer",
+            )
+        )
+    return User.objects.bulk_create(users)
+
+
+def seed_customers(fake, count, batch_size, password):
+    start = _next_index("customer")
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        with transaction.atomic():
+            users = _create_users(fake, "customer", start + offset, size, password)
+            Customer.objects.bulk_create(Customer(user=user) for user in users)
+
+
+def seed_petsitters(fake, count, batch_size, password):
+    start = _next_index("sitter")
+    places = geo.places()
+    animals = [AnimalType.objects.get_or_create(animal_type=c)[0] for c in ANIMAL_CODES]
+    services = [
+        ServiceType.objects.get_or_create(service_type=c)[0] for c in SERVICE_CODES
+    ]
+    animal_through = PetSitter.animal_types.through
+    service_through = PetSitter.service_types.through
+
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        with transaction.atomic():
+            users = _create_users(fake, "sitter", start + offset, size, password)
+
+            sitters = []
+            for user in users:
+                sitter = PetSitter(
+                    user=user,
+                    location=_location(fake, places),
+                    about=_about(fake),
+                    search_name=normalize(user.full_name),
+                )
+                sitter.refresh_coordinates()
+                sitter.search_location = normalize(sitter.location)
+                sitter.profile_score = sitter.compute_profile_score()
+                sitters.append(sitter)
+            PetSitter.objects.bulk_create(sitters)
+
+            animal_links, service_links = [], []
+            for user in users:
+                for animal in random.sample(animals, random.randint(1, 3)):
+                    animal_links.append(
+                        animal_through(petsitter_id=user.pk, animaltype_id=animal.pk)
+                    )
+                for service in random.sample(services, random.randint(1, 3)):
+                    service_links.append(
+                        service_through(petsitter_id=user.pk, servicetype_id=service.pk)
+                    )
+            animal_through.objects.bulk_create(animal_links)
+            service_through.objects.bulk_create(service_links)
+
+
+def seed(sitters=0, customers=0, batch_size=1000, random_seed=None):
+    """Bulk-create bench accounts, numbered after any that already exist."""
+    if random_seed is not None:
+        random.seed(random_seed)
+        Faker.seed(random_seed)
+    fake = Faker("pt_BR")
+    # One hash for every account: hashing per row would dominate the run
+    password = make_password(BENCH_PASSWORD)
+
+    seed_customers(fake, customers, batch_size, password)
+    seed_petsitters(fake, sitters, batch_size, password)
+
+
+def clear():
+    """Delete every bench account (profiles and links cascade)."""
+    deleted, _ = User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").delete()
+    return deleted
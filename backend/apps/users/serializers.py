@@ -3,12 +3,58 @@ from typing import Any, Dict, Optional
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 
 from drf_spectacular.utils import extend_schema_field
+from jobs.outbox import publish
 from rest_framework import serializers
 
 from .models import AnimalType, Customer, PetSitter, ServiceType, User
+from .tasks import send_welcome_email
+
+DUPLICATE_EMAIL_MESSAGE = "This email is already registered."
+
+
+def create_signup_user(**fields):
+    """
+    Insert a new user, reporting a taken email as a validation error.
+
+    There is no SELECT beforehand: the unique index on lower(email) rejects
+    duplicates atomically, so two concurrent signups with the same email get
+    one 201 and one 400 instead of a 500. Only then is the email looked up,
+    so that other constraint violations are raised as they are.
+    """
+    try:
+        with transaction.atomic():
+            return User.objects.create_user(**fields)
+    except IntegrityError:
+        email = User.objects.normalize_email(fields.get("email", ""))
+        if not User.objects.filter(email__iexact=email).exists():
+            raise
+        raise serializers.ValidationError({"email": [DUPLICATE_EMAIL_MESSAGE]})
+
+
+def get_type_rows(model, field, codes):
+    """
+    AnimalType or ServiceType rows for the given codes, creating missing ones.
+
+    One SELECT for all the codes (plus an INSERT the first time a code is
+    used), instead of a get_or_create per code.
+    """
+    codes = list(dict.fromkeys(codes))
+    rows = {
+        getattr(row, field): row
+        for row in model.objects.filter(**{f"{field}__in": codes})
+    }
+    missing = [code for code in codes if code not in rows]
+    if missing:
+        model.objects.bulk_create(
+            [model(**{field: code}) for code in missing], ignore_conflicts=True
+        )
+        for row in model.objects.filter(**{f"{field}__in": missing}):
+            rows[getattr(row, field)] = row
+    return [rows[code] for code in codes]
+
 
 # ============================================================================
 # AUTHENTICATION SERIALIZERS
@@ -169,9 +215,7 @@ class CustomerSignupSerializer(serializers.Serializer):
     )
 
     def validate_email(self, value):
-        """Check if email is already registered."""
-        if User.objects.filter(email=value.lower()).exists():
-            raise serializers.ValidationError("This email is already registered.")
+        """Normalize the email; uniqueness is enforced on insert."""
         return value.lower()
 
     def validate_password(self, value):
@@ -197,7 +241,7 @@ class CustomerSignupSerializer(serializers.Serializer):
         validated_data.pop("confirm_password")
 
         # Create user
-        user = User.objects.create_user(
+        user = create_signup_user(
             email=validated_data["email"],
             password=validated_data["password"],
             full_name=validated_data["full_name"],
@@ -208,6 +252,8 @@ class CustomerSignupSerializer(serializers.Serializer):
         # Create customer profile
         customer = Customer.objects.create(user=user)
 
+        send_welcome_email.enqueue_on_commit(user_id=user.pk)
+
         return customer
 
     def to_representation(self, instance):
@@ -387,6 +433,7 @@ class PetSitterSerializer(serializers.ModelSerializer):
     user_type = serializers.CharField(source="user.user_type", read_only=True)
     animal_types = AnimalTypeSerializer(many=True, read_only=True)
     service_types = ServiceTypeSerializer(many=True, read_only=True)
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = PetSitter
@@ -398,6 +445,9 @@ class PetSitterSerializer(serializers.ModelSerializer):
             "is_active",
             "user_type",
             "location",
+            "latitude",
+            "longitude",
+            "distance_km",
             "about",
             "animal_types",
             "service_types",
@@ -407,6 +457,36 @@ class PetSitterSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
+    @extend_schema_field(serializers.FloatField(allow_null=True))
+    def get_distance_km(self, obj: PetSitter) -> Optional[float]:
+        """Return the distance to the near= point, when one was given."""
+        distance = getattr(obj, "distance_km", None)
+        return None if distance is None else round(distance, 2)
+
+
+class PetSitterSuggestionSerializer(serializers.Serializer):
+    """Serializer for search-bar suggestions (name or location)."""
+
+    id = serializers.IntegerField(allow_null=True, read_only=True)
+    text = serializers.CharField(read_only=True)
+    kind = serializers.ChoiceField(choices=["name", "location"], read_only=True)
+
+
+class PetSitterChangesSerializer(serializers.Serializer):
+    """Serializer for a page of the petsitter delta sync feed."""
+
+    upserts = PetSitterSerializer(many=True, read_only=True)
+    tombstones = serializers.ListField(
+        child=serializers.IntegerField(),
+        read_only=True,
+        help_text="Ids of deactivated petsitters to drop from the local cache",
+    )
+    next_cursor = serializers.CharField(
+        read_only=True,
+        help_text="Pass as since= to fetch the following changes",
+    )
+    has_more = serializers.BooleanField(read_only=True)
+
 
 class PetSitterSignupSerializer(serializers.Serializer):
     """Serializer for petsitter signup/registration."""
@@ -499,9 +579,7 @@ class PetSitterSignupSerializer(serializers.Serializer):
     )
 
     def validate_email(self, value):
-        """Check if email is already registered."""
-        if User.objects.filter(email=value.lower()).exists():
-            raise serializers.ValidationError("This email is already registered.")
+        """Normalize the email; uniqueness is enforced on insert."""
         return value.lower()
 
     def validate_password(self, value):
@@ -560,7 +638,7 @@ class PetSitterSignupSerializer(serializers.Serializer):
         other_animals = validated_data.pop("other_animals", "")
 
         # Create user
-        user = User.objects.create_user(
+        user = create_signup_user(
             email=validated_data["email"],
             password=validated_data["password"],
             full_name=validated_data["full_name"],
@@ -573,17 +651,16 @@ class PetSitterSignupSerializer(serializers.Serializer):
             user=user, location=location, about=about, other_animals=other_animals
         )
 
-        # Add animal types (create if don't exist)
-        for animal_type in animal_types:
-            animal_obj, _ = AnimalType.objects.get_or_create(animal_type=animal_type)
-            petsitter.animal_types.add(animal_obj)
+        # Add animal and service types (create if don't exist)
+        petsitter.animal_types.add(
+            *get_type_rows(AnimalType, "animal_type", animal_types)
+        )
+        petsitter.service_types.add(
+            *get_type_rows(ServiceType, "service_type", service_types)
+        )
 
-        # Add service types (create if don't exist)
-        for service_type in service_types:
-            service_obj, _ = ServiceType.objects.get_or_create(
-                service_type=service_type
-            )
-            petsitter.service_types.add(service_obj)
+        publish("petsitter.created", petsitter.pk)
+        send_welcome_email.enqueue_on_commit(user_id=user.pk)
 
         return petsitter
 
@@ -687,21 +764,23 @@ class PetSitterUpdateSerializer(serializers.Serializer):
 
         # Update animal types if provided
         if "animal_types" in validated_data:
-            instance.animal_types.clear()
-            for animal_type in validated_data["animal_types"]:
-                animal_obj, _ = AnimalType.objects.get_or_create(
-                    animal_type=animal_type
-                )
-                instance.animal_types.add(animal_obj)
+            instance.animal_types.set(
+                get_type_rows(AnimalType, "animal_type", validated_data["animal_types"])
+            )
 
         # Update service types if provided
         if "service_types" in validated_data:
-            instance.service_types.clear()
-            for service_type in validated_data["service_types"]:
-                service_obj, _ = ServiceType.objects.get_or_create(
-                    service_type=service_type
+            instance.service_types.set(
+                get_type_rows(
+                    ServiceType, "service_type", validated_data["service_types"]
                 )
-                instance.service_types.add(service_obj)
+            )
+
+        publish(
+            "petsitter.updated",
+            instance.pk,
+            {"fields": sorted(validated_data)},
+        )
 
         return instance
 
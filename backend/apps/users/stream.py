@@ -0,0 +1,293 @@
+"""
+Server-Sent Events stream of petsitter profile changes.
+
+Each process runs a single ChangeHub task that polls the outbox (see
+jobs.outbox) for new ``petsitter.*`` events once per POLL_INTERVAL, loads the
+changed profiles in one query and fans compact notifications out to the
+in-memory queue of every matching subscriber. An idle connection therefore
+costs a queue and a parked coroutine, not a database query.
+
+Notifications carry the outbox id as the SSE id, so a reconnecting client
+sending Last-Event-ID gets the events it missed replayed first. Subscribers
+that fall too far behind receive a ``reset`` event and should refetch.
+Delivery is best effort (an event committed after a newer one was already
+polled is skipped), so clients still refresh on resume.
+
+The endpoint needs an ASGI server (``uvicorn config.asgi:application``).
+"""
+
+import asyncio
+import json
+import logging
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+
+from asgiref.sync import sync_to_async
+from jobs.models import OutboxEvent
+from rest_framework.authtoken.models import Token
+
+from .models import AnimalType, PetSitter, ServiceType
+from .text import normalize
+
+logger = logging.getLogger(__name__)
+
+TOPIC_PREFIX = "petsitter."
+
+# Seconds between outbox polls (one query per process, not per connection)
+POLL_INTERVAL = 1.0
+
+# Seconds between keepalive comments on an idle connection
+HEARTBEAT_INTERVAL = 15.0
+
+# Notifications buffered per subscriber before it is told to reset
+QUEUE_SIZE = 100
+
+# Events replayed from Last-Event-ID before asking the client to reset
+REPLAY_LIMIT = 500
+
+# Updates to these fields can move a profile out of a subscriber's filter
+FILTERED_FIELDS = {"animal_types", "service_types", "full_name", "location"}
+
+RESET = {"event": "reset", "data": {}}
+
+
+def format_event(message):
+    """Serialize a notification as an SSE frame."""
+    lines = []
+    if message.get("id") is not None:
+        lines.append(f"id: {message['id']}")
+    lines.append(f"event: {message['event']}")
+    lines.append(f"data: {json.dumps(message['data'], separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """One connected client: its filter and its notification queue."""
+
+    def __init__(self, search="", animal_types=(), service_types=(), match="any"):
+        self.search = normalize(search)
+        self.animal_types = set(animal_types)
+        self.service_types = set(service_types)
+        self.match = match
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def _types_match(self, wanted, offered):
+        if not wanted:
+            return True
+        if self.match == "all":
+            return wanted <= offered
+        return bool(wanted & offered)
+
+    def matches(self, profile):
+        """Return True when the profile snapshot passes this filter."""
+        if not profile["is_active"]:
+            return False
+        if self.search and not (
+            self.search in profile["search_name"]
+            or self.search in profile["search_location"]
+        ):
+            return False
+        return self._types_match(
+            self.animal_types, profile["animal_types"]
+        ) and self._types_match(self.service_types, profile["service_types"])
+
+    def notification(self, event, profile):
+        """Build the message for event, or None if it is irrelevant here."""
+        fields = event.payload.get("fields", [])
+        if profile is not None and self.matches(profile):
+            topic = event.topic
+        elif profile is None or not profile["is_active"]:
+            # Deactivated or gone: clients drop it if it is on screen
+            topic = "petsitter.removed"
+        elif FILTERED_FIELDS.intersection(fields):
+            # May have left the filter: same as a removal for this client
+            topic = "petsitter.removed"
+        else:
+            return None
+
+        data = {"id": event.aggregate_id}
+        if fields and topic == event.topic:
+            data["fields"] = fields
+        return {"id": event.pk, "event": topic, "data": data}
+
+    def push(self, message):
+        """Queue message; when the client lags behind, replace the backlog."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET)
+
+
+def load_events(after_id, limit):
+    """Petsitter events after after_id with the changed profiles' snapshots."""
+    events = list(
+        OutboxEvent.objects.filter(pk__gt=after_id, topic__startswith=TOPIC_PREFIX)
+        .only("pk", "topic", "aggregate_id", "payload")
+        .order_by("pk")[:limit]
+    )
+    ids = {event.aggregate_id for event in events}
+
+    profiles = {
+        row["pk"]: {**row, "animal_types": set(), "service_types": set()}
+        for row in PetSitter.objects.filter(pk__in=ids).values(
+            "pk", "is_active", "search_name", "search_location"
+        )
+    }
+    type_links = [
+        (AnimalType, "animal_types", "animal_type"),
+        (ServiceType, "service_types", "service_type"),
+    ]
+    for model, key, code_field in type_links:
+        for sitter_id, code in model.objects.filter(
+            petsitters__in=list(profiles)
+        ).values_list("petsitters", code_field):
+            profiles[sitter_id][key].add(code)
+
+    return events, profiles
+
+
+def latest_event_id():
+    last = OutboxEvent.objects.order_by("-pk").values_list("pk", flat=True).first()
+    return last or 0
+
+
+class ChangeHub:
+    """Per-process fan-out of outbox events to stream subscribers."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.last_id = None
+        self._task = None
+
+    async def subscribe(self, subscription, last_event_id=None):
+        """Register subscription, replaying events after last_event_id."""
+        if self.last_id is None:
+            self.last_id = await sync_to_async(latest_event_id)()
+        self.subscribers.add(subscription)
+
+        if last_event_id is not None and last_event_id < self.last_id:
+            await self.replay(subscription, last_event_id, self.last_id)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    async def replay(self, subscription, after_id, until_id):
+        events, profiles = await sync_to_async(load_events)(after_id, REPLAY_LIMIT)
+        events = [event for event in events if event.pk <= until_id]
+        if len(events) == REPLAY_LIMIT:
+            subscription.push(RESET)
+            return
+        for event in events:
+            message = subscription.notification(event, profiles.get(event.aggregate_id))
+            if message:
+                subscription.push(message)
+
+    async def poll(self):
+        """Fetch new events once and dispatch them. Returns how many."""
+        events, profiles = await sync_to_async(load_events)(self.last_id, 1000)
+        for event in events:
+            profile = profiles.get(event.aggregate_id)
+            for subscription in list(self.subscribers):
+                message = subscription.notification(event, profile)
+                if message:
+                    subscription.push(message)
+        if events:
+            self.last_id = events[-1].pk
+        return len(events)
+
+    async def run(self):
+        """Poll while anyone is subscribed; stop when the last one leaves."""
+        while self.subscribers:
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Petsitter change hub poll failed")
+            await asyncio.sleep(POLL_INTERVAL)
+        # Restart from the newest event when the next client subscribes
+        self.last_id = None
+
+
+hub = ChangeHub()
+
+
+async def authenticate(request):
+    """Resolve the user from the session or an "Authorization: Token" header."""
+    user = await request.auser()
+    if user.is_authenticated:
+        return user
+
+    keyword, _, key = request.headers.get("Authorization", "").partition(" ")
+    if keyword != "Token" or not key:
+        return None
+    token = await Token.objects.select_related("user").filter(key=key).afirst()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+async def stream_events(subscription, last_event_id):
+    await hub.subscribe(subscription, last_event_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(message)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+async def petsitter_stream(request):
+    """
+    Stream petsitter changes as Server-Sent Events.
+
+    Accepts the list filters search, animal_type, service_type and match.
+    Events: petsitter.created / petsitter.updated (data: id and changed
+    fields), petsitter.removed (deactivated or no longer matching) and reset.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "This endpoint requires an ASGI server."}, status=501
+        )
+
+    if await authenticate(request) is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    match = request.GET.get("match", "").strip().lower() or "any"
+    if match not in ("any", "all"):
+        return JsonResponse({"match": ['Use "any" or "all".']}, status=400)
+
+    def csv_param(name):
+        return [v.strip() for v in request.GET.get(name, "").split(",") if v.strip()]
+
+    subscription = Subscription(
+        search=request.GET.get("search", ""),
+        animal_types=csv_param("animal_type"),
+        service_types=csv_param("service_type"),
+        match=match,
+    )
+
+    last_event_id = request.headers.get("Last-Event-ID", "").strip()
+    last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+
+    response = StreamingHttpResponse(
+        stream_events(subscription, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,25 @@
+"""Background jobs of the users app (see jobs.queue)."""
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from jobs.queue import job
+
+from .models import User
+
+
+@job("users.send_welcome_email")
+def send_welcome_email(user_id):
+    """Send the welcome email to a newly registered user."""
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        return
+
+    send_mail(
+        subject="Bem-vindo(a) ao PetKeep!",
+        message=(
+            f"Olá, {user.full_name}!\n\n" "Sua conta no PetKeep foi criada com sucesso."
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
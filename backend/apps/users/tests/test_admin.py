@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import User
+
+from .test_listings import add_types, make_customer, make_petsitter
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="StrongPass123!"
+        )
+        self.client.force_login(admin_user)
+
+    def _query_count(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_customer_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse("admin:users_customer_changelist")
+        make_customer("c0@example.com")
+        few = self._query_count(url)
+
+        for i in range(1, 6):
+            make_customer(f"c{i}@example.com")
+        self.assertEqual(self._query_count(url), few)
+
+    def test_petsitter_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse("admin:users_petsitter_changelist")
+        add_types(make_petsitter("p0@example.com"), ["dog"], ["keepwalk"])
+        few = self._query_count(url)
+
+        for i in range(1, 6):
+            add_types(make_petsitter(f"p{i}@example.com"), ["dog"], ["keepwalk"])
+        self.assertEqual(self._query_count(url), few)
+
+    def test_petsitter_type_filters(self):
+        dog = add_types(make_petsitter("dog@example.com"), ["dog"])
+        add_types(make_petsitter("cat@example.com"), ["cat"])
+
+        url = reverse("admin:users_petsitter_changelist")
+        response = self.client.get(url, {"animal_type": "dog"})
+        self.assertEqual(list(response.context["cl"].result_list), [dog])
+
+
+class AdminSearchTests(TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="StrongPass123!"
+        )
+        self.client.force_login(admin_user)
+        self.ana = make_petsitter(
+            "Ana.Souza@example.com", full_name="Ana Souza", location="Campinas, SP"
+        )
+        self.bruno = make_customer("bruno@example.com", full_name="Bruno Lima")
+        self.bruno.user.phone = "+55 (21) 97777-1234"
+        self.bruno.user.save()
+
+    def _search(self, model, term):
+        url = reverse(f"admin:users_{model}_changelist")
+        response = self.client.get(url, {"q": term})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context["cl"].result_list)
+
+    def test_phone_digits_are_normalized_on_save(self):
+        self.assertEqual(self.bruno.user.phone_digits, "5521977771234")
+
+    def test_email_is_matched_exactly_ignoring_case(self):
+        self.assertEqual(self._search("user", "ana.souza@EXAMPLE.com"), [self.ana.user])
+        self.assertEqual(self._search("user", "souza@example.com"), [])
+
+    def test_phone_is_matched_by_digit_prefix(self):
+        self.assertEqual(self._search("customer", "55 21 9777"), [self.bruno])
+        self.assertEqual(self._search("customer", "(21) 9777"), [])
+
+    def test_name_and_location_text_search(self):
+        self.assertEqual(self._search("user", "bruno"), [self.bruno.user])
+        self.assertEqual(self._search("petsitter", "souza"), [self.ana])
+        self.assertEqual(self._search("petsitter", "campinas"), [self.ana])
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import PetSitter
+
+from .test_listings import make_customer, make_petsitter
+
+
+class PetSitterChangesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.url = reverse("users:petsitter-changes")
+
+        # Changes only become visible once they are older than the settle time
+        base = timezone.now() - timedelta(minutes=10)
+        self.sitters = []
+        for i in range(3):
+            sitter = make_petsitter(f"sitter{i}@example.com")
+            PetSitter.objects.filter(pk=sitter.pk).update(
+                updated_at=base + timedelta(seconds=i)
+            )
+            self.sitters.append(sitter)
+
+    def test_pages_through_changes_in_order(self):
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [p["id"] for p in response.data["upserts"]],
+            [self.sitters[0].pk, self.sitters[1].pk],
+        )
+        self.assertTrue(response.data["has_more"])
+
+        cursor = response.data["next_cursor"]
+        response = self.client.get(self.url, {"since": cursor, "limit": 2})
+        self.assertEqual(
+            [p["id"] for p in response.data["upserts"]], [self.sitters[2].pk]
+        )
+        self.assertFalse(response.data["has_more"])
+
+        # Nothing new: the cursor is handed back unchanged
+        cursor = response.data["next_cursor"]
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.data["upserts"], [])
+        self.assertEqual(response.data["next_cursor"], cursor)
+
+    def test_deactivated_sitters_are_tombstones(self):
+        cursor = self.client.get(self.url).data["next_cursor"]
+
+        sitter = self.sitters[0]
+        sitter.user.is_active = False
+        sitter.user.save()
+        PetSitter.objects.filter(pk=sitter.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.data["upserts"], [])
+        self.assertEqual(response.data["tombstones"], [sitter.pk])
+
+    def test_recent_changes_wait_for_the_settle_time(self):
+        cursor = self.client.get(self.url).data["next_cursor"]
+        make_petsitter("fresh@example.com")
+
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.data["upserts"], [])
+
+    def test_since_accepts_a_timestamp(self):
+        since = PetSitter.objects.get(pk=self.sitters[0].pk).updated_at
+        response = self.client.get(self.url, {"since": since.isoformat()})
+        self.assertEqual(
+            [p["id"] for p in response.data["upserts"]],
+            [self.sitters[1].pk, self.sitters[2].pk],
+        )
+
+    def test_empty_pages_return_a_cursor(self):
+        since = PetSitter.objects.get(pk=self.sitters[2].pk).updated_at
+        response = self.client.get(self.url, {"since": since.isoformat()})
+        self.assertEqual(response.data["upserts"], [])
+        cursor = response.data["next_cursor"]
+        self.assertNotEqual(cursor, since.isoformat())
+
+        # The cursor resumes after the timestamp, like the timestamp did
+        PetSitter.objects.filter(pk=self.sitters[0].pk).update(
+            updated_at=since + timedelta(seconds=1)
+        )
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(
+            [p["id"] for p in response.data["upserts"]], [self.sitters[0].pk]
+        )
+
+    def test_full_sync_of_an_empty_listing_returns_a_cursor(self):
+        PetSitter.objects.all().delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["upserts"], [])
+        self.assertIsNotNone(response.data["next_cursor"])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"since": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_impossible_timestamp_is_rejected(self):
+        response = self.client.get(self.url, {"since": "2024-02-30T00:00:00"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"since": "Invalid cursor or timestamp."})
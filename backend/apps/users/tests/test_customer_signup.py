@@ -1,4 +1,8 @@
+from unittest import mock
+
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -39,8 +43,31 @@ class CustomerSignupViewTests(TestCase):
         self.client.post(self.url, self.valid_payload, format="json")
         response = self.client.post(self.url, self.valid_payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["email"], ["This email is already registered."]
+        )
+        self.assertEqual(User.objects.filter(email="joao@example.com").count(), 1)
+
+    def test_signup_rejects_email_taken_with_different_case(self):
+        User.objects.create_user(email="Joao@Example.com", password="x")
+        response = self.client.post(self.url, self.valid_payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("email", response.json())
 
+    def test_signup_inserts_without_checking_email_first(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, self.valid_payload, format="json")
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertFalse([sql for sql in selects if '"users"."email"' in sql])
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        error = IntegrityError("NOT NULL constraint failed: users.phone")
+        with (
+            mock.patch.object(User.objects, "create_user", side_effect=error),
+            self.assertRaises(IntegrityError),
+        ):
+            self.client.post(self.url, self.valid_payload, format="json")
+
     def test_signup_rejects_password_mismatch(self):
         payload = {**self.valid_payload, "confirm_password": "WrongPass123!"}
         response = self.client.post(self.url, payload, format="json")
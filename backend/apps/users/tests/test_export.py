@@ -0,0 +1,102 @@
+import csv
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import User
+
+from .test_listings import add_types, make_customer, make_petsitter
+
+
+class ProfileExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(
+            email="staff@example.com", password="StrongPass123!", is_staff=True
+        )
+        self.client.force_authenticate(self.staff)
+
+        self.sitters = [
+            add_types(make_petsitter("a@example.com"), animals=["dog", "cat"]),
+            add_types(make_petsitter("b@example.com"), services=["keepwalk"]),
+            make_petsitter("c@example.com"),
+        ]
+        self.sitters[2].user.is_active = False
+        self.sitters[2].user.save()
+
+    def _body(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_every_petsitter(self):
+        response = self.client.get(reverse("users:petsitter-export"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [s.pk for s in self.sitters])
+        self.assertEqual(rows[0]["animal_types"], ["cat", "dog"])
+        self.assertEqual(rows[1]["service_types"], ["keepwalk"])
+        self.assertFalse(rows[2]["is_active"])
+
+    def test_csv_export_of_active_customers(self):
+        customer = make_customer("customer@example.com")
+        response = self.client.get(
+            reverse("users:customer-export"), {"output": "csv", "active_only": "true"}
+        )
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        rows = list(csv.DictReader(StringIO(self._body(response))))
+        self.assertEqual([row["email"] for row in rows], [customer.user.email])
+
+    def test_active_only_accepts_the_usual_true_values(self):
+        for value in ("1", "yes", "True"):
+            response = self.client.get(
+                reverse("users:petsitter-export"), {"active_only": value}
+            )
+            rows = [json.loads(line) for line in self._body(response).splitlines()]
+            self.assertEqual(len(rows), 2, value)
+
+    def test_csv_cells_cannot_start_formulas(self):
+        sitter = self.sitters[0]
+        sitter.user.full_name = '=HYPERLINK("http://evil.example","x")'
+        sitter.user.save()
+        sitter.about = "@SUM(1+1)"
+        sitter.location = "-2+3"
+        sitter.save()
+
+        response = self.client.get(reverse("users:petsitter-export"), {"output": "csv"})
+        row = next(csv.DictReader(StringIO(self._body(response))))
+        self.assertEqual(row["full_name"], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(row["about"], "'@SUM(1+1)")
+        self.assertEqual(row["location"], "'-2+3")
+        self.assertEqual(row["email"], "a@example.com")
+
+    def test_m2m_codes_are_prefetched_per_chunk(self):
+        # 3 sitters in chunks of 2: the main query plus 2 prefetches per chunk
+        with mock.patch("users.export.EXPORT_CHUNK_SIZE", 2):
+            response = self.client.get(reverse("users:petsitter-export"))
+            with self.assertNumQueries(5):
+                self._body(response)
+
+    def test_export_is_staff_only(self):
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        response = self.client.get(reverse("users:customer-export"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get(reverse("users:customer-export"), {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_profiles_command(self):
+        out = StringIO()
+        call_command("export_profiles", "petsitters", "--format", "csv", stdout=out)
+
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["animal_types"], "cat|dog")
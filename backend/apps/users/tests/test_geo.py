@@ -0,0 +1,119 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from users import geo
+from users.models import PetSitter
+
+from .test_listings import make_customer, make_petsitter
+
+SAO_PAULO = (-23.5505, -46.6333)
+
+
+class GazetteerTests(SimpleTestCase):
+    def test_geocodes_city_name_ignoring_accents_and_case(self):
+        self.assertEqual(geo.geocode("Rua X, 10 - sao paulo/SP"), SAO_PAULO)
+
+    def test_prefers_longest_city_name(self):
+        self.assertEqual(geo.geocode("Rio Branco - AC"), (-9.9747, -67.8243))
+
+    def test_street_named_after_another_city(self):
+        self.assertEqual(
+            geo.geocode("Av. Rio Branco, 100 - Recife, PE"), (-8.0476, -34.877)
+        )
+        self.assertEqual(
+            geo.geocode("Rua São Paulo 20, Belo Horizonte - MG"), (-19.9167, -43.9345)
+        )
+        self.assertEqual(geo.geocode("Rua Santos, 15 - Campinas"), (-22.9099, -47.0626))
+
+    def test_longest_name_wins_at_the_same_position(self):
+        self.assertEqual(
+            geo.geocode("Rua 7, Aparecida de Goiânia - GO"), (-16.8198, -49.2469)
+        )
+
+    def test_trailing_state_rejects_cities_of_other_states(self):
+        self.assertEqual(
+            geo.geocode("Rua Recife, 10 - Santos/SP 11010"), (-23.9608, -46.3336)
+        )
+        self.assertIsNone(geo.geocode("Rua Recife, 10 - SP"))
+
+    def test_geocodes_cep_prefix(self):
+        self.assertEqual(geo.geocode("CEP 04538-133"), SAO_PAULO)
+
+    def test_unknown_location_returns_none(self):
+        self.assertIsNone(geo.geocode("Cidade Inexistente"))
+        self.assertIsNone(geo.geocode(""))
+
+
+class GeohashTests(SimpleTestCase):
+    def test_encode_known_value(self):
+        self.assertEqual(geo.geohash_encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+
+    def test_covering_cells_contain_points_inside_radius(self):
+        lat, lng = SAO_PAULO
+        cells = geo.covering_cells(lat, lng, 25)
+        self.assertLessEqual(len(cells), geo.MAX_COVERING_CELLS)
+
+        for point in [(lat + 0.2, lng), (lat, lng - 0.2), (lat - 0.15, lng + 0.15)]:
+            self.assertLess(geo.distance_km(lat, lng, *point), 25)
+            code = geo.geohash_encode(*point)
+            self.assertTrue(any(code.startswith(cell) for cell in cells))
+
+
+class ProximitySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.sp = make_petsitter("sp@example.com", location="São Paulo, SP")
+        self.guarulhos = make_petsitter("gru@example.com", location="Guarulhos - SP")
+        self.rio = make_petsitter("rio@example.com", location="Rio de Janeiro")
+        self.unknown = make_petsitter("x@example.com", location="Algum lugar")
+        self.url = reverse("users:petsitter-list")
+
+    def test_signup_location_is_geocoded(self):
+        self.assertEqual((self.sp.latitude, self.sp.longitude), SAO_PAULO)
+        self.assertTrue(self.sp.geohash)
+        self.assertIsNone(self.unknown.latitude)
+
+    def test_near_filters_by_radius_and_orders_by_distance(self):
+        response = self.client.get(self.url, {"near": "-23.55,-46.63", "radius_km": 30})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+
+        self.assertEqual([r["id"] for r in results], [self.sp.pk, self.guarulhos.pk])
+        self.assertLess(results[0]["distance_km"], results[1]["distance_km"])
+
+    def test_radius_is_respected_between_cities(self):
+        response = self.client.get(
+            self.url, {"near": "-23.55,-46.63", "radius_km": 200}
+        )
+        ids = [r["id"] for r in response.json()["results"]]
+        self.assertEqual(ids, [self.sp.pk, self.guarulhos.pk])
+
+        response = self.client.get(self.url, {"near": "-22.9,-43.2", "radius_km": 20})
+        self.assertEqual([r["id"] for r in response.json()["results"]], [self.rio.pk])
+
+    def test_location_update_refreshes_coordinates(self):
+        self.sp.location = "Niterói - RJ"
+        self.sp.save()
+        self.assertEqual((self.sp.latitude, self.sp.longitude), (-22.8832, -43.1034))
+
+    def test_invalid_near_returns_400(self):
+        for params in [
+            {"near": "abc"},
+            {"near": "100,0"},
+            {"near": "-23.5,-46.6", "radius_km": "0"},
+        ]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_near_seeks_the_geohash_index(self):
+        plan = PetSitter.objects.near(*SAO_PAULO, 10).explain()
+
+        self.assertIn("USING INDEX petsitters_geohash", plan)
+        self.assertNotIn("SCAN petsitters", plan)
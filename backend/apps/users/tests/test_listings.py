@@ -0,0 +1,209 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import AnimalType, Customer, PetSitter, ServiceType, User
+
+
+def make_customer(email, **extra_fields):
+    user = User.objects.create_user(
+        email=email,
+        password="StrongPass123!",
+        full_name=extra_fields.pop("full_name", "Cliente Teste"),
+        phone="(11) 99999-9999",
+        user_type="customer",
+        **extra_fields,
+    )
+    return Customer.objects.create(user=user)
+
+
+def make_petsitter(email, location="São Paulo, SP", about="Amo animais", **extra):
+    user = User.objects.create_user(
+        email=email,
+        password="StrongPass123!",
+        full_name=extra.pop("full_name", "Sitter Teste"),
+        phone="(11) 98888-8888",
+        user_type="petsitter",
+        **extra,
+    )
+    return PetSitter.objects.create(user=user, location=location, about=about)
+
+
+def add_types(petsitter, animals=(), services=()):
+    for code in animals:
+        petsitter.animal_types.add(
+            AnimalType.objects.get_or_create(animal_type=code)[0]
+        )
+    for code in services:
+        petsitter.service_types.add(
+            ServiceType.objects.get_or_create(service_type=code)[0]
+        )
+    return petsitter
+
+
+class ProfileIsActiveSyncTests(TestCase):
+    def test_profile_follows_user_deactivation(self):
+        customer = make_customer("ana@example.com")
+        customer.user.is_active = False
+        customer.user.save()
+
+        customer.refresh_from_db()
+        self.assertFalse(customer.is_active)
+        self.assertFalse(Customer.active_objects.filter(pk=customer.pk).exists())
+
+    def test_profile_created_for_inactive_user_is_inactive(self):
+        petsitter = make_petsitter("bia@example.com", is_active=False)
+        self.assertFalse(petsitter.is_active)
+
+    def test_update_fields_without_is_active_skips_sync(self):
+        customer = make_customer("caio@example.com")
+        customer.user.is_active = False
+        customer.user.save(update_fields=["phone"])
+
+        customer.refresh_from_db()
+        self.assertTrue(customer.is_active)
+
+
+class ActiveListingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = make_customer("viewer@example.com")
+        self.inactive_customer = make_customer("gone@example.com", is_active=False)
+        self.active_sitter = make_petsitter("sitter@example.com")
+        self.inactive_sitter = make_petsitter("oldsitter@example.com", is_active=False)
+        self.client.force_authenticate(self.viewer.user)
+
+    def _ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item["id"] for item in response.json()["results"]}
+
+    def test_petsitter_list_hides_deactivated_accounts(self):
+        ids = self._ids(reverse("users:petsitter-list"))
+        self.assertEqual(ids, {self.active_sitter.pk})
+
+    def test_customer_list_hides_deactivated_accounts(self):
+        ids = self._ids(reverse("users:customer-list"))
+        self.assertEqual(ids, {self.viewer.pk})
+
+    def test_include_inactive_is_ignored_for_non_staff(self):
+        ids = self._ids(reverse("users:petsitter-list"), include_inactive="true")
+        self.assertNotIn(self.inactive_sitter.pk, ids)
+
+    def test_staff_can_include_inactive(self):
+        staff = User.objects.create_user(
+            email="staff@example.com", password="x", is_staff=True
+        )
+        self.client.force_authenticate(staff)
+
+        ids = self._ids(reverse("users:customer-list"), include_inactive="true")
+        self.assertIn(self.inactive_customer.pk, ids)
+
+        ids = self._ids(reverse("users:petsitter-list"), include_inactive="true")
+        self.assertIn(self.inactive_sitter.pk, ids)
+
+    def test_soft_delete_removes_petsitter_from_list(self):
+        self.client.force_authenticate(self.active_sitter.user)
+        url = reverse("users:petsitter-delete", args=[self.active_sitter.pk])
+        self.client.delete(url)
+
+        self.assertEqual(self._ids(reverse("users:petsitter-list")), set())
+
+
+class BestMatchOrderingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.url = reverse("users:petsitter-list")
+
+        self.dog_only = add_types(make_petsitter("a@example.com"), ["dog"])
+        self.dog_and_cat = add_types(make_petsitter("b@example.com"), ["dog", "cat"])
+        self.incomplete = add_types(
+            make_petsitter("c@example.com", location="", about=""), ["dog", "cat"]
+        )
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, {"ordering": "best_match", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_profile_score_is_precomputed_on_save(self):
+        self.assertEqual(self.dog_only.profile_score, 2)
+        self.assertEqual(self.incomplete.profile_score, 0)
+
+        self.incomplete.about = "Cuido de gatos"
+        self.incomplete.save(update_fields=["about"])
+        self.incomplete.refresh_from_db()
+        self.assertEqual(self.incomplete.profile_score, 1)
+
+    def test_more_matched_types_rank_first(self):
+        ids = self._ids(animal_type="dog,cat")
+        self.assertEqual(
+            ids, [self.dog_and_cat.pk, self.incomplete.pk, self.dog_only.pk]
+        )
+
+    def test_name_prefix_outranks_location_match(self):
+        by_name = make_petsitter("d@example.com", full_name="Campinas Pet Care")
+        by_location = make_petsitter("e@example.com", location="Campinas, SP")
+        self.assertEqual(self._ids(search="campinas"), [by_name.pk, by_location.pk])
+
+    def test_without_filters_orders_by_profile_score(self):
+        self.assertEqual(self._ids()[-1], self.incomplete.pk)
+
+
+class TypeMatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.url = reverse("users:petsitter-list")
+
+        self.dog = add_types(make_petsitter("a@example.com"), ["dog"], ["keepwalk"])
+        self.dog_cat = add_types(
+            make_petsitter("b@example.com"), ["dog", "cat"], ["keepwalk", "keephost"]
+        )
+        self.bird = add_types(make_petsitter("c@example.com"), ["bird"])
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item["id"] for item in response.json()["results"]}
+
+    def test_any_is_the_default(self):
+        self.assertEqual(
+            self._ids(animal_type="dog,cat"), {self.dog.pk, self.dog_cat.pk}
+        )
+        self.assertEqual(
+            self._ids(animal_type="dog,cat", match="any"),
+            {self.dog.pk, self.dog_cat.pk},
+        )
+
+    def test_all_requires_every_type(self):
+        self.assertEqual(
+            self._ids(animal_type="dog,cat", match="all"), {self.dog_cat.pk}
+        )
+        self.assertEqual(
+            self._ids(animal_type="dog", service_type="keepwalk,keephost", match="all"),
+            {self.dog_cat.pk},
+        )
+        self.assertEqual(self._ids(animal_type="dog,bird", match="all"), set())
+
+    def test_duplicate_values_do_not_break_all(self):
+        self.assertEqual(
+            self._ids(animal_type="cat,cat", match="all"), {self.dog_cat.pk}
+        )
+
+    def test_invalid_match_returns_400(self):
+        response = self.client.get(self.url, {"animal_type": "dog", "match": "some"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_joins_do_not_grow_with_selected_types(self):
+        codes = [code for code, _ in AnimalType.ANIMAL_CHOICES]
+
+        def joins(size):
+            qs = PetSitter.objects.with_types(
+                "animal_types", "animal_type", codes[:size], "all"
+            )
+            return str(qs.query).count(" JOIN ")
+
+        self.assertEqual(joins(1), joins(len(codes)))
@@ -0,0 +1,294 @@
+"""
+Query-count budgets for every route in users.urls.
+
+Each route is requested against a small and a larger seeded dataset. The
+test fails if the number of SQL queries grows with the dataset (an N+1) or
+exceeds the route's budget. Routes whose total hides several steps also
+budget their queries per table, so an extra lookup cannot hide behind a
+saving elsewhere. A new route must be added to ROUTES (or to
+EXEMPT with a reason) before the suite passes again.
+"""
+
+import re
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from users import urls as users_urls
+from users.models import User
+
+from .test_listings import add_types, make_customer, make_petsitter
+
+PASSWORD = "StrongPass123!"
+
+# Rows of each profile type seeded per dataset size
+DATASET_SIZES = (2, 8)
+
+EXEMPT = {
+    # Async SSE view served by the ASGI stream; its per-connection cost is
+    # the outbox polling done once per process, not queries per request
+    "petsitter-stream": "long-lived async stream",
+}
+
+
+# The table a statement reads or writes; None for BEGIN, COMMIT, SAVEPOINT...
+TABLE_RE = re.compile(r'^(?:SELECT .*? FROM|INSERT INTO|UPDATE|DELETE FROM) "(\w+)"')
+
+
+def queries_by_table(queries):
+    tables = (TABLE_RE.match(query["sql"]) for query in queries)
+    return Counter(match.group(1) for match in tables if match)
+
+
+def signup_payload(email, **extra):
+    return {
+        "full_name": "Novo Usuário",
+        "email": email,
+        "phone": "(11) 97777-7777",
+        "password": PASSWORD,
+        "confirm_password": PASSWORD,
+        **extra,
+    }
+
+
+class Route:
+    """How to call one route: method, budget and a request factory."""
+
+    def __init__(self, method, budget, build, tables=None):
+        self.method = method
+        self.budget = budget
+        # build(case, n) -> (url, data, user or None); runs outside the count
+        self.build = build
+        # Optional {table: budget}; queries on any other table fail
+        self.tables = tables
+
+
+def customer_delete(case, n):
+    user = make_customer(f"deleted-customer-{n}@example.com").user
+    return reverse("users:customer-delete", args=[user.pk]), None, user
+
+
+def customer_change_password(case, n):
+    user = make_customer(f"password-customer-{n}@example.com").user
+    data = {
+        "old_password": PASSWORD,
+        "new_password": "NewStrongPass456!",
+        "confirm_new_password": "NewStrongPass456!",
+    }
+    return reverse("users:customer-change-password"), data, user
+
+
+def petsitter_update(case, n):
+    # Own petsitter each time, so every call changes the same number of types
+    sitter = add_types(
+        make_petsitter(f"updated-sitter-{n}@example.com"), animals=["dog"]
+    )
+    data = {"about": f"Sobre {n}", "animal_types": ["dog", "cat"]}
+    url = reverse("users:petsitter-update", args=[sitter.pk])
+    return url, data, sitter.user
+
+
+def petsitter_delete(case, n):
+    sitter = add_types(
+        make_petsitter(f"deleted-sitter-{n}@example.com"),
+        animals=["dog"],
+        services=["keepwalk"],
+    )
+    return reverse("users:petsitter-delete", args=[sitter.pk]), None, sitter.user
+
+
+ROUTES = {
+    "login": Route(
+        "post",
+        14,
+        lambda case, n: (
+            reverse("users:login"),
+            {"email": case.viewer.email, "password": PASSWORD},
+            None,
+        ),
+        tables={
+            # Credential lookup, then the last_login update
+            "users": 2,
+            # Free key check and insert of the new session, then its save
+            "django_session": 3,
+            # Token.objects.get_or_create
+            "authtoken_token": 2,
+            # user_type for a customer
+            "customers": 1,
+        },
+    ),
+    "logout": Route(
+        "post", 4, lambda case, n: (reverse("users:logout"), None, case.viewer)
+    ),
+    "current-user": Route(
+        "get", 1, lambda case, n: (reverse("users:current-user"), None, case.viewer)
+    ),
+    "customer-signup": Route(
+        "post",
+        7,
+        lambda case, n: (
+            reverse("users:customer-signup"),
+            signup_payload(f"new-customer-{n}@example.com"),
+            None,
+        ),
+    ),
+    "customer-list": Route(
+        "get", 2, lambda case, n: (reverse("users:customer-list"), None, case.viewer)
+    ),
+    "customer-export": Route(
+        "get", 1, lambda case, n: (reverse("users:customer-export"), None, case.staff)
+    ),
+    "customer-detail": Route(
+        "get",
+        1,
+        lambda case, n: (
+            reverse("users:customer-detail", args=[case.viewer.pk]),
+            None,
+            case.viewer,
+        ),
+    ),
+    "customer-update": Route(
+        "patch",
+        6,
+        lambda case, n: (
+            reverse("users:customer-update", args=[case.viewer.pk]),
+            {"full_name": f"Cliente {n}"},
+            case.viewer,
+        ),
+    ),
+    "customer-delete": Route("delete", 6, customer_delete),
+    "customer-change-password": Route("post", 2, customer_change_password),
+    "petsitter-signup": Route(
+        "post",
+        14,
+        lambda case, n: (
+            reverse("users:petsitter-signup"),
+            signup_payload(
+                f"new-sitter-{n}@example.com",
+                location="Recife, PE",
+                about="Cuido com carinho",
+                animal_types=["dog", "cat"],
+                service_types=["keepwalk"],
+            ),
+            None,
+        ),
+    ),
+    "petsitter-list": Route(
+        "get", 4, lambda case, n: (reverse("users:petsitter-list"), None, case.viewer)
+    ),
+    "petsitter-export": Route(
+        "get", 3, lambda case, n: (reverse("users:petsitter-export"), None, case.staff)
+    ),
+    "petsitter-changes": Route(
+        "get",
+        4,
+        lambda case, n: (reverse("users:petsitter-changes"), None, case.viewer),
+    ),
+    "petsitter-suggest": Route(
+        "get",
+        2,
+        lambda case, n: (
+            reverse("users:petsitter-suggest"),
+            {"q": "si"},
+            case.viewer,
+        ),
+    ),
+    "petsitter-detail": Route(
+        "get",
+        3,
+        lambda case, n: (
+            reverse("users:petsitter-detail", args=[case.sitter.pk]),
+            None,
+            case.viewer,
+        ),
+    ),
+    "petsitter-update": Route("patch", 12, petsitter_update),
+    "petsitter-delete": Route("delete", 6, petsitter_delete),
+}
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = make_customer("viewer@example.com").user
+        self.staff = User.objects.create_user(
+            email="staff@example.com", password=PASSWORD, is_staff=True
+        )
+        self.sitter = add_types(
+            make_petsitter("sitter@example.com"),
+            animals=["dog"],
+            services=["keepsitter"],
+        )
+        self.seeded = 0
+
+    def seed(self, size):
+        """Grow the dataset to size customers and petsitters."""
+        for i in range(self.seeded, size):
+            make_customer(f"customer{i}@example.com")
+            add_types(
+                make_petsitter(f"sitter{i}@example.com", full_name=f"Sitter {i}"),
+                animals=["dog", "cat"],
+                services=["keepwalk", "keephost"],
+            )
+        self.seeded = size
+
+    def capture_queries(self, route, n):
+        url, data, user = route.build(self, n)
+        # A fresh instance, so no relation cached by an earlier call is reused
+        if user is not None:
+            user = User.objects.get(pk=user.pk)
+        self.client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, route.method)(url, data, format="json")
+            body = (
+                b"".join(response.streaming_content)
+                if response.streaming
+                else response.content
+            )
+
+        self.assertLess(response.status_code, 400, f"{url}: {body!r}")
+        return queries.captured_queries
+
+    def test_every_route_has_a_budget(self):
+        names = {p.name for p in users_urls.urlpatterns}
+        self.assertEqual(names - set(ROUTES) - set(EXEMPT), set())
+        self.assertEqual(set(ROUTES) - names, set())
+
+    # Rows seeded moments ago must already be visible to the changes feed
+    @mock.patch("users.views.CHANGES_SETTLE_TIME", timedelta(0))
+    def test_query_counts_are_flat_and_within_budget(self):
+        counts = {name: [] for name in ROUTES}
+        tables = {}
+        for size in DATASET_SIZES:
+            self.seed(size)
+            for name, route in ROUTES.items():
+                queries = self.capture_queries(route, size)
+                counts[name].append(len(queries))
+                tables[name] = queries_by_table(queries)
+
+        for name, route in ROUTES.items():
+            with self.subTest(route=name):
+                small, large = counts[name]
+                self.assertEqual(
+                    small,
+                    large,
+                    f"{name} queries grow with the dataset: {counts[name]}",
+                )
+                self.assertLessEqual(
+                    large, route.budget, f"{name} exceeds its query budget"
+                )
+                if route.tables is None:
+                    continue
+                for table, count in tables[name].items():
+                    self.assertLessEqual(
+                        count,
+                        route.tables.get(table, 0),
+                        f"{name} exceeds its query budget on {table}",
+                    )
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.test import TestCase
+
+from users.models import Customer, PetSitter, User
+from users.seed import BENCH_PASSWORD
+from users.text import normalize
+
+
+def seed_bench(**options):
+    call_command("seed_bench", stdout=StringIO(), **options)
+
+
+class SeedBenchTests(TestCase):
+    def test_creates_profiles_with_derived_columns(self):
+        seed_bench(sitters=30, customers=5, batch_size=7, seed=1)
+
+        self.assertEqual(Customer.objects.count(), 5)
+        self.assertEqual(PetSitter.objects.count(), 30)
+
+        sitters = PetSitter.objects.select_related("user")
+        for sitter in sitters:
+            self.assertEqual(sitter.search_name, normalize(sitter.user.full_name))
+            self.assertEqual(sitter.search_location, normalize(sitter.location))
+            self.assertEqual(sitter.profile_score, sitter.compute_profile_score())
+            self.assertTrue(sitter.animal_types.exists())
+            self.assertTrue(sitter.service_types.exists())
+        # Most locations are gazetteer cities, so they have coordinates
+        self.assertGreater(sitters.filter(geohash__gt="").count(), 15)
+
+    def test_accounts_log_in_with_the_bench_password(self):
+        seed_bench(customers=2)
+        user = authenticate(email="customer1@bench.local", password=BENCH_PASSWORD)
+        self.assertEqual(user.user_type, "customer")
+
+    def test_same_seed_gives_the_same_data(self):
+        seed_bench(sitters=5, seed=7)
+        first = list(User.objects.order_by("email").values_list("email", "full_name"))
+
+        seed_bench(sitters=5, seed=7, clear=True)
+        second = list(User.objects.order_by("email").values_list("email", "full_name"))
+        self.assertEqual(first, second)
+
+    def test_runs_append_and_clear_removes_only_bench_accounts(self):
+        User.objects.create_user(email="real@example.com", password="x")
+        seed_bench(customers=2)
+        seed_bench(customers=2)
+        self.assertTrue(User.objects.filter(email="customer3@bench.local").exists())
+
+        # Numbering continues after the highest index, not the row count
+        User.objects.filter(email="customer0@bench.local").delete()
+        seed_bench(customers=2)
+        self.assertTrue(User.objects.filter(email="customer5@bench.local").exists())
+
+        seed_bench(clear=True)
+        self.assertEqual(
+            list(User.objects.values_list("email", flat=True)), ["real@example.com"]
+        )
@@ -0,0 +1,130 @@
+import asyncio
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from asgiref.sync import async_to_sync, sync_to_async
+from jobs.outbox import publish
+from rest_framework.authtoken.models import Token
+from users.stream import ChangeHub, Subscription, format_event
+
+from .test_listings import add_types, make_customer, make_petsitter
+
+
+def publish_event(topic, sitter, fields=()):
+    with transaction.atomic():
+        payload = {"fields": list(fields)} if fields else None
+        return publish(topic, sitter.pk, payload)
+
+
+def drain(subscription):
+    messages = []
+    while not subscription.queue.empty():
+        messages.append(subscription.queue.get_nowait())
+    return messages
+
+
+class ChangeHubTests(TestCase):
+    def setUp(self):
+        self.hub = ChangeHub()
+        self.sitter = make_petsitter("dog@example.com", full_name="Ana Souza")
+        add_types(self.sitter, animals=["dog"], services=["keepwalk"])
+
+    def subscribe(self, subscription, last_event_id=None):
+        # Register without starting the background poll task
+        with mock.patch("users.stream.asyncio.create_task", lambda coro: coro.close()):
+            async_to_sync(self.hub.subscribe)(subscription, last_event_id)
+
+    def test_matching_subscriber_gets_compact_notification(self):
+        dogs = Subscription(animal_types=["dog"])
+        cats = Subscription(animal_types=["cat"])
+        self.subscribe(dogs)
+        self.subscribe(cats)
+
+        event = publish_event("petsitter.updated", self.sitter, ["about"])
+        self.assertEqual(async_to_sync(self.hub.poll)(), 1)
+
+        self.assertEqual(
+            drain(dogs),
+            [
+                {
+                    "id": event.pk,
+                    "event": "petsitter.updated",
+                    "data": {"id": self.sitter.pk, "fields": ["about"]},
+                }
+            ],
+        )
+        self.assertEqual(drain(cats), [])
+
+    def test_profile_leaving_the_filter_is_removed(self):
+        cats = Subscription(animal_types=["cat"])
+        self.subscribe(cats)
+
+        publish_event("petsitter.updated", self.sitter, ["animal_types"])
+        async_to_sync(self.hub.poll)()
+
+        self.assertEqual(drain(cats)[0]["event"], "petsitter.removed")
+
+    def test_deactivation_is_sent_to_every_subscriber(self):
+        everyone = Subscription()
+        self.subscribe(everyone)
+
+        self.sitter.user.is_active = False
+        self.sitter.user.save()
+        publish_event("petsitter.deactivated", self.sitter)
+        async_to_sync(self.hub.poll)()
+
+        self.assertEqual(drain(everyone)[0]["event"], "petsitter.removed")
+
+    def test_reconnect_replays_missed_events(self):
+        first = publish_event("petsitter.updated", self.sitter, ["about"])
+        second = publish_event("petsitter.updated", self.sitter, ["location"])
+
+        subscription = Subscription(search="ana")
+        self.subscribe(subscription, last_event_id=first.pk)
+
+        self.assertEqual([m["id"] for m in drain(subscription)], [second.pk])
+
+    def test_lagging_subscriber_is_reset(self):
+        subscription = Subscription()
+        for i in range(subscription.queue.maxsize + 1):
+            subscription.push({"event": "petsitter.updated", "data": {"id": i}})
+
+        self.assertEqual(drain(subscription), [{"event": "reset", "data": {}}])
+
+    def test_format_event(self):
+        frame = format_event({"id": 7, "event": "petsitter.created", "data": {"id": 3}})
+        self.assertEqual(frame, 'id: 7\nevent: petsitter.created\ndata: {"id":3}\n\n')
+
+
+class PetSitterStreamViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse("users:petsitter-stream")
+        self.token = Token.objects.create(user=make_customer("c@example.com").user)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_requires_asgi(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+
+    async def test_streams_new_events(self):
+        hub = ChangeHub()
+        with mock.patch("users.stream.hub", hub):
+            response = await self.async_client.get(
+                self.url, headers={"Authorization": f"Token {self.token.key}"}
+            )
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            chunks = aiter(response.streaming_content)
+            self.assertEqual(await anext(chunks), b"retry: 5000\n\n")
+
+            sitter = await sync_to_async(make_petsitter)("new@example.com")
+            await sync_to_async(publish_event)("petsitter.created", sitter)
+            frame = await asyncio.wait_for(anext(chunks), timeout=5)
+
+            self.assertIn(b"event: petsitter.created", frame)
+            hub._task.cancel()
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .test_listings import make_customer, make_petsitter
+
+
+class PetSitterSuggestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_customer("viewer@example.com").user)
+        self.url = reverse("users:petsitter-suggest")
+
+        self.joana = make_petsitter(
+            "joana@example.com", full_name="Joana Álvares", location="São Paulo, SP"
+        )
+        self.joao = make_petsitter(
+            "joao@example.com", full_name="João Lima", location="São Paulo, SP"
+        )
+        make_petsitter("sara@example.com", full_name="Sara", location="Santos - SP")
+
+    def _get(self, q):
+        response = self.client.get(self.url, {"q": q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_name_prefix_is_case_and_accent_insensitive(self):
+        names = [s for s in self._get("JOA") if s["kind"] == "name"]
+        self.assertEqual(
+            names,
+            [
+                {"id": self.joana.pk, "text": "Joana Álvares", "kind": "name"},
+                {"id": self.joao.pk, "text": "João Lima", "kind": "name"},
+            ],
+        )
+
+    def test_locations_are_deduplicated(self):
+        self.assertEqual(
+            self._get("sao p"),
+            [{"id": None, "text": "São Paulo, SP", "kind": "location"}],
+        )
+
+    def test_short_query_returns_nothing(self):
+        self.assertEqual(self._get("s"), [])
+
+    def test_renamed_and_deactivated_sitters_are_reflected(self):
+        user = self.joao.user
+        user.full_name = "Pedro Lima"
+        user.save()
+        self.assertEqual([s["id"] for s in self._get("pedro")], [self.joao.pk])
+
+        user.is_active = False
+        user.save()
+        self.assertEqual(self._get("pedro"), [])
+
+    def test_renaming_through_the_api_updates_suggestions(self):
+        self.client.force_authenticate(self.joao.user)
+        response = self.client.patch(
+            reverse("users:petsitter-update", args=[self.joao.pk]),
+            {"full_name": "Zélia Lima", "about": "Cuido de gatos"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual([s["id"] for s in self._get("zel")], [self.joao.pk])
+        self.assertEqual([s for s in self._get("joao") if s["kind"] == "name"], [])
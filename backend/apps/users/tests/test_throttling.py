@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from users.models import User
+from users.throttling import local_buckets, parse_rate
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+RATES = {"login_ip": "5/min", "login_email": "3/min", "signup_ip": "2/hour"}
+
+
+@override_settings(CACHES=LOCMEM)
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_buckets.clear()
+        self.client = APIClient()
+        self.login_url = reverse("users:login")
+        User.objects.create_user(email="joao@example.com", password="StrongPass123!")
+
+        patcher = mock.patch.dict(
+            "rest_framework.settings.api_settings.DEFAULT_THROTTLE_RATES", RATES
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self, email="joao@example.com", ip="10.0.0.1"):
+        return self.client.post(
+            self.login_url,
+            {"email": email, "password": "wrong-password"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/min"), (5, 5 / 60))
+        self.assertEqual(parse_rate("10/hour"), (10, 10 / 3600))
+
+    def test_email_bucket_limits_attempts_across_ips(self):
+        codes = [self.login(ip=f"10.0.0.{i}").status_code for i in range(4)]
+        self.assertEqual(codes[:3], [status.HTTP_400_BAD_REQUEST] * 3)
+        self.assertEqual(codes[3], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_ip_bucket_limits_attempts_across_emails(self):
+        codes = [self.login(email=f"user{i}@example.com").status_code for i in range(6)]
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotIn(status.HTTP_429_TOO_MANY_REQUESTS, codes[:5])
+
+    def test_throttled_attempts_skip_authenticate(self):
+        for _ in range(3):
+            self.login()
+
+        with mock.patch("users.serializers.authenticate") as authenticate:
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        authenticate.assert_not_called()
+
+    def test_bucket_refills_over_time(self):
+        for _ in range(3):
+            self.login()
+        self.assertEqual(self.login().status_code, 429)
+
+        # One token per 20 seconds at 3/min
+        with mock.patch("users.throttling.time.time", return_value=10**10):
+            self.assertEqual(self.login().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_signup_is_throttled_per_ip(self):
+        url = reverse("users:customer-signup")
+        codes = [self.client.post(url, {}, format="json").status_code for _ in range(3)]
+        self.assertEqual(codes, [400, 400, 429])
+
+    def test_falls_back_to_local_buckets_when_cache_fails(self):
+        with (
+            mock.patch("users.throttling.cache") as broken,
+            self.assertLogs("users.throttling", "WARNING"),
+        ):
+            broken.get.side_effect = ConnectionError("cache down")
+            codes = [self.login().status_code for _ in range(4)]
+
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_clients_get_separate_buckets_behind_a_proxy(self):
+        def login(client_ip, i):
+            return self.client.post(
+                self.login_url,
+                {"email": f"user{i}@example.com", "password": "wrong-password"},
+                format="json",
+                REMOTE_ADDR="172.18.0.5",  # nginx
+                # nginx appends the address it saw; the first entry is spoofable
+                HTTP_X_FORWARDED_FOR=f"198.51.100.7, {client_ip}",
+            )
+
+        with mock.patch.object(api_settings, "NUM_PROXIES", 1):
+            codes = [login("203.0.113.1", i).status_code for i in range(6)]
+            other = login("203.0.113.2", 99).status_code
+
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(other, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,151 @@
+"""
+Token-bucket throttles for the unauthenticated login and signup endpoints.
+
+DRF checks throttles in APIView.initial(), before the handler runs, so a
+rejected request never reaches authenticate() and its password hash. Each
+scope's rate ("5/min" in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]) is read
+as a bucket of 5 tokens refilled at 5 per minute: short bursts pass, steady
+abuse is held to the rate.
+
+Buckets live in the default cache so every worker shares them. If the cache
+is unreachable, each process falls back to its own in-memory buckets rather
+than letting traffic through unthrottled. Reads and writes of a bucket are
+not atomic; concurrent requests on one key can overshoot by at most the
+number in flight, which is fine for abuse control.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Keys kept by the in-process fallback before the least recent are evicted
+LOCAL_MAX_KEYS = 10_000
+
+
+def parse_rate(rate):
+    """Turn "5/min" into (capacity, tokens refilled per second)."""
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def refill(state, capacity, per_second, now):
+    """Return the (tokens, timestamp) of a bucket brought up to now."""
+    if state is None:
+        return float(capacity), now
+    tokens, updated = state
+    return min(capacity, tokens + (now - updated) * per_second), now
+
+
+class LocalBuckets:
+    """Bounded in-process bucket store used when the cache is down."""
+
+    def __init__(self, max_keys=LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.buckets.get(key)
+
+    def set(self, key, state, timeout):
+        with self.lock:
+            self.buckets[key] = state
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+local_buckets = LocalBuckets()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class: one bucket per (scope, get_cache_key()) pair."""
+
+    scope = None
+
+    def get_cache_key(self, request, view):
+        """Identify the client; None skips throttling for this request."""
+        raise NotImplementedError
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        key = self.get_cache_key(request, view)
+        if rate is None or key is None:
+            return True
+
+        capacity, per_second = parse_rate(rate)
+        key = f"throttle:{self.scope}:{key}"
+        timeout = int(capacity / per_second) + 1
+        now = time.time()
+
+        try:
+            tokens, now = refill(cache.get(key), capacity, per_second, now)
+            store = cache
+        except Exception:
+            logger.warning("Throttle cache unavailable, using local buckets")
+            tokens, now = refill(local_buckets.get(key), capacity, per_second, now)
+            store = local_buckets
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.delay = 0 if allowed else (1 - tokens) / per_second
+
+        try:
+            store.set(key, (tokens, now), timeout)
+        except Exception:
+            local_buckets.set(key, (tokens, now), timeout)
+        return allowed
+
+    def wait(self):
+        return self.delay
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Bucket per client IP (see the NUM_PROXIES setting behind a proxy)."""
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailThrottle(TokenBucketThrottle):
+    """Bucket per submitted email, whatever IP the attempts come from."""
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed: keeps addresses out of the cache and keys cache-safe
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = "login_email"
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = "signup_ip"
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from .stream import petsitter_stream
 from .views import (
     ChangePasswordView,
     CurrentUserView,
@@ -10,11 +11,14 @@ from .views import (
     CustomerUpdateView,
     LoginView,
     LogoutView,
+    PetSitterChangesView,
     PetSitterDeleteView,
     PetSitterDetailView,
     PetSitterListView,
     PetSitterSignupView,
+    PetSitterSuggestView,
     PetSitterUpdateView,
+    ProfileExportView,
 )
 
 app_name = "users"
@@ -27,6 +31,11 @@ urlpatterns = [
     # Customer endpoints
     path("customers/signup/", CustomerSignupView.as_view(), name="customer-signup"),
     path("customers/", CustomerListView.as_view(), name="customer-list"),
+    path(
+        "customers/export/",
+        ProfileExportView.as_view(kind="customers"),
+        name="customer-export",
+    ),
     path(
         "customers/<int:user_id>/", CustomerDetailView.as_view(), name="customer-detail"
     ),
@@ -48,6 +57,22 @@ urlpatterns = [
     # PetSitter endpoints
     path("petsitters/signup/", PetSitterSignupView.as_view(), name="petsitter-signup"),
     path("petsitters/", PetSitterListView.as_view(), name="petsitter-list"),
+    path(
+        "petsitters/export/",
+        ProfileExportView.as_view(kind="petsitters"),
+        name="petsitter-export",
+    ),
+    path(
+        "petsitters/changes/",
+        PetSitterChangesView.as_view(),
+        name="petsitter-changes",
+    ),
+    path("petsitters/stream/", petsitter_stream, name="petsitter-stream"),
+    path(
+        "petsitters/suggest/",
+        PetSitterSuggestView.as_view(),
+        name="petsitter-suggest",
+    ),
     path(
         "petsitters/<int:user_id>/",
         PetSitterDetailView.as_view(),
@@ -1,13 +1,26 @@
+import base64
+import binascii
+from datetime import timedelta
+
 from django.contrib.auth import login, logout
+from django.db import transaction
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from jobs.outbox import publish
 from rest_framework import generics, status
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from .export import EXPORT_FORMATS
+from .export import render as render_export
 from .models import Customer, PetSitter
 from .serializers import (
     ChangePasswordSerializer,
@@ -15,11 +28,122 @@ from .serializers import (
     CustomerSignupSerializer,
     CustomerUpdateSerializer,
     LoginSerializer,
+    PetSitterChangesSerializer,
     PetSitterSerializer,
     PetSitterSignupSerializer,
+    PetSitterSuggestionSerializer,
     PetSitterUpdateSerializer,
     UserSerializer,
 )
+from .text import normalize
+from .throttling import LoginEmailThrottle, LoginIPThrottle, SignupIPThrottle
+
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 200.0
+
+# Rows newer than this may belong to transactions that have not committed
+# yet; the changes feed stops short of them so its cursor never skips one.
+CHANGES_SETTLE_TIME = timedelta(seconds=5)
+
+INCLUDE_INACTIVE_PARAMETER = OpenApiParameter(
+    name="include_inactive",
+    description="Staff only: also return deactivated accounts (true/false)",
+    required=False,
+    type=bool,
+)
+
+
+def parse_bool_param(request, name):
+    """Return True when the query param is 1, true or yes (any case)."""
+    value = request.query_params.get(name, "").strip().lower()
+    return value in ("1", "true", "yes")
+
+
+def include_inactive(request):
+    """Return True when a staff user asked to see deactivated accounts."""
+    return request.user.is_staff and parse_bool_param(request, "include_inactive")
+
+
+def parse_csv_param(request, name):
+    """Split a comma-separated query param into a list of non-empty values."""
+    value = request.query_params.get(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_match(request):
+    """Return the match=any|all query param (defaults to "any")."""
+    match = request.query_params.get("match", "").strip().lower() or "any"
+    if match not in ("any", "all"):
+        raise ValidationError({"match": 'Use "any" or "all".'})
+    return match
+
+
+def parse_near(request):
+    """Parse near=lat,lng and radius_km query params, or return None."""
+    near = request.query_params.get("near", "").strip()
+    if not near:
+        return None
+
+    try:
+        latitude, longitude = (float(part) for part in near.split(","))
+    except ValueError:
+        raise ValidationError({"near": 'Use the format "latitude,longitude".'})
+
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValidationError({"near": "Coordinates are out of range."})
+
+    radius = request.query_params.get("radius_km", "").strip()
+    try:
+        radius_km = float(radius) if radius else DEFAULT_RADIUS_KM
+    except ValueError:
+        raise ValidationError({"radius_km": "Must be a number."})
+
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValidationError(
+            {"radius_km": f"Must be greater than 0 and at most {MAX_RADIUS_KM:g}."}
+        )
+
+    return latitude, longitude, radius_km
+
+
+def encode_cursor(updated_at, pk=None):
+    """
+    Opaque continuation cursor for the changes feed.
+
+    Without pk it resumes after every change at updated_at, like a timestamp.
+    """
+    raw = f"{updated_at.isoformat()}|{'' if pk is None else pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def parse_since(request):
+    """
+    Parse since= as a cursor or an ISO 8601 timestamp.
+
+    Returns (updated_at, pk) to resume after, or None to start from the
+    beginning.
+    """
+    since = request.query_params.get("since", "").strip()
+    if not since:
+        return None
+
+    try:
+        # Well formed but impossible dates (2024-02-30) raise ValueError
+        timestamp = parse_datetime(since.replace(" ", "+"))
+        if timestamp is not None:
+            if timezone.is_naive(timestamp):
+                timestamp = timezone.make_aware(timestamp)
+            return timestamp, None
+
+        raw = base64.urlsafe_b64decode(since + "=" * (-len(since) % 4)).decode()
+        updated_at, pk = raw.rsplit("|", 1)
+        timestamp = parse_datetime(updated_at)
+        if timestamp is None:
+            raise ValueError
+        return timestamp, int(pk) if pk else None
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({"since": "Invalid cursor or timestamp."})
+
 
 # ============================================================================
 # AUTHENTICATION VIEWS
@@ -37,6 +161,8 @@ class LoginView(generics.GenericAPIView):
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
     authentication_classes = []  # Disable authentication to avoid CSRF
+    # Checked before post(), so throttled attempts never hash a password
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
     @extend_schema(
         summary="User login",
@@ -155,6 +281,7 @@ class CustomerSignupView(generics.CreateAPIView):
     serializer_class = CustomerSignupSerializer
     permission_classes = [AllowAny]
     authentication_classes = []  # Disable authentication to avoid CSRF
+    throttle_classes = [SignupIPThrottle]
 
     @extend_schema(
         summary="Register a new customer",
@@ -183,16 +310,25 @@ class CustomerListView(generics.ListAPIView):
     """
     API endpoint for listing all customers.
 
-    Requires authentication. Returns a paginated list of all customers.
+    Requires authentication. Returns a paginated list of active customers;
+    staff can pass include_inactive=true to also see deactivated accounts.
     """
 
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
-    queryset = Customer.objects.select_related("user").all()
+
+    def get_queryset(self):
+        qs = Customer.objects.select_related("user")
+
+        if not include_inactive(self.request):
+            qs = qs.active()
+
+        return qs
 
     @extend_schema(
         summary="List all customers",
-        description="Retrieve a paginated list of all registered customers.",
+        description="Retrieve a paginated list of all active customers.",
+        parameters=[INCLUDE_INACTIVE_PARAMETER],
         responses={
             200: OpenApiResponse(
                 response=CustomerSerializer(many=True), description="List of customers"
@@ -248,7 +384,7 @@ class CustomerUpdateView(generics.UpdateAPIView):
     def get_object(self):
         """Ensure users can only update their own profile."""
         customer_id = self.kwargs.get("user_id")
-        customer = get_object_or_404(Customer, user_id=customer_id)
+        customer = get_object_or_404(self.get_queryset(), user_id=customer_id)
 
         # Check if user is updating their own profile or is staff
         if customer.user.id != self.request.user.id and not self.request.user.is_staff:
@@ -310,7 +446,7 @@ class CustomerDeleteView(generics.DestroyAPIView):
     def get_object(self):
         """Ensure users can only delete their own profile or is staff."""
         customer_id = self.kwargs.get("user_id")
-        customer = get_object_or_404(Customer, user_id=customer_id)
+        customer = get_object_or_404(self.get_queryset(), user_id=customer_id)
 
         # Check if user is deleting their own profile or is staff
         if customer.user.id != self.request.user.id and not self.request.user.is_staff:
@@ -336,8 +472,10 @@ class CustomerDeleteView(generics.DestroyAPIView):
         customer = self.get_object()
 
         # Soft delete - just deactivate the user
-        customer.user.is_active = False
-        customer.user.save()
+        with transaction.atomic():
+            customer.user.is_active = False
+            customer.user.save()
+            publish("customer.deactivated", customer.pk)
 
         return Response(
             {"message": "Customer account deactivated successfully."},
@@ -396,6 +534,7 @@ class PetSitterSignupView(generics.CreateAPIView):
     serializer_class = PetSitterSignupSerializer
     permission_classes = [AllowAny]
     authentication_classes = []  # Disable authentication to avoid CSRF
+    throttle_classes = [SignupIPThrottle]
 
     @extend_schema(
         summary="Register a new petsitter",
@@ -429,44 +568,59 @@ class PetSitterListView(generics.ListAPIView):
       - search: matches full_name or location (case-insensitive)
       - animal_type: comma-separated values (dog, cat, bird, rabbit, chicken, hamster, other)
       - service_type: comma-separated values (keepsitter, keephost, keepwalk)
+      - match: "any" (default) keeps sitters offering any of the selected
+        animal/service types, "all" only those offering every one of them
+      - near: "latitude,longitude"; keeps sitters within radius_km (default 10)
+        and orders them by distance
+      - ordering: "best_match" ranks by text relevance, matched animal/service
+        types and profile completeness (default: newest first, or by distance)
+      - include_inactive: staff only, also return deactivated accounts
     """
 
     serializer_class = PetSitterSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        qs = (
-            PetSitter.objects.select_related("user")
-            .prefetch_related("animal_types", "service_types")
-            .all()
+        qs = PetSitter.objects.select_related("user").prefetch_related(
+            "animal_types", "service_types"
         )
 
+        if not include_inactive(self.request):
+            qs = qs.active()
+
         search = self.request.query_params.get("search", "").strip()
-        animal_type = self.request.query_params.get("animal_type", "").strip()
-        service_type = self.request.query_params.get("service_type", "").strip()
+        types = parse_csv_param(self.request, "animal_type")
+        services = parse_csv_param(self.request, "service_type")
 
         if search:
             qs = qs.filter(
                 Q(user__full_name__icontains=search) | Q(location__icontains=search)
             )
 
-        if animal_type:
-            types = [t.strip() for t in animal_type.split(",") if t.strip()]
-            if types:
-                qs = qs.filter(animal_types__animal_type__in=types)
+        match = parse_match(self.request)
+
+        if types:
+            qs = qs.with_types("animal_types", "animal_type", types, match)
+
+        if services:
+            qs = qs.with_types("service_types", "service_type", services, match)
 
-        if service_type:
-            services = [s.strip() for s in service_type.split(",") if s.strip()]
-            if services:
-                qs = qs.filter(service_types__service_type__in=services)
+        near = parse_near(self.request)
+        if near:
+            qs = qs.near(*near).order_by("distance_km", "-created_at")
 
-        return qs.distinct()
+        if self.request.query_params.get("ordering", "").strip() == "best_match":
+            qs = qs.best_match(search, types, services)
+
+        return qs
 
     @extend_schema(
         summary="List petsitters",
         description=(
             "Retrieve a list of petsitters. Optionally filter by search "
-            "(name/location), animal_type, or service_type."
+            "(name/location), animal_type, or service_type, or search around "
+            "a point with near and radius_km (ordered by distance). Use "
+            "ordering=best_match to rank the results by relevance."
         ),
         parameters=[
             OpenApiParameter(
@@ -492,6 +646,38 @@ class PetSitterListView(generics.ListAPIView):
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="match",
+                description=(
+                    '"any" (default) or "all" of the selected animal_type and '
+                    "service_type values"
+                ),
+                required=False,
+                type=str,
+                enum=["any", "all"],
+            ),
+            OpenApiParameter(
+                name="near",
+                description='Center point as "latitude,longitude"',
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="radius_km",
+                description=(
+                    f"Search radius around near, in km (default "
+                    f"{DEFAULT_RADIUS_KM:g}, max {MAX_RADIUS_KM:g})"
+                ),
+                required=False,
+                type=float,
+            ),
+            OpenApiParameter(
+                name="ordering",
+                description='Use "best_match" to rank results by relevance',
+                required=False,
+                type=str,
+            ),
+            INCLUDE_INACTIVE_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -506,6 +692,178 @@ class PetSitterListView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+class PetSitterSuggestView(generics.GenericAPIView):
+    """
+    API endpoint for search-bar suggestions (typeahead).
+
+    Returns short name/location suggestions whose normalized text starts with
+    q. Both lookups are prefix scans on the search_name/search_location
+    indexes and skip pagination and full profile serialization.
+    """
+
+    serializer_class = PetSitterSuggestionSerializer
+    permission_classes = [IsAuthenticated]
+    min_query_length = 2
+    max_suggestions = 8
+
+    @extend_schema(
+        summary="Suggest petsitter names and locations",
+        description=(
+            "Lightweight typeahead for the search bar: returns up to "
+            "8 petsitter names and 8 locations starting with q "
+            "(case and accent insensitive)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="Text typed so far (at least 2 characters)",
+                required=True,
+                type=str,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PetSitterSuggestionSerializer(many=True),
+                description="Suggestions",
+            )
+        },
+        tags=["PetSitters"],
+    )
+    def get(self, request, *args, **kwargs):
+        """Handle GET request for petsitter suggestions."""
+        prefix = normalize(request.query_params.get("q", ""))
+        if len(prefix) < self.min_query_length:
+            return Response([])
+
+        petsitters = PetSitter.objects.active()
+        names = (
+            petsitters.with_prefix("search_name", prefix)
+            .order_by("search_name")
+            .values_list("user_id", "user__full_name")[: self.max_suggestions]
+        )
+        locations = (
+            petsitters.with_prefix("search_location", prefix)
+            .order_by("search_location")
+            .values_list("location", flat=True)
+            .distinct()[: self.max_suggestions]
+        )
+
+        suggestions = [
+            {"id": user_id, "text": full_name, "kind": "name"}
+            for user_id, full_name in names
+        ]
+        suggestions += [
+            {"id": None, "text": location, "kind": "location"} for location in locations
+        ]
+        return Response(suggestions)
+
+
+class PetSitterChangesView(generics.GenericAPIView):
+    """
+    API endpoint for delta sync of the petsitter listing.
+
+    Returns the petsitters changed after the since cursor in (updated_at, id)
+    order: active ones as upserts, deactivated ones as tombstones. The walk is
+    a range scan on the (updated_at, user_id) index.
+    """
+
+    serializer_class = PetSitterChangesSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 500
+
+    def get_limit(self):
+        limit = self.request.query_params.get("limit", "").strip()
+        try:
+            limit = int(limit) if limit else self.default_limit
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if not 0 < limit <= self.max_limit:
+            raise ValidationError({"limit": f"Must be between 1 and {self.max_limit}."})
+        return limit
+
+    @extend_schema(
+        summary="Petsitters changed since a cursor",
+        description=(
+            "Delta sync for local caches: returns petsitters created, updated "
+            "or deactivated after since, oldest change first. Keep calling "
+            "with since=next_cursor while has_more is true, then store "
+            "next_cursor for the next sync. Omit since for a full sync."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                description=(
+                    "next_cursor from a previous response, or an ISO 8601 timestamp"
+                ),
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Maximum changes per page (default 100, max 500)",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PetSitterChangesSerializer, description="Changes page"
+            ),
+            400: OpenApiResponse(description="Invalid cursor or limit"),
+        },
+        tags=["PetSitters"],
+    )
+    def get(self, request, *args, **kwargs):
+        """Handle GET request for petsitter changes."""
+        since = parse_since(request)
+        limit = self.get_limit()
+
+        settled = timezone.now() - CHANGES_SETTLE_TIME
+        qs = PetSitter.objects.filter(updated_at__lte=settled)
+        if since is not None:
+            updated_at, pk = since
+            if pk is None:
+                qs = qs.filter(updated_at__gt=updated_at)
+            else:
+                qs = qs.filter(
+                    Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk)
+                )
+
+        changes = list(
+            qs.order_by("updated_at", "pk").only("pk", "is_active", "updated_at")[
+                : limit + 1
+            ]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        upserts = (
+            PetSitter.objects.filter(pk__in=[c.pk for c in changes if c.is_active])
+            .select_related("user")
+            .prefetch_related("animal_types", "service_types")
+            .order_by("updated_at", "pk")
+        )
+
+        # Always a cursor, so clients never have to store a raw since
+        if changes:
+            next_cursor = encode_cursor(changes[-1].updated_at, changes[-1].pk)
+        elif since is not None:
+            next_cursor = encode_cursor(*since)
+        else:
+            # Nothing settled yet: later changes are newer than the cutoff
+            next_cursor = encode_cursor(settled)
+
+        return Response(
+            {
+                "upserts": PetSitterSerializer(upserts, many=True).data,
+                "tombstones": [c.pk for c in changes if not c.is_active],
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+        )
+
+
 class PetSitterDetailView(generics.RetrieveAPIView):
     """
     API endpoint for retrieving a specific petsitter.
@@ -547,17 +905,14 @@ class PetSitterUpdateView(generics.UpdateAPIView):
 
     serializer_class = PetSitterUpdateSerializer
     permission_classes = [IsAuthenticated]
-    queryset = (
-        PetSitter.objects.select_related("user")
-        .prefetch_related("animal_types", "service_types")
-        .all()
-    )
+    # No prefetch: UpdateModelMixin drops it after saving the new types
+    queryset = PetSitter.objects.select_related("user").all()
     lookup_field = "user_id"
 
     def get_object(self):
         """Ensure users can only update their own profile."""
         petsitter_id = self.kwargs.get("user_id")
-        petsitter = get_object_or_404(PetSitter, user_id=petsitter_id)
+        petsitter = get_object_or_404(self.get_queryset(), user_id=petsitter_id)
 
         # Check if user is updating their own profile or is staff
         if petsitter.user.id != self.request.user.id and not self.request.user.is_staff:
@@ -621,7 +976,7 @@ class PetSitterDeleteView(generics.DestroyAPIView):
     def get_object(self):
         """Ensure users can only delete their own profile or is staff."""
         petsitter_id = self.kwargs.get("user_id")
-        petsitter = get_object_or_404(PetSitter, user_id=petsitter_id)
+        petsitter = get_object_or_404(self.get_queryset(), user_id=petsitter_id)
 
         # Check if user is deleting their own profile or is staff
         if petsitter.user.id != self.request.user.id and not self.request.user.is_staff:
@@ -647,10 +1002,78 @@ class PetSitterDeleteView(generics.DestroyAPIView):
         petsitter = self.get_object()
 
         # Soft delete - just deactivate the user
-        petsitter.user.is_active = False
-        petsitter.user.save()
+        with transaction.atomic():
+            petsitter.user.is_active = False
+            petsitter.user.save()
+            publish("petsitter.deactivated", petsitter.pk)
 
         return Response(
             {"message": "PetSitter account deactivated successfully."},
             status=status.HTTP_204_NO_CONTENT,
         )
+
+
+# ============================================================================
+# EXPORT VIEWS
+# ============================================================================
+
+
+class ProfileExportView(generics.GenericAPIView):
+    """
+    Staff-only streaming export of every customer or petsitter.
+
+    Rows are streamed as they are read from a server-side cursor (see
+    users.export), so the response starts immediately and memory stays flat
+    regardless of table size.
+    """
+
+    permission_classes = [IsAdminUser]
+    kind = None
+
+    @extend_schema(
+        summary="Export customers or petsitters",
+        description=(
+            "Stream all accounts (including deactivated ones unless "
+            "active_only=true) as NDJSON (default) or CSV. Staff only."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                description='"ndjson" (default) or "csv"',
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="active_only",
+                description="Skip deactivated accounts (true/false)",
+                required=False,
+                type=bool,
+            ),
+        ],
+        responses={
+            (200, "application/x-ndjson"): OpenApiResponse(
+                response=OpenApiTypes.STR, description="One JSON object per line"
+            ),
+            (200, "text/csv"): OpenApiResponse(
+                response=OpenApiTypes.STR, description="CSV with a header row"
+            ),
+            400: OpenApiResponse(description="Unknown output format"),
+            403: OpenApiResponse(description="Forbidden - staff only"),
+        },
+        tags=["Exports"],
+    )
+    def get(self, request, *args, **kwargs):
+        """Handle GET request - streams the export."""
+        output = request.query_params.get("output", "").strip().lower() or "ndjson"
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": 'Use "ndjson" or "csv".'})
+
+        active_only = parse_bool_param(request, "active_only")
+        filename = f"{self.kind}-{timezone.now():%Y%m%d-%H%M%S}.{output}"
+
+        response = StreamingHttpResponse(
+            render_export(self.kind, output, active_only),
+            content_type=EXPORT_FORMATS[output],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
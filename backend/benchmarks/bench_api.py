@@ -0,0 +1,309 @@
+"""
+Load test a running stack: latency percentiles and throughput per endpoint.
+
+Runs login, petsitter search (several filter mixes), petsitter detail and
+/auth/me/ against --base-url over --concurrency keep-alive connections. Each
+scenario gets --warmup unmeasured requests, then --requests measured ones.
+The results are one JSON document (stdout or --output) stamped with the git
+commit, so runs can be diffed with benchmarks/compare_results.py.
+
+Seed the stack first (accounts share the seed_bench password):
+    make seed-bench    # manage.py seed_bench --sitters 10000 --customers 1000
+
+Login is throttled by default: start the stack with THROTTLE_LOGIN_IP= and
+THROTTLE_LOGIN_EMAIL= (empty) to measure it, or its 429s show up in
+status_codes. Only the standard library is needed, so this also runs from
+the host.
+
+Usage (from backend/, stack up with `make up`):
+    python benchmarks/bench_api.py --base-url http://localhost:8080 \\
+        --requests 500 --concurrency 8 --output bench.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+# users.seed.BENCH_PASSWORD / BENCH_DOMAIN
+BENCH_PASSWORD = "BenchPass123!"
+BENCH_DOMAIN = "bench.local"
+
+# (latitude, longitude) of cities in the geocoding gazetteer
+CENTERS = [(-23.5505, -46.6333), (-22.9068, -43.1729), (-19.9167, -43.9345)]
+
+ANIMALS = ["dog", "cat", "bird", "rabbit", "chicken", "hamster"]
+SERVICES = ["keepsitter", "keephost", "keepwalk"]
+
+
+class Client:
+    """One keep-alive connection; each worker thread has its own."""
+
+    def __init__(self, base_url, token=None, timeout=30):
+        parts = urlsplit(base_url)
+        connection = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self.connection = connection(parts.netloc, timeout=timeout)
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Token {token}"
+
+    def request(self, method, path, body=None):
+        headers = dict(self.headers)
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        try:
+            self.connection.request(method, self.prefix + path, data, headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, HTTPException):
+            # Reconnects on the next request
+            self.connection.close()
+            raise
+
+
+class Context:
+    """Data discovered from the stack and shared by the scenarios."""
+
+    def __init__(self, customers, sitter_ids, terms):
+        self.customers = customers
+        self.sitter_ids = sitter_ids
+        self.terms = terms
+
+
+# ============================================================================
+# SCENARIOS: rng, context -> (method, path, JSON body or None)
+# ============================================================================
+
+
+def login(rng, ctx):
+    email = f"customer{rng.randrange(ctx.customers)}@{BENCH_DOMAIN}"
+    body = {"email": email, "password": BENCH_PASSWORD}
+    return "POST", "/api/v1/auth/login/", body
+
+
+def me(rng, ctx):
+    return "GET", "/api/v1/auth/me/", None
+
+
+def search(**params):
+    return "GET", f"/api/v1/petsitters/?{urlencode(params)}", None
+
+
+def search_plain(rng, ctx):
+    return "GET", "/api/v1/petsitters/", None
+
+
+def search_text(rng, ctx):
+    return search(search=rng.choice(ctx.terms))
+
+
+def search_types_any(rng, ctx):
+    return search(
+        animal_type=",".join(rng.sample(ANIMALS, 2)),
+        service_type=rng.choice(SERVICES),
+    )
+
+
+def search_types_all(rng, ctx):
+    return search(
+        animal_type=",".join(rng.sample(ANIMALS, 2)),
+        service_type=rng.choice(SERVICES),
+        match="all",
+    )
+
+
+def search_near(rng, ctx):
+    lat, lng = rng.choice(CENTERS)
+    return search(near=f"{lat},{lng}", radius_km=rng.choice([5, 10, 25]))
+
+
+def search_best_match(rng, ctx):
+    return search(
+        search=rng.choice(ctx.terms),
+        animal_type=rng.choice(ANIMALS),
+        ordering="best_match",
+    )
+
+
+def detail(rng, ctx):
+    return "GET", f"/api/v1/petsitters/{rng.choice(ctx.sitter_ids)}/", None
+
+
+SCENARIOS = {
+    "login": login,
+    "me": me,
+    "search_plain": search_plain,
+    "search_text": search_text,
+    "search_types_any": search_types_any,
+    "search_types_all": search_types_all,
+    "search_near": search_near,
+    "search_best_match": search_best_match,
+    "detail": detail,
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+
+def discover(base_url, customers, pages=5):
+    """Log in as a bench customer and sample petsitter ids and search terms."""
+    client = Client(base_url)
+    credentials = {"email": f"customer0@{BENCH_DOMAIN}", "password": BENCH_PASSWORD}
+    status, body = client.request("POST", "/api/v1/auth/login/", credentials)
+    if status != 200:
+        raise SystemExit(
+            f"Login as customer0@{BENCH_DOMAIN} failed ({status}); "
+            "run seed_bench on the stack first."
+        )
+    token = json.loads(body)["token"]
+
+    client = Client(base_url, token)
+    sitter_ids, terms = [], set()
+    for page in range(1, pages + 1):
+        status, body = client.request("GET", f"/api/v1/petsitters/?page={page}")
+        if status != 200:
+            break
+        for sitter in json.loads(body)["results"]:
+            sitter_ids.append(sitter["id"])
+            terms.add(sitter["full_name"].split()[0])
+            # "Bairro, City, ST" -> City
+            place = [part.strip() for part in sitter["location"].split(",")]
+            terms.add(place[-2] if len(place) > 1 else place[0])
+    if not sitter_ids:
+        raise SystemExit("No petsitters found; run seed_bench on the stack first.")
+
+    return token, Context(customers, sitter_ids, sorted(terms))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def worker(base_url, token, build, ctx, count, seed):
+    rng = random.Random(seed)
+    client = Client(base_url, token)
+    timings, codes = [], Counter()
+    for _ in range(count):
+        method, path, body = build(rng, ctx)
+        start = time.perf_counter()
+        try:
+            status, _ = client.request(method, path, body)
+        except (OSError, HTTPException):
+            status = "error"
+        timings.append((time.perf_counter() - start) * 1000)
+        codes[str(status)] += 1
+    return timings, codes
+
+
+def run(name, args, token, ctx):
+    build = SCENARIOS[name]
+    worker(args.base_url, token, build, ctx, args.warmup, args.seed)
+
+    shares = [
+        args.requests // args.concurrency + (i < args.requests % args.concurrency)
+        for i in range(args.concurrency)
+    ]
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda i: worker(
+                    args.base_url, token, build, ctx, shares[i], args.seed + i + 1
+                ),
+                range(args.concurrency),
+            )
+        )
+    wall = time.perf_counter() - wall
+
+    timings = [t for result, _ in results for t in result]
+    codes = sum((c for _, c in results), Counter())
+    ok = sum(n for code, n in codes.items() if code.startswith("2"))
+    return {
+        "requests": len(timings),
+        "errors": len(timings) - ok,
+        "status_codes": dict(sorted(codes.items())),
+        "throughput_rps": round(len(timings) / wall, 2),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--customers",
+        type=int,
+        default=1000,
+        help="Bench customers seeded on the stack (login picks among them)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="Comma-separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    token, ctx = discover(args.base_url, args.customers)
+    results = {
+        "benchmark": "api",
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "scenarios": {name: run(name, args, token, ctx) for name in names},
+    }
+
+    document = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
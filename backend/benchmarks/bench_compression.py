@@ -0,0 +1,121 @@
+"""
+Compare response encodings on petsitter list pages: CPU time vs bytes saved.
+
+Seeds an in-memory SQLite database with petsitters whose `about` texts are
+long (--about-sentences), renders /api/v1/petsitters/ pages of 20 to 100
+results through the real view, then compresses each page with every
+installed encoding (gzip, br, zstd; see encoding.compressors) at a few
+levels. Prints one JSON line per page size, encoding and level with the
+median compression time, output size and throughput; "default" marks the
+level CompressionMiddleware uses.
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py --page-sizes 20,40,60,80,100 \\
+        --repeat 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from encoding import compressors  # noqa: E402
+from faker import Faker  # noqa: E402
+from rest_framework.pagination import PageNumberPagination  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from users import seed  # noqa: E402
+from users.models import PetSitter, User  # noqa: E402
+from users.views import PetSitterListView  # noqa: E402
+
+# encoding -> (module constant holding its level, levels measured)
+LEVELS = {
+    "gzip": ("GZIP_LEVEL", [1, 5, 6, 9]),
+    "br": ("BROTLI_QUALITY", [1, 4, 6, 11]),
+    "zstd": ("ZSTD_LEVEL", [1, 3, 6, 19]),
+}
+
+
+def populate(sitters, about_sentences, random_seed):
+    seed.seed(sitters=sitters, random_seed=random_seed)
+    fake = Faker("pt_BR")
+    Faker.seed(random_seed)
+    rows = list(PetSitter.objects.all())
+    for sitter in rows:
+        sitter.about = fake.paragraph(nb_sentences=about_sentences)
+    PetSitter.objects.bulk_update(rows, ["about"])
+
+
+def render_page(client, size):
+    """The JSON body of the first list page with `size` results."""
+    PetSitterListView.pagination_class = type(
+        "BenchPagination", (PageNumberPagination,), {"page_size": size}
+    )
+    response = client.get(reverse("users:petsitter-list"))
+    assert response.status_code == 200 and len(response.json()["results"]) == size
+    return response.content
+
+
+def measure(encoding, level, body, repeat):
+    constant, _ = LEVELS[encoding]
+    default = getattr(compressors, constant)
+    setattr(compressors, constant, level)
+    try:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compressed = compressors.compress(encoding, body)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        setattr(compressors, constant, default)
+
+    median = statistics.median(timings)
+    return {
+        "encoding": encoding,
+        "level": level,
+        "default": level == default,
+        "bytes": len(compressed),
+        "ratio": round(len(body) / len(compressed), 2),
+        "saved_bytes": len(body) - len(compressed),
+        "median_ms": round(median, 3),
+        "mb_per_s": round(len(body) / 1e6 / (median / 1000), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-sizes", default="20,40,60,80,100")
+    parser.add_argument("--about-sentences", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.page_sizes.split(",") if size.strip()]
+    call_command("migrate", verbosity=0)
+    populate(max(sizes), args.about_sentences, args.seed)
+
+    # Outside the test runner "testserver" is not an allowed host
+    client = APIClient(HTTP_HOST="localhost")
+    client.force_authenticate(User.objects.first())
+    for size in sizes:
+        body = render_page(client, size)
+        for encoding in compressors.COMPRESSORS:
+            for level in LEVELS[encoding][1]:
+                result = measure(encoding, level, body, args.repeat)
+                print(json.dumps({"page_size": size, "raw_bytes": len(body), **result}))
+
+
+if __name__ == "__main__":
+    main()
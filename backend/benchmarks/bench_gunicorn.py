@@ -0,0 +1,214 @@
+"""
+Compare gunicorn profiles: the old `--workers 3` sync setup vs gunicorn.conf.py.
+
+Starts gunicorn once per profile on --port, against the database configured
+in the environment (seed it with seed_bench first), and measures with the
+bench_api.py scenarios: each scenario alone, then a "mixed" run where half
+the connections log in (PBKDF2, CPU-bound) while the other half read
+petsitter details (database-bound), which is where sync workers queue cheap
+requests behind expensive ones. Also reports the proportional memory (PSS,
+Linux only) of the master and its workers once warm, where preloading shows.
+
+Login throttling is disabled for the servers started here.
+
+Usage (from backend/):
+    python benchmarks/bench_gunicorn.py --requests 400 --concurrency 16 \\
+        --output bench-gunicorn.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_api  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# name -> gunicorn arguments; "{empty}" is a config file with no settings
+PROFILES = {
+    "sync-3": ["--config", "{empty}", "--workers", "3"],
+    "tuned": ["--config", str(BACKEND_DIR / "gunicorn.conf.py")],
+}
+
+SCENARIOS = ["login", "me", "search_plain", "search_near", "detail"]
+
+
+def wait_for_port(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"gunicorn exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"gunicorn did not listen on port {port}")
+
+
+def children(pid):
+    try:
+        tasks = Path(f"/proc/{pid}/task").iterdir()
+        return [
+            int(child)
+            for task in tasks
+            for child in (task / "children").read_text().split()
+        ]
+    except OSError:
+        return []
+
+
+def pss_mb(pid):
+    """Proportional set size of a process and its children, in MiB."""
+    total = 0
+    for process in [pid, *children(pid)]:
+        try:
+            for line in Path(f"/proc/{process}/smaps_rollup").read_text().splitlines():
+                if line.startswith("Pss:"):
+                    total += int(line.split()[1])
+        except OSError:
+            return None
+    return round(total / 1024, 1)
+
+
+def mixed(args, token, ctx):
+    """Logins and detail reads at the same time, reported separately."""
+    builds = [bench_api.login, bench_api.detail]
+    share = args.requests // args.concurrency
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda i: bench_api.worker(
+                    args.base_url, token, builds[i % 2], ctx, share, args.seed + i
+                ),
+                range(args.concurrency),
+            )
+        )
+    wall = time.perf_counter() - wall
+
+    report = {}
+    for offset, build in enumerate(builds):
+        timings = [t for result, _ in results[offset::2] for t in result]
+        codes = sum((c for _, c in results[offset::2]), Counter())
+        report[build.__name__] = {
+            "requests": len(timings),
+            "status_codes": dict(sorted(codes.items())),
+            "throughput_rps": round(len(timings) / wall, 2),
+            "p50_ms": round(bench_api.percentile(timings, 50), 3),
+            "p95_ms": round(bench_api.percentile(timings, 95), 3),
+            "p99_ms": round(bench_api.percentile(timings, 99), 3),
+        }
+    return report
+
+
+def measure(name, arguments, args, empty_config):
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "config.wsgi:application",
+        *[arg.format(empty=empty_config) for arg in arguments],
+        "--bind",
+        f"127.0.0.1:{args.port}",
+    ]
+    env = dict(os.environ, THROTTLE_LOGIN_IP="", THROTTLE_LOGIN_EMAIL="")
+    with tempfile.TemporaryFile() as log:
+        server = subprocess.Popen(
+            command,
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+        )
+        try:
+            wait_for_port(args.port, server)
+            token, ctx = bench_api.discover(args.base_url, args.customers)
+            result = {
+                "command": " ".join(command[2:]),
+                "scenarios": {
+                    scenario: bench_api.run(scenario, args, token, ctx)
+                    for scenario in SCENARIOS
+                },
+                "mixed": mixed(args, token, ctx),
+                "pss_mb": pss_mb(server.pid),
+            }
+        except SystemExit:
+            log.seek(0)
+            sys.stderr.write(log.read().decode(errors="replace")[-2000:])
+            raise
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    print(f"{name}: done", file=sys.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument(
+        "--profiles",
+        default=",".join(PROFILES),
+        help="Comma-separated subset of: " + ", ".join(PROFILES),
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    unknown = set(names) - set(PROFILES)
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(sorted(unknown))}")
+
+    # The fields bench_api.run() reads, and the port
+    run_args = Namespace(
+        port=args.port,
+        base_url=f"http://127.0.0.1:{args.port}",
+        requests=args.requests,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        customers=args.customers,
+        seed=args.seed,
+    )
+    with tempfile.NamedTemporaryFile(suffix=".py") as empty:
+        profiles = {
+            name: measure(name, PROFILES[name], run_args, empty.name) for name in names
+        }
+
+    document = json.dumps(
+        {
+            "benchmark": "gunicorn",
+            "commit": bench_api.git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "cpus": len(os.sched_getaffinity(0)),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "profiles": profiles,
+        },
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
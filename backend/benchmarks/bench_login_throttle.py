@@ -0,0 +1,108 @@
+"""
+Load test: CPU spent on a credential-stuffing burst against /auth/login/.
+
+Fires --attempts wrong-password logins for one account, spread over --ips
+client addresses, once without throttling and once with the configured
+token buckets. Reports the CPU time, password hashes computed and response
+codes of each run as JSON. With throttling, the hashes (and so the CPU) are
+capped by the bucket sizes instead of growing with the attempts.
+
+Usage (from backend/):
+    python benchmarks/bench_login_throttle.py --attempts 200 --ips 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from rest_framework.test import APIClient  # noqa: E402
+from users.models import User  # noqa: E402
+from users.throttling import local_buckets  # noqa: E402
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def attack(attempts, ips):
+    client = APIClient()
+    hashes = Counter()
+    original = PBKDF2PasswordHasher.verify
+
+    def counting_verify(self, password, encoded):
+        hashes["verify"] += 1
+        return original(self, password, encoded)
+
+    codes = Counter()
+    with mock.patch.object(PBKDF2PasswordHasher, "verify", counting_verify):
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        for i in range(attempts):
+            response = client.post(
+                "/api/v1/auth/login/",
+                {"email": "victim@bench.local", "password": f"guess-{i}"},
+                format="json",
+                REMOTE_ADDR=f"10.0.{i % ips // 256}.{i % ips % 256}",
+            )
+            codes[response.status_code] += 1
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+
+    return {
+        "cpu_s": round(cpu, 3),
+        "wall_s": round(wall, 3),
+        "password_hashes": hashes["verify"],
+        "status_codes": dict(sorted(codes.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--attempts", type=int, default=200)
+    parser.add_argument("--ips", type=int, default=50)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    User.objects.create_user(email="victim@bench.local", password="StrongPass123!")
+
+    with override_settings(CACHES=LOCMEM, ALLOWED_HOSTS=["testserver"]):
+        with mock.patch.dict(
+            "rest_framework.settings.api_settings.DEFAULT_THROTTLE_RATES",
+            {"login_ip": None, "login_email": None},
+        ):
+            unthrottled = attack(args.attempts, args.ips)
+
+        cache.clear()
+        local_buckets.clear()
+        throttled = attack(args.attempts, args.ips)
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "login-throttle",
+                "attempts": args.attempts,
+                "ips": args.ips,
+                "unthrottled": unthrottled,
+                "throttled": throttled,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
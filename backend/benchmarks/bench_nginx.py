@@ -0,0 +1,179 @@
+"""
+Measure nginx's micro-cache and gzip in front of the API.
+
+Runs read scenarios (petsitter search, details, the OpenAPI schema) through
+nginx at --base-url with `Accept-Encoding: gzip`, and reports latency
+percentiles, throughput, bytes on the wire per response and the X-Cache-Status
+counts (HIT, MISS, UPDATING, ...) nginx adds. Given --direct-url (gunicorn
+without nginx, e.g. the dev stack's port 8080), the same scenarios run there
+too for comparison. All connections share one token, as a burst of clients
+behind one integration would, so repeated searches hit the cache.
+
+Seed the stack first (make seed-bench), and start it with THROTTLE_LOGIN_IP=
+empty if more than a few runs log in.
+
+Usage (from backend/, production stack up with `make up-prod`):
+    python benchmarks/bench_nginx.py --base-url http://localhost \\
+        --requests 1000 --concurrency 16 --output bench-nginx.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.client import HTTPException
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_api  # noqa: E402
+
+
+class Client(bench_api.Client):
+    """bench_api.Client that asks for gzip and keeps the response headers."""
+
+    def __init__(self, base_url, token=None, timeout=30):
+        super().__init__(base_url, token, timeout)
+        self.headers["Accept-Encoding"] = "gzip"
+
+    def request(self, method, path, body=None):
+        try:
+            self.connection.request(method, self.prefix + path, body, self.headers)
+            response = self.connection.getresponse()
+            # Not decompressed: the length is what crossed the network
+            return response.status, response.read(), response.headers
+        except (OSError, HTTPException):
+            self.connection.close()
+            raise
+
+
+def schema(rng, ctx):
+    return "GET", "/api/schema/", None
+
+
+SCENARIOS = {
+    "search_plain": bench_api.search_plain,
+    "search_types_any": bench_api.search_types_any,
+    "detail": bench_api.detail,
+    "schema": schema,
+}
+
+
+def worker(base_url, token, build, ctx, count, seed):
+    rng = random.Random(seed)
+    client = Client(base_url, token)
+    timings, sizes, codes, cache, encodings = [], [], Counter(), Counter(), Counter()
+    for _ in range(count):
+        method, path, _ = build(rng, ctx)
+        start = time.perf_counter()
+        try:
+            status, content, headers = client.request(method, path)
+        except (OSError, HTTPException):
+            status, content, headers = "error", b"", {}
+        timings.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(content))
+        codes[str(status)] += 1
+        cache[headers.get("X-Cache-Status", "-")] += 1
+        encodings[headers.get("Content-Encoding", "identity")] += 1
+    return timings, sizes, codes, cache, encodings
+
+
+def run(name, base_url, args, token, ctx):
+    build = SCENARIOS[name]
+    worker(base_url, token, build, ctx, args.warmup, args.seed)
+
+    shares = [
+        args.requests // args.concurrency + (i < args.requests % args.concurrency)
+        for i in range(args.concurrency)
+    ]
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda i: worker(
+                    base_url, token, build, ctx, shares[i], args.seed + i + 1
+                ),
+                range(args.concurrency),
+            )
+        )
+    wall = time.perf_counter() - wall
+
+    timings = [t for result in results for t in result[0]]
+    sizes = [s for result in results for s in result[1]]
+    codes, cache, encodings = (
+        sum((result[index] for result in results), Counter()) for index in (2, 3, 4)
+    )
+    return {
+        "requests": len(timings),
+        "status_codes": dict(sorted(codes.items())),
+        "cache_status": dict(sorted(cache.items())),
+        "content_encoding": dict(sorted(encodings.items())),
+        "throughput_rps": round(len(timings) / wall, 2),
+        "mean_bytes": round(statistics.fmean(sizes)),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(bench_api.percentile(timings, 95), 3),
+        "p99_ms": round(bench_api.percentile(timings, 99), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost")
+    parser.add_argument("--direct-url", help="The API without nginx, to compare")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="Comma-separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    targets = {"nginx": args.base_url}
+    if args.direct_url:
+        targets["direct"] = args.direct_url
+
+    results = {}
+    for target, base_url in targets.items():
+        token, ctx = bench_api.discover(base_url, customers=1)
+        results[target] = {
+            "base_url": base_url,
+            "scenarios": {
+                name: run(name, base_url, args, token, ctx) for name in names
+            },
+        }
+        print(f"{target}: done", file=sys.stderr)
+
+    document = json.dumps(
+        {
+            "benchmark": "nginx",
+            "commit": bench_api.git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "targets": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Cold-start cost of a worker: time to a WSGI application with its URLconf loaded.
+
+For each settings profile, starts fresh interpreters that run django.setup(),
+build the WSGI application and load the URLconf (as the first request
+would), and reports the median wall time, CPU time and in-process startup
+time over --repeat runs. One more run
+under `python -X importtime` breaks the import time down per module (the
+slowest by cumulative time) and per top-level package (self time).
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py --repeat 7 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    "full": "config.settings",
+    "api": "config.api_settings",
+}
+
+STARTUP = """
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    "startup_ms": (time.perf_counter() - start) * 1000,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def start(settings_module, importtime=False):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c"]
+    wall = time.perf_counter()
+    cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    result = subprocess.run(
+        [*command, STARTUP],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = (time.perf_counter() - wall) * 1000
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    info = json.loads(result.stdout)
+    # User + system CPU of the child: steadier than wall time on a busy host
+    info["cpu_ms"] = (
+        after.ru_utime - cpu.ru_utime + after.ru_stime - cpu.ru_stime
+    ) * 1000
+    return wall, info, result.stderr
+
+
+def parse_importtime(output):
+    """[(module, self_us, cumulative_us)] from -X importtime output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def breakdown(settings_module, top):
+    """Import time per package and slowest modules, from one importtime run."""
+    _, info, output = start(settings_module, importtime=True)
+    rows = parse_importtime(output)
+
+    packages = Counter()
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+
+    return {
+        "modules": info["modules"],
+        "import_ms": round(sum(self_us for _, self_us, _ in rows) / 1000, 1),
+        "packages_ms": {
+            name: round(us / 1000, 1) for name, us in packages.most_common(top)
+        },
+        "slowest_modules_ms": {
+            name: round(cumulative / 1000, 1)
+            for name, _, cumulative in sorted(rows, key=lambda row: -row[2])[:top]
+        },
+    }
+
+
+def measure(names, repeat, top):
+    # Profiles alternate within each round, so drift hits them all alike
+    runs = {name: [] for name in names}
+    for _ in range(repeat):
+        for name in names:
+            wall, result, _ = start(PROFILES[name])
+            runs[name].append((wall, result["cpu_ms"], result["startup_ms"]))
+
+    def median(index, name):
+        return round(statistics.median(run[index] for run in runs[name]), 1)
+
+    return {
+        name: {
+            "settings": PROFILES[name],
+            "wall_ms": median(0, name),
+            "cpu_ms": median(1, name),
+            "startup_ms": median(2, name),
+            **breakdown(PROFILES[name], top),
+        }
+        for name in names
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Modules and packages")
+    parser.add_argument(
+        "--profiles",
+        default=",".join(PROFILES),
+        help="Comma-separated subset of: " + ", ".join(PROFILES),
+    )
+    parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    unknown = set(names) - set(PROFILES)
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(sorted(unknown))}")
+
+    document = json.dumps(
+        {
+            "benchmark": "startup",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+            "profiles": measure(names, args.repeat, args.top),
+        },
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
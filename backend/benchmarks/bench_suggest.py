@@ -0,0 +1,113 @@
+"""
+Benchmark /api/v1/petsitters/suggest/ latency at a realistic table size.
+
+Seeds an in-memory SQLite database with N petsitters (names and locations from
+the Brazilian Faker locale), then calls PetSitterSuggestView directly with
+random 2-5 character prefixes and prints the latency percentiles as JSON.
+
+Usage (from backend/):
+    python benchmarks/bench_suggest.py --sitters 100000 --requests 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from faker import Faker  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+from users.models import PetSitter, User  # noqa: E402
+from users.text import normalize  # noqa: E402
+from users.views import PetSitterSuggestView  # noqa: E402
+
+
+def seed(sitters, batch_size=5000):
+    fake = Faker("pt_BR")
+    names = []
+    for start in range(0, sitters, batch_size):
+        users = User.objects.bulk_create(
+            User(
+                email=f"sitter{i}@bench.local",
+                full_name=fake.name(),
+                user_type="petsitter",
+            )
+            for i in range(start, min(start + batch_size, sitters))
+        )
+        profiles = []
+        for user in users:
+            location = f"{fake.city()}, {fake.estado_sigla()}"
+            profiles.append(
+                PetSitter(
+                    user=user,
+                    location=location,
+                    search_name=normalize(user.full_name),
+                    search_location=normalize(location),
+                )
+            )
+            names.append(user.full_name)
+        PetSitter.objects.bulk_create(profiles)
+    return names
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sitters", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+    call_command("migrate", verbosity=0)
+    names = seed(args.sitters)
+    viewer = User.objects.create_user(email="viewer@bench.local", password="x")
+
+    factory = APIRequestFactory()
+    view = PetSitterSuggestView.as_view()
+    timings = []
+    for _ in range(args.requests):
+        name = random.choice(names)
+        prefix = name[: random.randint(2, 5)]
+        request = factory.get("/api/v1/petsitters/suggest/", {"q": prefix})
+        force_authenticate(request, user=viewer)
+
+        start = time.perf_counter()
+        response = view(request)
+        response.render()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "petsitter-suggest",
+                "sitters": args.sitters,
+                "requests": args.requests,
+                "p50_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(percentile(timings, 95), 3),
+                "p99_ms": round(percentile(timings, 99), 3),
+                "max_ms": round(max(timings), 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
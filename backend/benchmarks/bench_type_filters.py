@@ -0,0 +1,114 @@
+"""
+Benchmark the animal_type filter as the number of selected types grows.
+
+Compares PetSitterQuerySet.with_types() (single pk IN subquery, grouped with
+HAVING COUNT for match=all) against the naive "all of" filter that chains one
+M2M join per selected type. Runs against an in-memory SQLite database seeded
+with random petsitters and prints one JSON line per measurement.
+
+Usage (from backend/):
+    python benchmarks/bench_type_filters.py --sitters 5000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from users.models import AnimalType, PetSitter, User  # noqa: E402
+
+CODES = [code for code, _ in AnimalType.ANIMAL_CHOICES]
+
+
+def seed(sitters):
+    types = [AnimalType.objects.create(animal_type=code) for code in CODES]
+    users = User.objects.bulk_create(
+        User(
+            email=f"sitter{i}@bench.local",
+            full_name=f"Sitter {i}",
+            user_type="petsitter",
+        )
+        for i in range(sitters)
+    )
+    PetSitter.objects.bulk_create(PetSitter(user=user) for user in users)
+
+    through = PetSitter.animal_types.through
+    links = []
+    for user in users:
+        for animal in random.sample(types, random.randint(1, len(types))):
+            links.append(through(petsitter_id=user.pk, animaltype_id=animal.pk))
+    through.objects.bulk_create(links, batch_size=1000)
+
+
+def naive_all(codes):
+    qs = PetSitter.objects.active()
+    for code in codes:
+        qs = qs.filter(animal_types__animal_type=code)
+    return qs.distinct()
+
+
+def measure(label, build, codes, repeat):
+    qs = build(codes)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(qs.values_list("pk", flat=True)[:20])
+        qs.count()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    with CaptureQueriesContext(connection) as ctx:
+        list(qs.values_list("pk", flat=True)[:20])
+
+    return {
+        "strategy": label,
+        "types": len(codes),
+        "joins": ctx.captured_queries[0]["sql"].count(" JOIN "),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sitters", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    call_command("migrate", verbosity=0)
+    seed(args.sitters)
+
+    strategies = {
+        "any": lambda codes: PetSitter.objects.active().with_types(
+            "animal_types", "animal_type", codes, "any"
+        ),
+        "all": lambda codes: PetSitter.objects.active().with_types(
+            "animal_types", "animal_type", codes, "all"
+        ),
+        "naive_all": naive_all,
+    }
+
+    for label, build in strategies.items():
+        for size in range(1, len(CODES) + 1):
+            result = measure(label, build, CODES[:size], args.repeat)
+            print(json.dumps({"sitters": args.sitters, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare two bench_api.py result files and flag latency regressions.
+
+Prints, per scenario present in both files, the baseline and candidate p50,
+p95, p99 and throughput with the relative change. Exits with status 1 when a
+scenario's p95 grew by more than --threshold percent or its error count grew,
+so CI can gate on it.
+
+Usage (from backend/):
+    python benchmarks/compare_results.py baseline.json candidate.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "throughput_rps"]
+
+
+def change(old, new):
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(baseline, candidate, threshold):
+    """Return (report lines, names of the regressed scenarios)."""
+    lines = [
+        f"baseline  {baseline.get('commit') or '?'}",
+        f"candidate {candidate.get('commit') or '?'}",
+        "",
+        f"{'scenario':<20}" + "".join(f"{m:>26}" for m in METRICS),
+    ]
+    regressions = []
+    for name, old in baseline["scenarios"].items():
+        new = candidate["scenarios"].get(name)
+        if new is None:
+            continue
+
+        cells = "".join(
+            f"{f'{old[m]:.1f} -> {new[m]:.1f} ({change(old[m], new[m]):+.0f}%)':>26}"
+            for m in METRICS
+        )
+        regressed = (
+            change(old["p95_ms"], new["p95_ms"]) > threshold
+            or new["errors"] > old["errors"]
+        )
+        if regressed:
+            regressions.append(name)
+        lines.append(f"{name:<20}{cells}{'  REGRESSION' if regressed else ''}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Allowed p95 increase, in percent (default: 10)",
+    )
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    candidate = json.loads(Path(args.candidate).read_text(encoding="utf-8"))
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
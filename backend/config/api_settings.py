@@ -0,0 +1,56 @@
+"""
+API-only settings: the REST API without the admin and the OpenAPI docs.
+
+For the gunicorn replicas behind nginx, which only serve /api/v1/ (docs and
+admin can run from a separate config.settings deployment). Workers skip
+importing the admin, the messages framework and drf-spectacular's schema
+generator, and render JSON only. Select with
+DJANGO_SETTINGS_MODULE=config.api_settings; benchmarks/bench_startup.py
+compares its import time with config.settings.
+"""
+
+from config.settings import *  # noqa: F401, F403
+from config.settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+# Sessions stay: login() records last_login through them
+INSTALLED_APPS = [
+    app
+    for app in INSTALLED_APPS
+    if app
+    not in (
+        "django.contrib.admin",
+        "django.contrib.messages",
+        "drf_spectacular",
+        "apidocs",
+    )
+]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "django.contrib.messages.middleware.MessageMiddleware"
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": [
+                processor
+                for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.contrib.messages.context_processors.messages"
+            ],
+        },
+    }
+]
+
+ROOT_URLCONF = "config.api_urls"
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # @extend_schema subclasses this when views are imported; DRF's own class
+    # is already loaded, drf-spectacular's pulls in its whole generator
+    "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.openapi.AutoSchema",
+    # No browsable API (its templates and forms)
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
@@ -0,0 +1,23 @@
+"""
+URL configuration of the REST API alone (ROOT_URLCONF of config.api_settings).
+
+config.urls adds the admin and the OpenAPI docs on top of these.
+"""
+
+from django.urls import include, path
+
+from monitoring.views import ProfilerView, SlowQueryView, metrics
+
+urlpatterns = [
+    # API endpoints
+    path("api/v1/", include("users.urls")),
+    # Prometheus scrape endpoint
+    path("metrics", metrics, name="metrics"),
+    path(
+        "api/v1/monitoring/slow-queries/",
+        SlowQueryView.as_view(),
+        name="slow-queries",
+    ),
+    path("api/v1/monitoring/profiler/", ProfilerView.as_view(), name="profiler"),
+    # path('api/v1/', include('apps.pets.urls')),
+]
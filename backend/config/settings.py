@@ -53,13 +53,22 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "users",
+    "jobs",
+    "monitoring",
+    "apidocs",
+    "encoding",
     # 'apps.pets',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "monitoring.middleware.ReadinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "monitoring.middleware.MetricsMiddleware",
+    "encoding.middleware.CompressionMiddleware",
+    "monitoring.middleware.SlowQueryMiddleware",
+    "monitoring.middleware.ProfilerMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS deve vir antes do CommonMiddleware
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -144,6 +153,15 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Content-hashed file names (collected when the image is built), so nginx
+# can let browsers cache them for a year
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    },
+}
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
@@ -176,9 +194,40 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # Token buckets: "5/min" allows bursts of 5, refilled at 5 per minute.
+    # An empty value turns the scope off (e.g. for load tests).
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": config("THROTTLE_LOGIN_IP", default="20/min") or None,
+        "login_email": config("THROTTLE_LOGIN_EMAIL", default="5/min") or None,
+        "signup_ip": config("THROTTLE_SIGNUP_IP", default="10/hour") or None,
+    },
+    # Proxies in front of Django (1 behind nginx) for the client IP
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
 
 
+# ==============================================================================
+# CACHE SETTINGS
+# ==============================================================================
+
+# Shared by all workers (throttle buckets); per-process memory without Redis
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # ==============================================================================
 # DRF SPECTACULAR SETTINGS (API Documentation)
 # ==============================================================================
@@ -191,6 +240,73 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# Served at /api/schema/; rewrite with `manage.py openapi_schema`
+OPENAPI_SCHEMA_FILE = BASE_DIR / "openapi.json"
+
+
+# ==============================================================================
+# EMAIL SETTINGS
+# ==============================================================================
+
+EMAIL_BACKEND = config(
+    "EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend"
+)
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=25, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config(
+    "DEFAULT_FROM_EMAIL", default="PetKeep <noreply@petkeep.com>"
+)
+
+
+# ==============================================================================
+# BACKGROUND JOBS
+# ==============================================================================
+
+# Run jobs inline instead of storing them for `manage.py run_jobs` workers
+JOBS_EAGER = config("JOBS_EAGER", default=False, cast=bool)
+
+
+# ==============================================================================
+# MONITORING
+# ==============================================================================
+
+# Fraction of requests measured by MetricsMiddleware (0 disables it)
+METRICS_SAMPLE_RATE = config("METRICS_SAMPLE_RATE", default=0.0, cast=float)
+# Bearer token required by /metrics (served only in DEBUG when empty)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+# Directory where worker processes share their metrics (one file per process)
+METRICS_DIR = config("METRICS_DIR", default="")
+# Queries slower than this (ms) are logged and ranked (0 disables it)
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=0.0, cast=float)
+# Fraction of slow SELECTs re-run under EXPLAIN ANALYZE
+SLOW_QUERY_EXPLAIN_RATE = config("SLOW_QUERY_EXPLAIN_RATE", default=0.0, cast=float)
+# Fingerprints kept per process, and how long one lasts without a slow run
+SLOW_QUERY_TOP_N = config("SLOW_QUERY_TOP_N", default=20, cast=int)
+SLOW_QUERY_WINDOW = config("SLOW_QUERY_WINDOW", default=3600, cast=int)
+# Sampling profiler: signal toggling it in a worker (e.g. SIGUSR2; empty = no
+# handler), sampling interval and where signal-triggered profiles are written
+PROFILER_SIGNAL = config("PROFILER_SIGNAL", default="")
+PROFILER_INTERVAL_MS = config("PROFILER_INTERVAL_MS", default=10.0, cast=float)
+PROFILER_DIR = config("PROFILER_DIR", default="")
+
+
+# ==============================================================================
+# RESPONSE COMPRESSION
+# ==============================================================================
+
+# Content-Encodings offered to API clients, preferred first (br and zstd only
+# when the Brotli / zstandard packages are installed); empty disables it
+COMPRESSION_ENCODINGS = config(
+    "COMPRESSION_ENCODINGS", default="zstd,br,gzip", cast=Csv()
+)
+# Smaller JSON bodies are sent uncompressed
+COMPRESSION_MIN_BYTES = config("COMPRESSION_MIN_BYTES", default=1024, cast=int)
+# Only responses under this path are compressed (nginx handles the rest)
+COMPRESSION_PATH_PREFIX = "/api/v1/"
+
 
 # ==============================================================================
 # CORS SETTINGS
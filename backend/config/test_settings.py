@@ -6,3 +6,15 @@ DATABASES = {
         "NAME": ":memory:",
     }
 }
+
+# Run background jobs synchronously instead of queueing them
+JOBS_EAGER = True
+
+# No shared state between tests (throttle buckets); throttle tests use locmem
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+# No collectstatic before tests, so no manifest of hashed names
+STORAGES = {
+    **STORAGES,  # noqa: F405
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
@@ -3,22 +3,20 @@
 # Exit on error
 set -e
 
-echo "Waiting for PostgreSQL..."
+# One-shot release job (the "release" service in infra/docker-compose.prod.yml),
+# run once per deploy before any replica starts. Replicas themselves do no
+# work at boot: static files are collected when the image is built, and
+# /readyz tells the orchestrator when a replica can take traffic.
+if [ "$1" = "release" ]; then
+  echo "Running migrations..."
+  python manage.py migrate --noinput
 
-# Wait for PostgreSQL to be ready
-while ! nc -z $DB_HOST $DB_PORT; do
-  sleep 0.1
-done
+  # Copy the static files baked into the image to the volume nginx serves
+  if [ -n "$STATIC_PUBLISH_DIR" ]; then
+    echo "Publishing static files to $STATIC_PUBLISH_DIR..."
+    cp -a /app/staticfiles/. "$STATIC_PUBLISH_DIR"/
+  fi
+  exit 0
+fi
 
-echo "PostgreSQL started"
-
-# Run migrations
-echo "Running migrations..."
-python manage.py migrate --noinput
-
-# Collect static files
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
-
-echo "Starting server..."
 exec "$@"
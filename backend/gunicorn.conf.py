@@ -0,0 +1,119 @@
+"""
+Gunicorn configuration for production (read from the working directory).
+
+Requests here are a mix of CPU-bound work (PBKDF2 on login/signup, JSON
+serialization) that holds the GIL, and I/O waits on Postgres and Redis. So:
+one process per available CPU (plus one to cover a worker being recycled)
+for the CPU-bound part, and a few gthread threads per process so database
+waits overlap. The app is preloaded in the master and forked, so workers
+share its memory copy-on-write and boot instantly.
+
+Every setting can be overridden from the environment (GUNICORN_WORKERS,
+GUNICORN_THREADS, ...) or on the command line, which wins over this file.
+benchmarks/bench_gunicorn.py compares this profile with plain sync workers.
+"""
+
+import math
+import os
+
+
+def env(name, default, cast=str):
+    value = os.environ.get(f"GUNICORN_{name}")
+    return default if value in (None, "") else cast(value)
+
+
+def available_cpus():
+    """CPUs this container may use: affinity mask, capped by a cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 "max 100000" (no limit) or "200000 100000" (2 CPUs)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def as_bool(value):
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+# ==============================================================================
+# WORKERS
+# ==============================================================================
+
+bind = env("BIND", "0.0.0.0:8000")
+worker_class = env("WORKER_CLASS", "gthread")
+workers = env("WORKERS", available_cpus() + 1, int)
+# Ignored by sync workers; gthread workers serve this many requests at once
+threads = env("THREADS", 4, int)
+
+# Load Django once in the master and fork: shared pages, no per-worker import
+preload_app = env("PRELOAD", True, as_bool)
+
+# Recycle workers to bound slow memory growth; the jitter keeps them from
+# all restarting at the same moment
+max_requests = env("MAX_REQUESTS", 2000, int)
+max_requests_jitter = env("MAX_REQUESTS_JITTER", 200, int)
+
+timeout = env("TIMEOUT", 30, int)
+graceful_timeout = env("GRACEFUL_TIMEOUT", 30, int)
+
+# Seconds an idle keep-alive connection from nginx is held open. Longer than
+# nginx's upstream keepalive_timeout (60s), so nginx always closes first and
+# never reuses a connection gunicorn is closing.
+keepalive = env("KEEPALIVE", 75, int)
+
+# Heartbeat files in memory: on overlay filesystems a slow disk write can
+# make the master think a worker hung
+worker_tmp_dir = env(
+    "WORKER_TMP_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None
+)
+
+accesslog = env("ACCESSLOG", "-")
+errorlog = env("ERRORLOG", "-")
+loglevel = env("LOGLEVEL", "info")
+
+
+# ==============================================================================
+# HOOKS
+# ==============================================================================
+
+
+def pre_fork(server, worker):
+    # Nothing opened while preloading may be shared with the children; the
+    # master only has Django loaded (and connections open) when preloading
+    if server.cfg.preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Gunicorn resets the workers' signal handlers after forking
+    from monitoring.profiler import install_signal_handler
+
+    install_signal_handler()
+
+
+def worker_exit(server, worker):
+    # Recycled workers flush the metrics gathered since their last snapshot
+    # (also called in the master for a worker that is already gone)
+    if worker.pid == os.getpid():
+        from monitoring.metrics import registry
+
+        registry.maybe_write_snapshot(force=True)
+
+
+def child_exit(server, worker):
+    # ... which the master folds into one archive instead of a file per pid
+    if server.cfg.preload_app:
+        from monitoring.metrics import archive_snapshot
+
+        archive_snapshot(worker.pid)